@@ -1,70 +1,291 @@
 
-import streamlit as st
+import json
+import os
+import threading
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from glob import escape, glob
+
 import pandas as pd
-from insights import (
-    plot_foundersAnalysis,
-    plot_average_funding_per_round,
-    plot_funding_over_time,
-    plot_funding_by_location,
-    plot_industry_distribution,
-    plot_total_investors,
-    summarize_deals_by_sector,
-    summarize_market_coverage_by_country,
-    plot_valuation_insights
+import streamlit as st
+
+# Panels are attributes of the package, imported with their plotting library
+# the first time a view that shows them is opened
+import insights
+from insights.aggregates import coverage_cube, market_coverage, search_results
+from insights.cache import DatasetCache
+from insights.cube import DIMENSIONS as CUBE_DIMENSIONS
+from insights.cube import LABELS as CUBE_LABELS
+from insights.ingest import (
+    file_fingerprint,
+    read_shards,
+    read_store,
+    shards_fingerprint,
 )
-import re
-import matplotlib.pyplot as plt
+from insights.money import DEFAULT_RATES, rates_fingerprint
+from insights.perf import ENABLED as PERF_ENABLED
+from insights.perf import stage, tracing
+from insights.reduce import top_k
+from insights.render import download_table, render_figure, rotate_xticks
+from insights.search import tokenize
+
+MAX_LOADED_STORES = 4
+MAX_TRACES = 20
+MAX_DETAILS = 20
+MAX_SEARCH_RESULTS = 20
+# Local directories of JSON shards can only be loaded from below this one; the
+# directory input is hidden when it is not set
+DATA_DIR = os.environ.get('MARKET_COVERAGE_DATA_DIR')
+
+# Stores are read-only once built, so every session shares them instead of
+# unpickling a copy. The registry lives outside st.cache_resource so the
+# parse can report progress to the page that triggered it.
+@st.cache_resource
+def _loaded_stores():
+    return OrderedDict(), threading.Lock()
+
+@st.cache_resource
+def _dataset_cache():
+    return DatasetCache()
+
+def _fingerprint(source):
+    if isinstance(source, str):
+        with open(source, 'rb') as file:
+            return file_fingerprint(file)
+    return file_fingerprint(source)
+
+def _shard_paths(directory):
+    # JSON files of a directory given relative to DATA_DIR, or None when the
+    # directory, or a file through a symlink, resolves outside of it
+    root = os.path.realpath(DATA_DIR)
+    path = os.path.realpath(os.path.join(root, directory))
+    paths = sorted(glob(os.path.join(escape(path), '*.json')))
+    inside = [path, *map(os.path.realpath, paths)]
+    if any(os.path.commonpath([root, target]) != root for target in inside):
+        return None
+    return paths
 
-@st.cache_data
-def load_data(file):
-    data = pd.read_json(file)
-    data['Total Funding'] = data['Total Funding'].apply(lambda x: float(re.sub(r'[^\d.]', '', x)) if isinstance(x, str) else x)
-    return data
+def load_data(sources):
+    # Uploaded files or paths; shards are merged in order and de-duplicated
+    stores, lock = _loaded_stores()
+    with stage('fingerprint'):
+        key = f'{shards_fingerprint(map(_fingerprint, sources))}-{rates_fingerprint(DEFAULT_RATES)}'
+    with lock:
+        if key in stores:
+            stores.move_to_end(key)
+            return stores[key]
+
+    with stage('disk cache read'):
+        store = _dataset_cache().get(key)
+    if store is None:
+        progress = st.progress(0.0, text="Parsing companies...")
+        # Uploads are in memory already; several are handed to the workers as bytes
+        shards = sources if len(sources) == 1 else [
+            source if isinstance(source, str) else source.getvalue() for source in sources]
+        with stage('parse'):
+            store = read_shards(
+                shards, DEFAULT_RATES, on_progress=lambda fraction: progress.progress(
+                    fraction, text=f"Parsing companies... {fraction:.0%}"))
+        progress.empty()
+        with stage('disk cache write'):
+            _dataset_cache().put(key, store)
+    store.fingerprint = key
+    _remember(key, store)
+    return store
+
+def _remember(key, store):
+    stores, lock = _loaded_stores()
+    with lock:
+        stores[key] = store
+        while len(stores) > MAX_LOADED_STORES:
+            stores.popitem(last=False)
+
+def apply_deltas(store, files):
+    # Deltas apply in upload order, each on top of the previous result; every
+    # intermediate store is registered under the chain of fingerprints so a
+    # rerun or another session reuses it
+    stores, lock = _loaded_stores()
+    for file in files:
+        key = shards_fingerprint([store.fingerprint, file_fingerprint(file)])
+        with lock:
+            updated = stores.get(key)
+        if updated is None:
+            with stage('apply delta'):
+                updated = store.apply_delta(read_store(file, DEFAULT_RATES))
+            updated.fingerprint = key
+            _remember(key, updated)
+        store = updated
+    return store
 
 def main():
     st.set_page_config(layout="wide", page_title="Company Insights Dashboard")
     st.title("Company Insights Dashboard")
     
-    uploaded_file = st.file_uploader("Upload a JSON file", type=['json'])
+    uploaded_files = st.file_uploader("Upload JSON files", type=['json'],
+                                      accept_multiple_files=True)
+    directory = None
+    if DATA_DIR:
+        directory = st.sidebar.text_input("Or load every JSON file in a data directory",
+                                          help=f"Relative to {DATA_DIR}")
+    record_performance = st.sidebar.checkbox("Record performance", value=PERF_ENABLED)
+
+    if uploaded_files:
+        sources, label = uploaded_files, ', '.join(file.name for file in uploaded_files)
+    elif directory:
+        sources, label = _shard_paths(directory), directory
+        if sources is None:
+            st.error(f"{directory} is outside the data directory")
+            sources = []
+        elif not sources:
+            st.warning(f"No JSON files found in {directory}")
+    else:
+        sources = []
     
-    if uploaded_file is not None:
-        try:
-            companies_data = load_data(uploaded_file)
-            
-            st.sidebar.header("Filters")
-            max_funding = int(companies_data['Total Funding'].max())
-            min_funding = st.sidebar.slider("Minimum total funding (USD)", 0, max_funding, 0)
-            filtered_data = companies_data[companies_data['Total Funding'] >= min_funding]
-            
-            tab1, tab2, tab3 = st.tabs(["Overview", "Funding Analysis", "Geographic Insights"])
-            
-            with tab1:
-                display_overview(filtered_data)
-            
-            with tab2:
-                display_funding_analysis(filtered_data)
-            
-            with tab3:
-                display_geographic_insights(filtered_data)
-
-        except Exception as e:
-            st.error(f"Error processing data: {str(e)}")
-            st.write("Error details:", e)
-            import traceback
-            st.write("Traceback:", traceback.format_exc())
+    if sources:
+        companies_data = None
+        with tracing(label) if record_performance else nullcontext() as trace:
+            try:
+                with stage('load_data'):
+                    companies_data = load_data(sources)
+                display_issues(companies_data)
+                delta_files = st.sidebar.file_uploader(
+                    "Apply delta files", type=['json'], accept_multiple_files=True,
+                    help="New companies, new rounds or updated fields, applied on top of the "
+                         "loaded data")
+                if delta_files:
+                    companies_data = apply_deltas(companies_data, delta_files)
+                
+                st.sidebar.header("Filters")
+                max_funding = int(companies_data.companies['Total Funding'].max())
+                min_funding = st.sidebar.slider("Minimum total funding (USD)", 0, max_funding, 0)
+                query = st.sidebar.text_input(
+                    "Search companies", placeholder="e.g. threat intelligence",
+                    help="Matches names, industries, attributes, overviews and founder bios; "
+                         "every word must match the start of a word. Filters every panel.")
+                with stage('filter'):
+                    filtered_data = companies_data.above(min_funding)
+                if query.strip():
+                    filtered_data = display_search(filtered_data, query)
+
+                with st.sidebar:
+                    st.header("Export")
+                    download_table("filtered companies", "companies", filtered_data.key,
+                                   filtered_data.with_texts, index=True)
+                    download_table("filtered funding rounds", "funding_rounds", filtered_data.key,
+                                   filtered_data.rounds)
+                
+                # st.tabs would run every panel on each rerun, so only the selected
+                # view is evaluated; its results stay memoized when switching back
+                view = st.radio("View", list(VIEWS), horizontal=True, key="view",
+                                label_visibility="collapsed")
+                if filtered_data.companies.empty:
+                    st.warning("No companies match the current filters")
+                else:
+                    with stage(f'view {view}'):
+                        VIEWS[view](filtered_data)
+
+            except Exception as e:
+                st.error(f"Error processing data: {str(e)}")
+                st.write("Error details:", e)
+                import traceback
+                st.write("Traceback:", traceback.format_exc())
+
+        if trace is not None:
+            traces = st.session_state.setdefault('perf_traces', deque(maxlen=MAX_TRACES))
+            traces.append(trace)
+            display_performance(traces)
+            if companies_data is not None:
+                display_memory(companies_data)
+
+def display_search(data, query):
+    # Ranked matches in the sidebar; the returned view narrows every panel to them
+    with stage('search'):
+        results = search_results(data, ' '.join(tokenize(query)))
+        matching = data.search(query)
+    st.sidebar.caption(f"{len(results):,} companies match")
+    if len(results):
+        top = results.head(MAX_SEARCH_RESULTS)[['Company', 'Industry', 'Country HQ']]
+        st.sidebar.dataframe(top, hide_index=True, use_container_width=True)
+    return matching
+
+def run_panel(panel, data):
+    with stage(f'panel {panel.__name__}'):
+        return panel(data)
+
+def display_performance(traces):
+    trace = traces[-1]
+    with st.expander(f"Performance: {trace.seconds:.2f}s this rerun"):
+        columns = ['name', 'depth', 'start', 'seconds', 'memory_delta_mb', 'peak_mb']
+        stages = pd.DataFrame(trace.stages, columns=columns)
+        stages['name'] = stages['depth'].map(lambda depth: '\u2003' * depth) + stages['name']
+        st.dataframe(stages.drop(columns='depth'), hide_index=True, use_container_width=True)
+        if not trace.memory:
+            st.caption("Memory was not measured: another session's trace was measuring it.")
+        st.download_button(
+            label=f"Download the last {len(traces)} traces as JSON",
+            data=json.dumps([t.to_dict() for t in traces], indent=2),
+            file_name="performance_traces.json",
+            mime="application/json",
+        )
+
+def display_issues(store):
+    # What ingest set to null or left out, summarized per field and issue
+    issues = store.issues if store.issues is not None else pd.DataFrame(columns=['count'])
+    quarantined = len(store.quarantine) if store.quarantine is not None else 0
+    if issues.empty:
+        return
+    total = int(issues['count'].sum())
+    with st.expander(f"Data quality: {total:,} values set to null or records left out"):
+        st.dataframe(issues, hide_index=True, use_container_width=True)
+        if quarantined:
+            st.caption(f"{quarantined:,} records could not be read as companies and were left out")
+            download_table("quarantined records", "quarantine", store.key, store.quarantine)
+
+def display_memory(store):
+    report = store.memory_report()
+    with st.expander(f"Memory: {report['MB'].sum():.1f} MB in the loaded dataset"):
+        by_table = report.groupby('table', sort=False)['MB'].sum()
+        st.write(', '.join(f"{table} {mb:.1f} MB" for table, mb in by_table.items()))
+        st.dataframe(report.sort_values('bytes', ascending=False), hide_index=True,
+                     use_container_width=True)
 
 def display_overview(data):
     st.header("Data Overview")
-    st.dataframe(data)
+    with stage('serialize companies'):
+        selection = st.dataframe(data.companies, on_select="rerun", selection_mode="multi-row",
+                                 key="companies_table")
+    display_company_details(data, selection.selection.rows)
     
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Industry Distribution")
-        plot_industry_distribution(data)
+        run_panel(insights.plot_industry_distribution, data)
     
     with col2:
         st.subheader("Total Number of Unique Investors")
-        plot_total_investors(data)
+        run_panel(insights.plot_total_investors, data)
+
+    st.subheader("Investor Analytics")
+    run_panel(insights.plot_investor_analytics, data)
+
+def display_company_details(data, rows):
+    # Overviews and founder bios are only read for the selected rows
+    if not rows:
+        st.caption("Select rows to see company overviews and founder bios")
+        return
+    company_ids = data.companies.index[rows[:MAX_DETAILS]]
+    overviews = data.text('Overview', company_ids)
+    bios = data.text('Founder Bio', company_ids)
+    for company_id in company_ids:
+        company = data.companies.loc[company_id]
+        with st.expander(str(company['Company']), expanded=len(company_ids) == 1):
+            overview = overviews[company_id]
+            st.write(overview if pd.notna(overview) else "No overview available")
+            if pd.notna(company.get('Founder')):
+                st.markdown(f"**{company['Founder']}**")
+                st.write(bios[company_id] if pd.notna(bios[company_id]) else "No bio available")
+    if len(rows) > MAX_DETAILS:
+        st.caption(f"Showing the first {MAX_DETAILS} of {len(rows)} selected companies")
 
 def display_funding_analysis(data):
     st.header("Funding Analysis")
@@ -72,16 +293,19 @@ def display_funding_analysis(data):
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Total Funding Over Time")
-        plot_funding_over_time(data)
+        run_panel(insights.plot_funding_over_time, data)
     
     with col2:
         st.subheader("Average Funding per Round")
-        plot_average_funding_per_round(data)
+        run_panel(insights.plot_average_funding_per_round, data)
     
+    st.subheader("Funding by Round Date")
+    run_panel(insights.plot_funding_timeline, data)
+
     st.subheader("Funding vs Last Valuation")
-    plot_valuation_insights(data)
+    run_panel(insights.plot_valuation_insights, data)
     
-    display_deals_by_sector(data)
+    run_panel(display_deals_by_sector, data)
 
 def display_geographic_insights(data):
     st.header("Geographic Insights")
@@ -89,70 +313,99 @@ def display_geographic_insights(data):
     col1, col2 = st.columns(2)
     with col1:
         st.subheader("Funding by Geographic Location")
-        plot_funding_by_location(data)
+        run_panel(insights.plot_funding_by_location, data)
     
     with col2:
         st.subheader("Number of Companies Founded by Each Founder")
-        plot_foundersAnalysis(data)
+        run_panel(insights.plot_foundersAnalysis, data)
     
-    display_market_coverage(data)
+    run_panel(display_market_coverage, data)
+    run_panel(display_coverage_drilldown, data)
 
 def display_deals_by_sector(data):
-    deals_by_sector = summarize_deals_by_sector(data.to_dict('records'))
+    deals_by_sector = insights.summarize_deals_by_sector(data)
     if deals_by_sector is not None:
         st.subheader("Deals by Sector")
         col1, col2 = st.columns([3, 1])
         with col1:
-            fig, ax = plt.subplots(figsize=(12, 6))
-            ax.bar(deals_by_sector['sector'], deals_by_sector['total_amount'])
-            ax.set_xlabel('Sector')
-            ax.set_ylabel('Total Amount')
-            ax.set_title('Total Funding Amount by Sector')
-            plt.xticks(rotation=45, ha='right')
-            st.pyplot(fig)
+            def draw(fig):
+                ax = fig.subplots()
+                ax.bar(deals_by_sector['sector'], deals_by_sector['total_amount'])
+                ax.set_xlabel('Sector')
+                ax.set_ylabel('Total Amount (USD)')
+                ax.set_title('Total Funding Amount by Sector')
+                rotate_xticks(ax, 45, ha='right')
+            render_figure('deals_by_sector', data.key, (), draw, figsize=(12, 6))
         
         with col2:
             st.dataframe(deals_by_sector)
-            csv = deals_by_sector.to_csv(index=False)
-            st.download_button(
-                label="Download deals by sector as CSV",
-                data=csv,
-                file_name="deals_by_sector.csv",
-                mime="text/csv",
-            )
+            download_table("deals by sector", "deals_by_sector", data.key, deals_by_sector)
 
 def display_market_coverage(data):
     st.subheader("Market Coverage by Country")
-    countries_of_interest = list(set(data['Country HQ'].dropna()))
+    countries_of_interest = data.group_totals('country').index.tolist()
     selected_countries = st.multiselect(
         "Select countries for analysis",
         countries_of_interest,
         default=countries_of_interest
     )
-    market_coverage = summarize_market_coverage_by_country(data.to_dict('records'), selected_countries)
-    market_coverage_df = pd.DataFrame.from_dict(market_coverage, orient='index', columns=['Number of Companies']).reset_index()
-    market_coverage_df.columns = ['Country', 'Number of Companies']
-    market_coverage_df = market_coverage_df.sort_values('Number of Companies', ascending=False)
+    market_coverage_df = market_coverage(data, tuple(selected_countries))
+    # The chart shows the largest countries and one bar for the rest; the table keeps all
+    coverage_chart = top_k(market_coverage_df, 'Country', 'Number of Companies')
     
     col1, col2 = st.columns([3, 1])
     with col1:
-        fig, ax = plt.subplots(figsize=(12, 6))
-        ax.bar(market_coverage_df['Country'], market_coverage_df['Number of Companies'])
-        ax.set_xlabel('Country')
-        ax.set_ylabel('Number of Companies')
-        ax.set_title('Market Coverage by Country')
-        plt.xticks(rotation=45, ha='right')
-        st.pyplot(fig)
+        def draw(fig):
+            ax = fig.subplots()
+            ax.bar(coverage_chart['Country'], coverage_chart['Number of Companies'])
+            ax.set_xlabel('Country')
+            ax.set_ylabel('Number of Companies')
+            ax.set_title('Market Coverage by Country')
+            rotate_xticks(ax, 45, ha='right')
+        render_figure('market_coverage', data.key, tuple(selected_countries), draw, figsize=(12, 6))
     
     with col2:
         st.dataframe(market_coverage_df)
-        csv = market_coverage_df.to_csv(index=False)
-        st.download_button(
-            label="Download market coverage as CSV",
-            data=csv,
-            file_name="market_coverage.csv",
-            mime="text/csv",
-        )
+        download_table("market coverage", "market_coverage", (data.key, tuple(selected_countries)),
+                       market_coverage_df)
+
+def display_coverage_drilldown(data):
+    st.subheader("Coverage Drill-down")
+    # Every level is a query against the cube, built on the first drill-down
+    # and kept with the store, not a pass over the rows
+    with stage('coverage cube'):
+        cube = coverage_cube(data)
+    remaining = list(CUBE_DIMENSIONS)
+    filters = {}
+    while True:
+        path = '/'.join(str(values[0]) for values in filters.values())
+        col1, col2 = st.columns(2)
+        with col1:
+            dimension = st.selectbox("Then break down by" if filters else "Break down by",
+                                     remaining, format_func=CUBE_LABELS.get, key=f"drill_by_{path}")
+        breakdown = cube.query([dimension], filters)
+        remaining.remove(dimension)
+        if not remaining:
+            break
+        with col2:
+            choice = st.selectbox(f"Drill into {CUBE_LABELS[dimension]}",
+                                  ['All'] + breakdown.index.tolist(), key=f"drill_into_{path}")
+        if choice == 'All':
+            break
+        filters[dimension] = [choice]
+
+    st.caption(' > '.join(['All companies'] + [str(values[0]) for values in filters.values()]))
+    measure = 'Rounds' if 'Rounds' in breakdown else 'Companies'
+    chart = top_k(breakdown.reset_index(), CUBE_LABELS[dimension], measure)
+    chart[CUBE_LABELS[dimension]] = chart[CUBE_LABELS[dimension]].astype(str)
+    st.bar_chart(chart, x=CUBE_LABELS[dimension], y=measure)
+    st.dataframe(breakdown)
+
+VIEWS = {
+    "Overview": display_overview,
+    "Funding Analysis": display_funding_analysis,
+    "Geographic Insights": display_geographic_insights,
+}
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from glob import glob
+
+import pandas as pd
+
+from insights.aggregates import INSIGHTS, insight_table
+from insights.ingest import read_store
+
+# Headless companion to app.py: computes every insight table for a directory of
+# JSON exports without importing Streamlit or any plotting library, e.g.
+#
+#   python batch.py exports/ reports/ --format parquet --workers 8
+
+
+def summarize_export(path):
+    with open(path, 'rb') as file:
+        store = read_store(file)
+    return {name: insight_table(compute(store)) for name, compute in INSIGHTS.items()}
+
+
+def write_table(frame, path, fmt):
+    if fmt == 'parquet':
+        frame.to_parquet(f'{path}.parquet', index=False)
+    else:
+        frame.to_csv(f'{path}.csv', index=False)
+
+
+def run(export_dir, output_dir, fmt='csv', workers=None, pattern='*.json'):
+    paths = sorted(glob(os.path.join(export_dir, pattern)))
+    if not paths:
+        print(f"No exports matching {pattern} in {export_dir}", file=sys.stderr)
+        return 1
+
+    os.makedirs(output_dir, exist_ok=True)
+    tables = {name: [] for name in INSIGHTS}
+    failures = 0
+    started = time.perf_counter()
+
+    # One export per task: parsing and aggregation are CPU bound, so separate processes
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(summarize_export, path): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            export = os.path.splitext(os.path.basename(path))[0]
+            try:
+                results = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"Failed to process {path}: {e}", file=sys.stderr)
+                continue
+            for name, frame in results.items():
+                tables[name].append(frame.assign(export=export))
+            print(f"Processed {path}")
+
+    # One table per insight across all exports, tagged with the export it came from
+    for name, frames in tables.items():
+        if frames:
+            combined = pd.concat(frames, ignore_index=True)
+            combined = combined[['export'] + [c for c in combined.columns if c != 'export']]
+            write_table(combined.sort_values('export', kind='stable'),
+                        os.path.join(output_dir, name), fmt)
+
+    print(f"Wrote {len(tables)} insight tables for {len(paths) - failures} exports "
+          f"to {output_dir} in {time.perf_counter() - started:.1f}s")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compute every insight table for a directory of JSON exports.")
+    parser.add_argument('export_dir', help="directory containing the JSON exports")
+    parser.add_argument('output_dir', help="directory the insight tables are written to")
+    parser.add_argument('--format', choices=['csv', 'parquet'], default='csv')
+    parser.add_argument('--workers', type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--pattern', default='*.json',
+                        help="glob for export files (default: *.json)")
+    args = parser.parse_args(argv)
+    return run(args.export_dir, args.output_dir, args.format, args.workers, args.pattern)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
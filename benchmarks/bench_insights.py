@@ -0,0 +1,139 @@
+import argparse
+import gc
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import insights
+from insights import aggregates
+from insights.aggregates import INSIGHTS
+from insights.ingest import read_store
+from insights.render import _images
+from insights.synthetic import generate_companies, write_export
+
+# Times every stage of the insights pipeline on synthetic exports, e.g.
+#
+#   python -m benchmarks.bench_insights --sizes 1000,100000,1000000 --schema tracxn
+#
+# Each stage is reported twice: wall time (best of --repeat untraced runs) and
+# the peak Python allocation seen by tracemalloc in one extra traced run.
+# Compute runs with every memo cleared; render runs with the memos warm and the
+# figure cache cleared, so it measures drawing alone.
+
+INDEXES = ['funding_index', 'founder_index', 'investor_index']
+
+# Panels run headless: outside `streamlit run` the Streamlit calls are no-ops
+# and widgets return their defaults
+PANELS = [
+    'plot_funding_over_time', 'plot_average_funding_per_round', 'plot_funding_by_location',
+    'plot_industry_distribution', 'plot_total_investors', 'plot_investor_analytics',
+    'plot_valuation_insights', 'plot_foundersAnalysis', 'summarize_deals_by_sector',
+]
+
+
+def _clear_memos():
+    for value in vars(aggregates).values():
+        if hasattr(value, 'cache'):
+            value.cache.clear()
+
+
+def measure(func, repeat, setup=None):
+    seconds = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        seconds.append(time.perf_counter() - started)
+
+    if setup:
+        setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return min(seconds), peak
+
+
+def _read(path):
+    with open(path, 'rb') as file:
+        return read_store(file)
+
+
+def _fresh_indexes(store):
+    for name in INDEXES:
+        store.__dict__.pop(name, None)
+
+
+def benchmark(size, schema, repeat, directory):
+    path = os.path.join(directory, f'{schema}-{size}.json')
+    started = time.perf_counter()
+    write_export(path, generate_companies(size, schema))
+    generated = time.perf_counter() - started
+
+    results = [('generate', 'export', generated, None)]
+    seconds, peak = measure(lambda: _read(path), repeat)
+    results.append(('load', 'read_store', seconds, peak))
+    store = _read(path)
+
+    for name in INDEXES:
+        seconds, peak = measure(lambda: getattr(store, name), repeat,
+                                setup=lambda: _fresh_indexes(store))
+        results.append(('index', name, seconds, peak))
+
+    for name, compute in INSIGHTS.items():
+        seconds, peak = measure(lambda: compute(store), repeat, setup=_clear_memos)
+        results.append(('compute', name, seconds, peak))
+
+    for name in PANELS:
+        panel = getattr(insights, name)
+        seconds, peak = measure(lambda: panel(store), repeat, setup=_images.clear)
+        results.append(('render', name, seconds, peak))
+
+    os.remove(path)
+    return [
+        {'size': size, 'schema': schema, 'stage': stage, 'name': name,
+         'seconds': round(seconds, 6),
+         'peak_mb': None if peak is None else round(peak / 2 ** 20, 3)}
+        for stage, name, seconds, peak in results
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the insights pipeline on synthetic exports.")
+    parser.add_argument('--sizes', default='1000,100000',
+                        help="comma separated company counts (default: 1000,100000)")
+    parser.add_argument('--schema', choices=['curated', 'tracxn'], default='curated')
+    parser.add_argument('--repeat', type=int, default=3, help="timed runs per stage (default: 3)")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    # Silence the missing ScriptRunContext warnings of headless Streamlit calls
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for size in (int(s) for s in args.sizes.split(',')):
+            for row in benchmark(size, args.schema, args.repeat, directory):
+                rows.append(row)
+                peak = '' if row['peak_mb'] is None else f"{row['peak_mb']:10.1f} MB"
+                print(f"{row['size']:>9} {row['stage']:<8} {row['name']:<32} "
+                      f"{row['seconds']:9.3f}s {peak}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(rows, file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,115 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Cold-start cost of the entry points, each imported in a fresh interpreter as
+# a new worker would, e.g.
+#
+#   python -m benchmarks.bench_startup --repeat 5 --output startup.json
+#
+# Reports the best wall time of the import, the slowest modules it pulled in
+# (from `python -X importtime`) and which UI or plotting libraries got loaded.
+# The compute layer must import none of them; a target that does fails the run.
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+UI_MODULES = ['streamlit', 'matplotlib', 'plotly', 'seaborn']
+
+# module -> UI libraries it may load at import time
+TARGETS = {
+    'insights': [],
+    'insights.store': [],
+    'insights.aggregates': [],
+    'insights.ingest': [],
+    'insights.cache': [],
+    'insights.api': [],
+    'batch': [],
+    'dump': [],
+    # The dashboard needs Streamlit, which loads parts of plotly itself; the
+    # panels and their plotting libraries wait for the first view
+    'app': ['streamlit', 'plotly'],
+}
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - started
+print(json.dumps({{'seconds': seconds, 'modules': sorted(sys.modules)}}))
+"""
+
+
+def _slowest(importtime, top):
+    # Cumulative microseconds per top-level package from the -X importtime report
+    totals = {}
+    for line in importtime.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len('import time:'):].split('|'))
+        if cumulative.isdigit() and not name.startswith(' '):
+            package = name.split('.')[0]
+            totals[package] = max(totals.get(package, 0), int(cumulative))
+    return sorted(totals.items(), key=lambda item: -item[1])[:top]
+
+
+def measure(module, repeat, top):
+    seconds, slowest, loaded = [], [], []
+    for i in range(repeat):
+        command = [sys.executable, '-c', _PROBE.format(module=module)]
+        if i == 0:
+            command[1:1] = ['-X', 'importtime']
+        result = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+        probe = json.loads(result.stdout.splitlines()[-1])
+        # The traced run pays for the tracing, so it only supplies the breakdown
+        if i == 0:
+            slowest = _slowest(result.stderr, top)
+            loaded = [name for name in UI_MODULES if name in probe['modules']]
+        if i > 0 or repeat == 1:
+            seconds.append(probe['seconds'])
+    return min(seconds), slowest, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the import time of the entry points.")
+    parser.add_argument('--modules', default=','.join(TARGETS),
+                        help="comma separated modules to import (default: every entry point)")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="cold imports per module (default: 3)")
+    parser.add_argument('--top', type=int, default=5, help="slowest packages to list (default: 5)")
+    parser.add_argument('--output', help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    rows, failed = [], []
+    for module in args.modules.split(','):
+        try:
+            seconds, slowest, loaded = measure(module, max(args.repeat, 1), args.top)
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr.strip().splitlines() or ['no output'])[-1]
+            failed.append(module)
+            rows.append({'module': module, 'error': error})
+            print(f"{module:<22} failed: {error}")
+            continue
+        unexpected = [name for name in loaded if name not in TARGETS.get(module, UI_MODULES)]
+        if unexpected:
+            failed.append(module)
+        rows.append({'module': module, 'seconds': round(seconds, 6), 'ui_modules': loaded,
+                     'unexpected': unexpected,
+                     'slowest': [{'package': name, 'ms': round(us / 1000, 1)}
+                                 for name, us in slowest]})
+        packages = ', '.join(f"{name} {us / 1000:.0f}ms" for name, us in slowest)
+        flag = f"  UNEXPECTED: {', '.join(unexpected)}" if unexpected else ''
+        print(f"{module:<22} {seconds:8.3f}s  {packages}{flag}")
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(rows, file, indent=2)
+    if failed:
+        print(f"Failed or imported UI or plotting libraries: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,28 @@
-from .founder import plot_foundersAnalysis
-from .funding import plot_average_funding_per_round, plot_funding_over_time
-from .geography import plot_funding_by_location
-from .industry import plot_industry_distribution
-from .investors import plot_total_investors
-from .summary import summarize_deals_by_sector, summarize_market_coverage_by_country
-from .valuation import plot_valuation_insights
+import importlib
+
+# The panels below import Streamlit and the plotting libraries, so they are only
+# loaded on first use; `insights.store`, `insights.aggregates` and the rest of
+# the compute layer stay importable in headless jobs.
+_EXPORTS = {
+    'plot_foundersAnalysis': '.founder',
+    'plot_average_funding_per_round': '.funding',
+    'plot_funding_over_time': '.funding',
+    'plot_funding_timeline': '.funding',
+    'plot_funding_by_location': '.geography',
+    'plot_industry_distribution': '.industry',
+    'plot_investor_analytics': '.investors',
+    'plot_total_investors': '.investors',
+    'summarize_deals_by_sector': '.summary',
+    'summarize_market_coverage_by_country': '.summary',
+    'plot_valuation_insights': '.valuation',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
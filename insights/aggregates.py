@@ -0,0 +1,204 @@
+import pandas as pd
+
+from .cube import CoverageCube
+from .memo import memoize
+from .search import tokenize
+from .timeseries import RoundTimeSeries
+
+# Pure computations behind every insight panel. Each takes a store plus filter
+# parameters, returns a small result frame and is memoized by the store's
+# dataset fingerprint and filters, so renderers can be re-run freely on every
+# Streamlit interaction.
+
+
+@memoize()
+def funding_over_time(store):
+    # Sum the round amounts of each company grouped by 'Founded' year
+    return store.group_totals('founded')[['sum']].rename(columns={'sum': 'Total Funding'})
+
+
+@memoize()
+def average_funding_per_round(store):
+    totals = store.group_totals('round')
+    totals = totals[totals['count'] > 0]
+    funding_averages = pd.DataFrame({'mean': totals['sum'] / totals['count'],
+                                     'count': totals['count']})
+    return funding_averages.sort_values('mean', ascending=False)
+
+
+@memoize()
+def funding_by_country(store):
+    return store.group_totals('country')['sum'].rename('Total Funding').sort_values(ascending=False)
+
+
+@memoize()
+def industry_count(store):
+    return store.group_totals('industry')['rows'].rename('count').sort_values(ascending=False)
+
+
+@memoize(maxsize=8)
+def investor_counts(store):
+    # Unique investors per company from the investor incidence matrix
+    investor_df = pd.DataFrame({
+        'Company': store.companies['Company'],
+        'Total Unique Investors': store.root.investor_index.unique_investor_counts(store)
+    })
+    return investor_df.sort_values('Total Unique Investors', ascending=False)
+
+
+@memoize()
+def top_investors(store):
+    root = store.root
+    if store.complete and 'investor_totals' in root.__dict__:
+        # Present once a delta has been applied, and kept current by later ones
+        return root.investor_totals.frame()
+    return root.investor_index.top_investors(store)
+
+
+@memoize()
+def co_investor_pairs(store):
+    return store.root.investor_index.co_investor_pairs(store)
+
+
+@memoize()
+def portfolio_overlap(store, first, second):
+    company_ids = store.root.investor_index.portfolio_overlap(store, first, second)
+    return store.root.companies.loc[company_ids,
+                                    ['Company', 'Country HQ', 'Industry', 'Total Funding']]
+
+
+@memoize()
+def founder_counts(store):
+    index = store.root.founder_index
+    keys = index.keys.reindex(store.companies.index)
+    founder_names = keys.map(index.names).fillna('Unknown')
+    founder_count = founder_names.value_counts().reset_index()
+    founder_count.columns = ['Founder', 'Number of Companies']
+    return founder_count
+
+
+@memoize()
+def founder_names(store):
+    # Deduplicated, sorted founder names present in the store
+    index = store.root.founder_index
+    present = set(index.keys.reindex(store.companies.index).dropna())
+    return [index.names[key] for key in index.sorted_keys if key in present]
+
+
+@memoize(maxsize=8)
+def founder_records(store):
+    records = store.root.founder_index.records
+    return records[store.contains(records.index)]
+
+
+def founder_companies(store, name):
+    # Founder records of every company in the store founded by `name`
+    index = store.root.founder_index
+    company_ids = index.lookup(name)
+    company_ids = company_ids[store.contains(company_ids)]
+    return with_bios(store, index.records.loc[company_ids])
+
+
+def with_bios(store, records):
+    # Founder records with their short bios, read from the text store for these rows only
+    return records.assign(shortBio=store.text('Founder Bio', records.index))
+
+
+@memoize(maxsize=8)
+def search_results(store, query):
+    # Companies of the store matching a full-text query, best match first
+    scores = store.root.search_index.scores(tokenize(query)).dropna()
+    scores = scores[store.contains(scores.index)]
+    results = store.root.companies.loc[scores.index,
+                                       ['Company', 'Country HQ', 'Industry', 'Total Funding']]
+    return results.assign(Score=scores).sort_values('Score', ascending=False)
+
+
+@memoize(maxsize=8)
+def valuation_points(store):
+    return store.companies[['Company', 'Total Funding', 'Last Valuation']].dropna(
+        subset=['Total Funding', 'Last Valuation'])
+
+
+@memoize()
+def deals_by_sector(store):
+    deals = store.rounds_with('Industry').dropna(subset=['amount_usd'])
+    deals['Industry'] = deals['Industry'].astype(object).fillna('Unknown')
+    return deals.groupby('Industry').agg(
+        total_deals=('amount_usd', 'count'),
+        total_amount=('amount_usd', 'sum')
+    ).rename_axis('sector').reset_index().sort_values('total_amount', ascending=False)
+
+
+@memoize()
+def unconverted_rounds(store):
+    # Rounds whose amount parsed but whose currency has no USD rate, counted per currency
+    rounds = store.rounds
+    currencies = rounds.loc[rounds['amount'].notna() & rounds['amount_usd'].isna(), 'currency']
+    return currencies.astype(object).value_counts()
+
+
+@memoize(maxsize=8)
+def coverage_cube(store):
+    # The full store builds its cube on first use and keeps it; filtered views get their own
+    if store.complete:
+        return store.root.coverage_cube
+    return CoverageCube(store.companies, store.rounds)
+
+
+@memoize(maxsize=8)
+def round_time_series(store):
+    if store.complete:
+        return store.root.round_time_series
+    return RoundTimeSeries(store.companies, store.rounds)
+
+
+@memoize()
+def funding_timeline(store, freq='Y', by=None, measure='Deals', start=None, end=None, window=1):
+    # Deals or funding per round-date bucket, optionally per country or industry
+    # and summed over trailing windows of `window` buckets
+    return round_time_series(store).series(freq, by, measure, start, end, window)
+
+
+@memoize()
+def funding_in_range(store, start=None, end=None, by=None):
+    return round_time_series(store).totals(start, end, by)
+
+
+@memoize()
+def market_coverage(store, countries):
+    counts = store.group_totals('country')['rows']
+    coverage = pd.DataFrame({
+        'Country': list(countries),
+        'Number of Companies': [int(counts.get(country, 0)) for country in countries],
+    })
+    return coverage.sort_values('Number of Companies', ascending=False)
+
+
+# Every insight table that can be computed from a store alone, for headless jobs
+INSIGHTS = {
+    'funding_over_time': funding_over_time,
+    'average_funding_per_round': average_funding_per_round,
+    'funding_by_country': funding_by_country,
+    'industry_distribution': industry_count,
+    'investor_counts': investor_counts,
+    'founder_counts': founder_counts,
+    'valuation_points': valuation_points,
+    'deals_by_sector': deals_by_sector,
+    'market_coverage': lambda store: market_coverage(
+        store, tuple(store.group_totals('country').index)),
+    'top_investors': top_investors,
+    'co_investor_pairs': co_investor_pairs,
+    'deals_by_round_year': lambda store: funding_timeline(store, 'Y').rename(index=str),
+    'funding_by_round_year': lambda store: funding_timeline(
+        store, 'Y', None, 'Funding (USD)').rename(index=str),
+}
+
+
+def insight_table(result):
+    # An insight result as a flat table, with named index levels as columns
+    if isinstance(result, pd.Series):
+        result = result.to_frame()
+    if any(name is not None for name in result.index.names):
+        return result.reset_index()
+    return result.reset_index(drop=True)
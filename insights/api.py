@@ -0,0 +1,191 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from .aggregates import INSIGHTS, insight_table
+from .cache import DatasetCache
+from .ingest import file_fingerprint, read_store, shards_fingerprint
+from .memo import LRUCache
+from .money import DEFAULT_RATES, rates_fingerprint
+from .search import tokenize
+
+# Read-only JSON API over the same insight tables the dashboard shows, e.g.
+#
+#   python -m insights.api exports/app.json regions=exports/regions.json --port 8600
+#   curl 'localhost:8600/datasets/app/deals_by_sector?min_funding=1000000&country=Germany'
+#   curl 'localhost:8600/datasets/app/top_investors?q=threat+intelligence'
+#
+# Datasets stay loaded between requests and are reloaded when their file
+# changes. Responses are cached by dataset version and normalized query, and
+# carry an ETag so pollers can revalidate with If-None-Match.
+
+logger = logging.getLogger(__name__)
+
+RESPONSE_CACHE_SIZE = 256
+
+
+class Datasets:
+    # name -> export path, each parsed once and kept warm until the file changes
+    def __init__(self, paths, cache=None):
+        self.paths = dict(paths)
+        self.cache = cache or DatasetCache()
+        self._loaded = {}
+        self._locks = {name: threading.Lock() for name in self.paths}
+
+    def get(self, name):
+        stat = os.stat(self.paths[name])
+        signature = (stat.st_mtime_ns, stat.st_size)
+        loaded = self._loaded.get(name)
+        if loaded is None or loaded[0] != signature:
+            with self._locks[name]:
+                loaded = self._loaded.get(name)
+                if loaded is None or loaded[0] != signature:
+                    loaded = self._loaded[name] = (signature, self._load(self.paths[name]))
+        return loaded[1]
+
+    def _load(self, path):
+        with open(path, 'rb') as file:
+            # Same key as an upload of the file in the dashboard, so both share the disk cache
+            fingerprint = shards_fingerprint([file_fingerprint(file)])
+            key = f'{fingerprint}-{rates_fingerprint(DEFAULT_RATES)}'
+            store = self.cache.get(key)
+            if store is None:
+                logger.info("Parsing %s", path)
+                store = read_store(file, DEFAULT_RATES)
+                self.cache.put(key, store)
+        store.fingerprint = key
+        return store
+
+
+def parse_filters(query):
+    params = parse_qs(query)
+    min_funding = float(params.get('min_funding', ['0'])[-1])
+    countries = tuple(sorted(set(params.get('country', []))))
+    industries = tuple(sorted(set(params.get('industry', []))))
+    query = ' '.join(tokenize(params.get('q', [''])[-1]))
+    return min_funding, countries, industries, query
+
+
+class InsightService:
+    def __init__(self, datasets):
+        self.datasets = datasets
+        self._responses = LRUCache(RESPONSE_CACHE_SIZE)
+
+    def handle(self, path, query):
+        # Returns (status, JSON body bytes, ETag or None)
+        parts = [part for part in path.split('/') if part]
+        if parts in ([], ['datasets']):
+            return HTTPStatus.OK, self._index(), None
+        if len(parts) != 3 or parts[0] != 'datasets':
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown path {path}")
+        name, insight = parts[1], parts[2]
+        if name not in self.datasets.paths:
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown dataset {name}")
+        if insight not in INSIGHTS:
+            return self._error(HTTPStatus.NOT_FOUND, f"Unknown insight {insight}")
+        try:
+            min_funding, countries, industries, text = parse_filters(query)
+        except ValueError as e:
+            return self._error(HTTPStatus.BAD_REQUEST, f"Invalid min_funding: {e}")
+
+        store = self.datasets.get(name)
+        key = (store.fingerprint, insight, min_funding, countries, industries, text)
+        response = self._responses.get(key)
+        if response is None:
+            view = store.above(min_funding).matching(countries, industries).search(text)
+            table = insight_table(INSIGHTS[insight](view))
+            rows = table.to_json(orient='records', date_format='iso')
+            header = json.dumps({
+                'dataset': name,
+                'version': store.fingerprint,
+                'insight': insight,
+                'filters': {'min_funding': min_funding, 'countries': countries,
+                            'industries': industries, 'q': text},
+            })
+            body = f'{header[:-1]}, "rows": {rows}}}'.encode('utf-8')
+            response = (body, hashlib.sha256(repr(key).encode('utf-8')).hexdigest()[:32])
+            self._responses.put(key, response)
+        return HTTPStatus.OK, response[0], response[1]
+
+    def _index(self):
+        index = {'datasets': sorted(self.datasets.paths), 'insights': sorted(INSIGHTS)}
+        return json.dumps(index).encode('utf-8')
+
+    def _error(self, status, message):
+        return status, json.dumps({'error': message}).encode('utf-8'), None
+
+
+class InsightRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlsplit(self.path)
+        try:
+            status, body, etag = self.server.service.handle(url.path, url.query)
+        except Exception as e:
+            logger.exception("Failed to answer %s", self.path)
+            status, body, etag = self.server.service._error(
+                HTTPStatus.INTERNAL_SERVER_ERROR, str(e))
+
+        etag = etag and f'"{etag}"'
+        if etag and self.headers.get('If-None-Match') == etag:
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.info("%s - %s", self.address_string(), format % args)
+
+
+def make_server(datasets, host='127.0.0.1', port=8600):
+    server = ThreadingHTTPServer((host, port), InsightRequestHandler)
+    server.daemon_threads = True
+    server.service = InsightService(datasets)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Serve the insight tables of JSON exports over HTTP.")
+    parser.add_argument('exports', nargs='+',
+                        help="export files, as PATH or NAME=PATH (default name: file stem)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8600)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(name)s %(message)s')
+
+    paths = {}
+    for export in args.exports:
+        name, _, path = export.rpartition('=')
+        paths[name or os.path.splitext(os.path.basename(path))[0]] = path
+    datasets = Datasets(paths)
+    # Loaded up front so the first requests do not wait on parsing
+    for name in paths:
+        datasets.get(name)
+
+    server = make_server(datasets, args.host, args.port)
+    logger.info("Serving %s on http://%s:%d", ', '.join(sorted(paths)), args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+import logging
+import math
+import os
+import shutil
+import tempfile
+
+import pyarrow as pa
+
+from .store import STORE_VERSION, CompanyStore
+from .texts import TextStore
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.environ.get(
+    'MARKET_COVERAGE_CACHE_DIR', os.path.join(os.path.expanduser('~'), '.cache', 'market-coverage'))
+
+
+def _megabytes(name, default):
+    # A size setting in megabytes; a value that is not a non-negative number
+    # falls back to the default rather than failing every import of the package
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    try:
+        megabytes = float(value)
+    except ValueError:
+        megabytes = math.nan
+    if not 0 <= megabytes < math.inf:
+        logger.warning("Ignoring %s=%r, not a number of megabytes; using %s", name, value, default)
+        return default
+    return megabytes
+
+
+CACHE_MAX_MB = _megabytes('MARKET_COVERAGE_CACHE_MB', 2048)
+
+TABLES = ('companies', 'rounds', 'round_investors', 'investors', 'issues', 'quarantine')
+
+
+def _directory_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class DatasetCache:
+    # Parsed stores persisted as uncompressed Arrow IPC files, one directory per
+    # content hash, so a repeated upload is read back instead of re-parsed. The
+    # tables are copied out of the mapped files into pandas frames; only the
+    # long text stays memory-mapped and is only read when asked for.
+    # Directory mtimes record last use and drive LRU eviction.
+    def __init__(self, directory=CACHE_DIR, max_bytes=int(CACHE_MAX_MB * 1024 * 1024)):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}-v{STORE_VERSION}')
+
+    def get(self, key):
+        path = self._path(key)
+        if not os.path.isdir(path):
+            return None
+        try:
+            tables = {}
+            for name in TABLES:
+                with pa.memory_map(os.path.join(path, f'{name}.arrow')) as source:
+                    tables[name] = pa.ipc.open_file(source).read_all().to_pandas()
+            with pa.memory_map(os.path.join(path, 'texts.arrow')) as source:
+                tables['texts'] = TextStore(pa.ipc.open_file(source).read_all())
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning("Discarding unreadable cache entry %s: %s", path, e)
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        os.utime(path)
+        return CompanyStore(**tables)
+
+    def put(self, key, store):
+        os.makedirs(self.directory, exist_ok=True)
+        staging = tempfile.mkdtemp(dir=self.directory, prefix='.staging-')
+        try:
+            texts = store.texts
+            if texts is None:
+                texts = TextStore.from_frame(store.companies)
+            for name in (*TABLES, 'texts'):
+                if name == 'texts':
+                    table = texts.table
+                else:
+                    table = pa.Table.from_pandas(getattr(store, name))
+                with pa.OSFile(os.path.join(staging, f'{name}.arrow'), 'wb') as sink:
+                    with pa.ipc.new_file(sink, table.schema) as writer:
+                        writer.write_table(table)
+            os.replace(staging, self._path(key))
+        except (OSError, pa.ArrowInvalid, pa.ArrowTypeError) as e:
+            # Another worker may have cached the same file first, or a column
+            # holds values Arrow cannot type; either way the store stays usable
+            logger.info("Not caching dataset %s: %s", key, e)
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_dir() and not entry.name.startswith('.staging-'):
+                entries.append((entry.stat().st_mtime, _directory_size(entry.path), entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+# Coverage cube over country x industry x founded year x last-round year, with
+# company counts and funding sums per cell, plus the same dimensions x round name
+# with round counts, round amounts and the companies that raised each round.
+# Only occupied cells are stored, as one code array per dimension, so a roll-up
+# or drill-down is a mask and a bincount over the cells and never a scan of rows.
+#
+# Rolling the round dimension up over several round names counts a company once
+# per round it raised; group by round for per-round company counts.
+
+UNKNOWN = 'Unknown'
+
+COMPANY_DIMENSIONS = {
+    'country': lambda companies: companies['Country HQ'],
+    'industry': lambda companies: companies['Industry'],
+    'founded': lambda companies: companies['Founded'],
+    # Int64, so the year labels read 2021 rather than 2021.0
+    'last_round_year': lambda companies: (
+        pd.to_datetime(companies['Last Round Date'], errors='coerce').dt.year.astype('Int64')),
+}
+DIMENSIONS = [*COMPANY_DIMENSIONS, 'round']
+LABELS = {
+    'country': 'Country', 'industry': 'Industry', 'founded': 'Founded',
+    'last_round_year': 'Last Round Year', 'round': 'Round',
+}
+
+
+def _encode(values):
+    # Sorted integer codes, with missing values as a trailing 'Unknown' label
+    codes, labels = pd.factorize(pd.Series(values).astype(object), sort=True)
+    labels = pd.Index(list(labels) + [UNKNOWN], dtype=object)
+    return np.where(codes < 0, len(labels) - 1, codes), labels
+
+
+class _Cells:
+    # Occupied cells of a fact table: a code array per dimension and one array per measure
+    def __init__(self, codes, shape, measures, distinct=None):
+        keys = np.ravel_multi_index([codes[d] for d in codes], shape)
+        cells, inverse = np.unique(keys, return_inverse=True)
+        self.codes = dict(zip(codes, np.unravel_index(cells, shape)))
+        self.measures = {name: np.bincount(inverse, weights=values, minlength=len(cells))
+                         for name, values in measures.items()}
+        if distinct is not None:
+            # Distinct entities per cell: count each (cell, entity) pair once
+            name, entities = distinct
+            pairs = np.unique(np.stack([inverse, entities]), axis=1)
+            self.measures[name] = np.bincount(pairs[0], minlength=len(cells)).astype('float64')
+
+    def __len__(self):
+        return len(next(iter(self.measures.values())))
+
+
+class CoverageCube:
+    def __init__(self, companies, rounds):
+        codes, self.labels = {}, {}
+        for dimension, read in COMPANY_DIMENSIONS.items():
+            codes[dimension], self.labels[dimension] = _encode(read(companies))
+        company_shape = tuple(len(self.labels[d]) for d in COMPANY_DIMENSIONS)
+        funding = companies['Total Funding'].to_numpy(dtype='float64', na_value=np.nan)
+        self._companies = _Cells(codes, company_shape, {
+            'Companies': np.ones(len(companies)),
+            'Total Funding': np.nan_to_num(funding),
+        })
+
+        positions = companies.index.get_indexer(rounds['company_id'])
+        keep = positions >= 0
+        positions = positions[keep]
+        round_codes = {d: codes[d][positions] for d in COMPANY_DIMENSIONS}
+        round_codes['round'], self.labels['round'] = _encode(rounds['round'].to_numpy()[keep])
+        amounts = rounds['amount_usd'].to_numpy(dtype='float64', na_value=np.nan)[keep]
+        self._rounds = _Cells(round_codes, company_shape + (len(self.labels['round']),), {
+            'Rounds': np.ones(len(positions)),
+            'Round Funding': np.nan_to_num(amounts),
+        }, distinct=('Companies', positions))
+
+    def query(self, by=(), filters=None):
+        # Measures grouped by the `by` dimensions over the cells matching
+        # `filters` (dimension -> selected labels). Company measures unless the
+        # round dimension is grouped or filtered, then round measures.
+        filters = filters or {}
+        cells = self._rounds if 'round' in by or 'round' in filters else self._companies
+        mask = np.ones(len(cells), dtype=bool)
+        for dimension, values in filters.items():
+            selected = np.zeros(len(self.labels[dimension]), dtype=bool)
+            positions = self.labels[dimension].get_indexer(pd.Index(list(values), dtype=object))
+            selected[positions[positions >= 0]] = True
+            mask &= selected[cells.codes[dimension]]
+
+        shape = tuple(len(self.labels[d]) for d in by)
+        if by:
+            groups = np.ravel_multi_index([cells.codes[d][mask] for d in by], shape)
+        else:
+            groups = np.zeros(np.count_nonzero(mask), dtype='int64')
+        totals = {name: np.bincount(groups, weights=values[mask], minlength=int(np.prod(shape)))
+                  for name, values in cells.measures.items()}
+        occupied = np.flatnonzero(totals['Companies'])
+        columns = {name: values[occupied] for name, values in totals.items()}
+        for name in ('Companies', 'Rounds'):
+            if name in columns:
+                columns[name] = columns[name].astype('int64')
+
+        if len(by) == 1:
+            index = pd.Index(self.labels[by[0]].to_numpy()[occupied], dtype=object,
+                             name=LABELS[by[0]])
+        elif by:
+            levels = np.unravel_index(occupied, shape)
+            index = pd.MultiIndex.from_arrays(
+                [self.labels[d].to_numpy()[level] for d, level in zip(by, levels)],
+                names=[LABELS[d] for d in by])
+        else:
+            index = None
+        return pd.DataFrame(columns, index=index)
@@ -0,0 +1,74 @@
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .memo import LRUCache
+
+# Table exports, serialized only when someone asks for them and kept per
+# (table, dataset key, format), so each distinct export is written once.
+# The dataset key carries the content hash of the loaded data and its filters.
+# The kept exports are bounded in count and in bytes; an export larger than
+# the byte budget is handed out but prepared again when asked for again.
+
+EXPORT_CACHE_SIZE = 16
+EXPORT_CACHE_BYTES = 256 * 1024 * 1024
+ROWS_PER_CHUNK = 50000
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Arrow': ('arrow', 'application/vnd.apache.arrow.file'),
+}
+
+_exports = LRUCache(EXPORT_CACHE_SIZE, max_bytes=EXPORT_CACHE_BYTES)
+
+
+def _arrow_table(frame, index):
+    try:
+        return pa.Table.from_pandas(frame, preserve_index=index)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Columns mixing value types (nested founder records, say) are written as text
+        frame = frame.copy()
+        for column in frame.columns[frame.dtypes == object]:
+            try:
+                pa.array(frame[column])
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                frame[column] = frame[column].map(
+                    lambda value: None if value is None else str(value))
+        return pa.Table.from_pandas(frame, preserve_index=index)
+
+
+def export_bytes(frame, fmt, index=False, rows_per_chunk=ROWS_PER_CHUNK):
+    # Written a chunk of rows at a time, so no full-size intermediate copy of
+    # the table (a CSV string, say) is held next to the output
+    buffer = io.BytesIO()
+    if fmt == 'CSV':
+        text = io.TextIOWrapper(buffer, encoding='utf-8', newline='', write_through=True)
+        for start in range(0, max(len(frame), 1), rows_per_chunk):
+            frame.iloc[start:start + rows_per_chunk].to_csv(text, index=index, header=start == 0)
+        text.detach()
+    elif fmt == 'Parquet':
+        pq.write_table(_arrow_table(frame, index), buffer, row_group_size=rows_per_chunk)
+    elif fmt == 'Arrow':
+        table = _arrow_table(frame, index)
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            for batch in table.to_batches(max_chunksize=rows_per_chunk):
+                writer.write_batch(batch)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+    return buffer.getvalue()
+
+
+def cached_export(name, data_key, fmt):
+    return _exports.get((name, data_key, fmt))
+
+
+def prepare_export(name, data_key, frame, fmt, index=False):
+    key = (name, data_key, fmt)
+    data = _exports.get(key)
+    if data is None:
+        data = export_bytes(frame, fmt, index)
+        _exports.put(key, data)
+    return data
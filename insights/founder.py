@@ -1,23 +1,41 @@
 import pandas as pd
 import streamlit as st
-import plotly.express as px
+
+from .aggregates import (
+    founder_companies,
+    founder_counts,
+    founder_names,
+    founder_records,
+    with_bios,
+)
+from .reduce import MAX_CATEGORIES, top_k
+from .render import download_table
+from .store import as_store
+
+
+def _field(founder, key, default='N/A'):
+    value = founder.get(key)
+    return default if value is None or pd.isna(value) else value
 
 def plot_foundersAnalysis(companies_data):
     st.header("Founder Analysis")
     
-    df = pd.DataFrame(companies_data)
-    
-    # Extract founder names, handling potential None values
-    founder_names = df['Founder'].apply(lambda x: x['name'] if isinstance(x, dict) and 'name' in x else 'Unknown')
-    
-    # Count the occurrences of each founder name
-    founder_count = founder_names.value_counts().reset_index()
-    founder_count.columns = ['Founder', 'Number of Companies']
+    store = as_store(companies_data)
+
+    # Count the companies of each founder
+    founder_count = founder_counts(store)
+    num_founders = st.slider("Select number of top founders to display",
+                             min_value=5, max_value=100, value=MAX_CATEGORIES)
+    # Only the top founders are sent to the browser, the rest as a single bar
+    founder_count = top_k(founder_count, 'Founder', 'Number of Companies', k=num_founders)
 
     # Create an interactive bar chart using Plotly
+    import plotly.express as px
+
     fig = px.bar(founder_count, x='Founder', y='Number of Companies', 
                  title='Number of Companies Founded by Each Founder',
-                 labels={'Founder': 'Founder Name', 'Number of Companies': 'Number of Companies Founded'},
+                 labels={'Founder': 'Founder Name',
+                         'Number of Companies': 'Number of Companies Founded'},
                  color='Number of Companies', color_continuous_scale='Viridis')
     fig.update_layout(xaxis_tickangle=-45, height=600)
     st.plotly_chart(fig, use_container_width=True)
@@ -26,32 +44,23 @@ def plot_foundersAnalysis(companies_data):
     st.subheader("Founder Details")
     
     # Create a selectbox to choose a founder
-    founder_list = [founder['name'] for founder in df['Founder'] if isinstance(founder, dict) and 'name' in founder]
-    selected_founder = st.selectbox("Select a founder to view details:", founder_list)
-
-    # Display information for the selected founder
-    for _, company in df.iterrows():
-        founder = company['Founder']
-        if isinstance(founder, dict) and 'name' in founder and founder['name'] == selected_founder:
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown(f"### {founder['name']}")
-                st.write(f"**Company:** {company['Company']}")
-                st.write(f"**Designation:** {founder.get('designation', 'N/A')}")
-                st.write(f"**Email:** {founder.get('email', 'N/A')}")
-            with col2:
-                st.markdown("#### Short Bio")
-                st.write(founder.get('shortBio', 'N/A'))
-                if 'linkedin' in founder:
-                    st.markdown(f"[LinkedIn Profile]({founder['linkedin']})")
-            st.markdown("---")
+    selected_founder = st.selectbox("Select a founder to view details:", founder_names(store))
+
+    # Display information for the selected founder, one block per company they founded
+    for founder in founder_companies(store, selected_founder).to_dict('records'):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.markdown(f"### {founder['name']}")
+            st.write(f"**Company:** {founder['Company']}")
+            st.write(f"**Designation:** {_field(founder, 'designation')}")
+            st.write(f"**Email:** {_field(founder, 'email')}")
+        with col2:
+            st.markdown("#### Short Bio")
+            st.write(_field(founder, 'shortBio'))
+            if _field(founder, 'linkedin', None):
+                st.markdown(f"[LinkedIn Profile]({founder['linkedin']})")
+        st.markdown("---")
 
     # Add a download button for founder data
-    founder_df = pd.DataFrame([f for f in df['Founder'] if isinstance(f, dict)])
-    csv = founder_df.to_csv(index=False)
-    st.download_button(
-        label="Download Founder Data as CSV",
-        data=csv,
-        file_name="founder_data.csv",
-        mime="text/csv",
-    )
+    download_table("founder data", "founder_data", store.key,
+                   lambda: with_bios(store, founder_records(store)).drop(columns='Company'))
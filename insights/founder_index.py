@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+
+# The nested 'Founder' record of a company, flattened to one column per field
+FOUNDER_COLUMNS = {
+    'name': 'Founder',
+    'designation': 'Founder Designation',
+    'email': 'Founder Email',
+    'linkedin': 'Founder LinkedIn',
+    'shortBio': 'Founder Bio',
+}
+
+
+def normalize_names(names):
+    # Case- and whitespace-insensitive key, so "Louis  Hur" and "louis hur" resolve together
+    keys = names.str.casefold().str.split().str.join(' ')
+    return keys.mask(keys == '')
+
+
+class FounderIndex:
+    # Built once per dataset: normalized founder name -> company ids, plus the
+    # founder records themselves, so lookups never scan the companies table
+    def __init__(self, companies):
+        names = companies['Founder'].astype(object)
+        self.keys = normalize_names(names)
+
+        # First spelling seen is used for display
+        known = self.keys.notna()
+        display = names[known].groupby(self.keys[known], sort=False).first()
+        self.names = dict(zip(display.index, display))
+        self.sorted_keys = sorted(self.names, key=lambda key: str(self.names[key]).casefold())
+
+        self._companies = {
+            key: np.asarray(ids)
+            for key, ids in self.keys[known].groupby(self.keys[known], sort=False).groups.items()
+        }
+
+        # Founder fields under their export names; bios live in the text store
+        columns = {column: key for key, column in FOUNDER_COLUMNS.items() if column in companies}
+        records = companies[list(columns)].rename(columns=columns)
+        self.records = records[records.notna().any(axis=1)].astype(object)
+        self.records.insert(0, 'Company', companies.loc[self.records.index, 'Company'])
+
+    def lookup(self, name):
+        # Company ids of every company founded by `name`
+        if not isinstance(name, str):
+            return np.array([], dtype='int64')
+        key = normalize_names(pd.Series([name], dtype=object)).iloc[0]
+        return self._companies.get(key, np.array([], dtype='int64'))
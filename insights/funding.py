@@ -1,35 +1,35 @@
 
-import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from .aggregates import (
+    average_funding_per_round,
+    funding_in_range,
+    funding_over_time,
+    funding_timeline,
+    round_time_series,
+)
+from .reduce import top_columns
+from .render import download_table, render_figure, rotate_xticks
+from .store import as_store
+from .timeseries import FREQUENCIES, GROUPS, MEASURES
+
+
 def plot_funding_over_time(companies_data):
-    # Convert the list of company data into a DataFrame
-    df = pd.DataFrame(companies_data)
-    
-    # Parse the 'Fundraising History' and calculate Total Funding
-    df['Total Funding'] = df['Fundraising History'].apply(
-        lambda x: sum([
-            int(float(round['amount'].split()[0])) 
-            for round_name, round in x.items() 
-            if isinstance(round, dict) and 'amount' in round and round_name != 'founded'
-        ])
-    )
-
-    # Group by 'Founded' year and sum the total funding
-    funding_trend = df.groupby('Founded')[['Total Funding']].sum()
+    store = as_store(companies_data)
+    funding_trend = funding_over_time(store)
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(10, 6))
-    funding_trend.plot(kind='bar', ax=ax)
-    plt.title("Total Funding Over Time")
-    plt.xlabel("Year Founded")
-    plt.ylabel("Total Funding in USD")
-    plt.xticks(rotation=45)
-    plt.tight_layout()
+    def draw(fig):
+        ax = fig.subplots()
+        funding_trend.plot(kind='bar', ax=ax)
+        ax.set_title("Total Funding Over Time")
+        ax.set_xlabel("Year Founded")
+        ax.set_ylabel("Total Funding in USD")
+        rotate_xticks(ax, 45)
+        fig.tight_layout()
 
     # Display the plot in Streamlit
-    st.pyplot(fig)
+    render_figure('funding_over_time', store.key, (), draw, figsize=(10, 6))
 
     # Display the data as a table
     st.write("Funding Trend Data:")
@@ -37,54 +37,90 @@ def plot_funding_over_time(companies_data):
 
 
 def plot_average_funding_per_round(companies_data):
-    # Convert the list of company data into a DataFrame
-    df = pd.DataFrame(companies_data)
-
-    # Compute average funding per round
-    funding_rounds = []
-    for history in df['Fundraising History']:
-        for round_name, round_data in history.items():
-            if isinstance(round_data, dict) and 'amount' in round_data and round_name != 'founded':
-                funding_rounds.append({
-                    'round': round_name,
-                    'amount': float(round_data['amount'].split()[0])
-                })
-    
-    funding_df = pd.DataFrame(funding_rounds)
-    funding_averages = funding_df.groupby('round')['amount'].agg(['mean', 'count'])
-    funding_averages = funding_averages.sort_values('mean', ascending=False)
+    store = as_store(companies_data)
+    funding_averages = average_funding_per_round(store)
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars = funding_averages['mean'].plot(kind='bar', ax=ax)
-    plt.title("Average Funding per Round")
-    plt.xlabel("Funding Round")
-    plt.ylabel("Average Amount in USD")
-    plt.xticks(rotation=45)
+    def draw(fig):
+        ax = fig.subplots()
+        funding_averages['mean'].plot(kind='bar', ax=ax)
+        ax.set_title("Average Funding per Round")
+        ax.set_xlabel("Funding Round")
+        ax.set_ylabel("Average Amount in USD")
+        rotate_xticks(ax, 45)
 
-    # Add value labels on top of each bar
-    for i, v in enumerate(funding_averages['mean']):
-        ax.text(i, v, f'${v:,.0f}\n(n={funding_averages["count"][i]})', 
-                ha='center', va='bottom')
+        # Add value labels on top of each bar
+        for i, (v, n) in enumerate(zip(funding_averages['mean'], funding_averages['count'])):
+            ax.text(i, v, f'${v:,.0f}\n(n={n})', ha='center', va='bottom')
 
-    plt.tight_layout()
+        fig.tight_layout()
 
     # Display the plot in Streamlit
-    st.pyplot(fig)
+    render_figure('average_funding_per_round', store.key, (), draw, figsize=(12, 6))
 
     # Display the data as a table
     st.write("Average Funding per Round Data:")
     st.dataframe(funding_averages)
 
     # Add a download button for the data
-    csv = funding_averages.to_csv().encode('utf-8')
-    st.download_button(
-        label="Download funding averages as CSV",
-        data=csv,
-        file_name="funding_averages.csv",
-        mime="text/csv",
-    )
+    download_table("funding averages", "funding_averages", store.key, funding_averages, index=True)
+
+def plot_funding_timeline(companies_data):
+    store = as_store(companies_data)
+    series = round_time_series(store)
+    if not len(series.months):
+        st.info("No funding rounds with a date or year")
+        return
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        bucket = st.radio("Bucket", list(FREQUENCIES), index=2, horizontal=True,
+                          key="timeline_bucket")
+    with col2:
+        by = st.selectbox("Split by", [None, *GROUPS], key="timeline_by",
+                          format_func=lambda by: "Nothing" if by is None else by.title())
+    with col3:
+        measure = st.radio("Measure", MEASURES, horizontal=True, key="timeline_measure")
+
+    # Every control below is answered from the running sums, without rescanning rounds
+    freq = FREQUENCIES[bucket]
+    periods = list(series.months.asfreq(freq).unique())
+    start, end = periods[0], periods[-1]
+    if len(periods) > 1:
+        start, end = st.select_slider("Round dates", options=periods, value=(start, end),
+                                      format_func=str, key=f"timeline_range_{freq}")
+    window = st.number_input(f"Trailing window ({bucket.lower()}s)", min_value=1,
+                             max_value=len(periods), value=1, key=f"timeline_window_{freq}",
+                             help="12 months gives trailing-12-month volume")
+
+    timeline = funding_timeline(store, freq, by, measure, start, end, window)
+    chart = top_columns(timeline)
+
+    def draw(fig):
+        ax = fig.subplots()
+        chart.plot(ax=ax, marker='o' if len(chart) < 30 else None)
+        title = f"{measure} by round date"
+        if window > 1:
+            title = f"{measure}, trailing {window} {bucket.lower()}s"
+        ax.set_title(title)
+        ax.set_xlabel(bucket)
+        ax.set_ylabel(measure)
+        fig.tight_layout()
+
+    render_figure('funding_timeline', store.key, (freq, by, measure, start, end, window), draw,
+                  figsize=(12, 6))
+    if series.undated:
+        st.caption(f"{series.undated:,} rounds without a date or year are left out")
+    st.caption("Rounds known only by their year are counted in its January")
+
+    st.write(f"Totals from {start} to {end}:")
+    totals = funding_in_range(store, start.asfreq('M', 'start'), end.asfreq('M', 'end'), by)
+    st.dataframe(totals)
+    download_table("funding timeline", "funding_timeline",
+                   (store.key, freq, by, measure, start, end, window),
+                   lambda: timeline.rename(index=str), index=True)
 
 # Example usage:
 # plot_funding_over_time(companies_data)
 # plot_average_funding_per_round(companies_data)
+# plot_funding_timeline(companies_data)
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+
+# Each dimension yields (group key, value to sum) for every company, or for every
+# round when listed in ROUND_DIMENSIONS
+DIMENSIONS = {
+    'country': lambda store: (store.companies['Country HQ'], store.companies['Total Funding']),
+    'industry': lambda store: (store.companies['Industry'], store.companies['Total Funding']),
+    'founded': lambda store: (store.companies['Founded'], store.round_totals()),
+    'round': lambda store: (store.rounds['round'], store.rounds['amount_usd']),
+}
+ROUND_DIMENSIONS = {'round'}
+
+
+class _GroupPrefix:
+    # Rows sorted by (group, funding rank of their company) with running row counts,
+    # non-null value counts and value sums, so the totals of every group above a
+    # threshold are two lookups per group
+    def __init__(self, keys, ranks, values, n_ranks):
+        codes, labels = pd.factorize(keys, sort=True)
+        if isinstance(labels, pd.Categorical):
+            labels = labels.astype(object)
+        self.labels = pd.Index(labels, name=keys.name)
+        values = np.asarray(values, dtype='float64')
+        keep = codes >= 0
+        codes, ranks, values = codes[keep], ranks[keep], values[keep]
+
+        self._stride = n_ranks + 1
+        order = np.argsort(codes * self._stride + ranks, kind='stable')
+        self._keys = (codes * self._stride + ranks)[order]
+        values = values[order]
+        self._count = np.concatenate([[0], np.cumsum(~np.isnan(values))])
+        self._sum = np.concatenate([[0.0], np.cumsum(np.nan_to_num(values))])
+        self._ends = np.searchsorted(self._keys, np.arange(1, len(self.labels) + 1) * self._stride)
+
+    def totals(self, min_rank):
+        starts = np.searchsorted(self._keys, np.arange(len(self.labels)) * self._stride + min_rank)
+        ends = self._ends
+        totals = pd.DataFrame({
+            'rows': ends - starts,
+            'count': self._count[ends] - self._count[starts],
+            'sum': self._sum[ends] - self._sum[starts],
+        }, index=self.labels)
+        return totals[totals['rows'] > 0]
+
+
+class FundingIndex:
+    # Companies and rounds ordered by the company's 'Total Funding' (missing counts
+    # as zero). A minimum-funding filter is a binary search that leaves a suffix of
+    # each ordering, and per-group aggregates come from prefix sums.
+    def __init__(self, store):
+        funding = store.companies['Total Funding'].fillna(0).to_numpy(dtype='float64')
+        self._funding = np.sort(funding)
+        self._company_order = np.argsort(funding, kind='stable')
+        self._company_ranks = np.searchsorted(self._funding, funding)
+
+        round_positions = store.companies.index.get_indexer(store.rounds['company_id'])
+        self._round_ranks = self._company_ranks[round_positions]
+        self._round_order = np.argsort(self._round_ranks, kind='stable')
+        self._sorted_round_ranks = self._round_ranks[self._round_order]
+
+        self._store = store
+        self._groups = {}
+
+    def rank(self, min_funding):
+        return int(np.searchsorted(self._funding, min_funding))
+
+    def companies_at_least(self, min_funding):
+        # Row positions in original order
+        return np.sort(self._company_order[self.rank(min_funding):])
+
+    def rounds_at_least(self, min_funding):
+        start = np.searchsorted(self._sorted_round_ranks, self.rank(min_funding))
+        return np.sort(self._round_order[start:])
+
+    def group_totals(self, dimension, min_funding):
+        if dimension not in self._groups:
+            keys, values = DIMENSIONS[dimension](self._store)
+            ranks = self._round_ranks if dimension in ROUND_DIMENSIONS else self._company_ranks
+            self._groups[dimension] = _GroupPrefix(keys, ranks, values, len(self._funding))
+        return self._groups[dimension].totals(self.rank(min_funding))
@@ -1,13 +1,13 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-
-import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from .aggregates import industry_count as compute_industry_count
+from .render import download_table, render_figure, rotate_xticks
+from .store import as_store
+
+
 def plot_industry_distribution(companies_data):
-    df = pd.DataFrame(companies_data)
-    industry_count = df['Industry'].value_counts()
+    store = as_store(companies_data)
+    industry_count = compute_industry_count(store)
 
     # Allow user to select the number of top industries to display
     num_industries = st.slider("Select number of top industries to display", 
@@ -17,39 +17,35 @@ def plot_industry_distribution(companies_data):
     top_industries = industry_count.nlargest(num_industries)
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(12, 6))
-    bars = top_industries.plot(kind='bar', ax=ax)
-    plt.title(f"Top {num_industries} Industries by Number of Companies")
-    plt.xlabel("Industry")
-    plt.ylabel("Number of Companies")
-    plt.xticks(rotation=45, ha='right')
+    def draw(fig):
+        ax = fig.subplots()
+        top_industries.plot(kind='bar', ax=ax)
+        ax.set_title(f"Top {num_industries} Industries by Number of Companies")
+        ax.set_xlabel("Industry")
+        ax.set_ylabel("Number of Companies")
+        rotate_xticks(ax, 45, ha='right')
 
-    # Add value labels on top of each bar
-    for i, v in enumerate(top_industries):
-        ax.text(i, v, str(v), ha='center', va='bottom')
+        # Add value labels on top of each bar
+        for i, v in enumerate(top_industries):
+            ax.text(i, v, str(v), ha='center', va='bottom')
 
-    plt.tight_layout()
+        fig.tight_layout()
 
     # Display the plot in Streamlit
-    st.pyplot(fig)
+    render_figure('industry_distribution', store.key, (num_industries,), draw, figsize=(12, 6))
 
     # Display the data as a table
     st.write("Industry Distribution Data:")
     st.dataframe(industry_count)
 
     # Add a download button for the data
-    csv = industry_count.to_csv().encode('utf-8')
-    st.download_button(
-        label="Download industry distribution as CSV",
-        data=csv,
-        file_name="industry_distribution.csv",
-        mime="text/csv",
-    )
+    download_table("industry distribution", "industry_distribution", store.key, industry_count,
+                   index=True)
 
     # Display additional statistics
     st.write("Industry Statistics:")
     st.write(f"Total number of industries: {len(industry_count)}")
-    st.write(f"Most common industry: {industry_count.index[0]} ({industry_count.iloc[0]} companies)")
-    st.write(f"Least common industry: {industry_count.index[-1]} ({industry_count.iloc[-1]} companies)")
-
-
+    st.write(f"Most common industry: {industry_count.index[0]} "
+             f"({industry_count.iloc[0]} companies)")
+    st.write(f"Least common industry: {industry_count.index[-1]} "
+             f"({industry_count.iloc[-1]} companies)")
@@ -0,0 +1,128 @@
+import codecs
+import hashlib
+import io
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext
+from itertools import islice
+
+from .store import StoreBuilder, merge_stores
+
+CHUNK_BYTES = 1 << 20
+RECORDS_PER_BATCH = 5000
+
+_decoder = json.JSONDecoder()
+_SEPARATORS = ' \t\r\n,'
+
+
+def iter_records(file, chunk_bytes=CHUNK_BYTES, on_progress=None):
+    # Walk the top-level JSON array one record at a time, keeping only the
+    # unread tail of the current chunk in memory
+    text = codecs.getincrementaldecoder('utf-8-sig')()
+    buffer, pos, bytes_read = '', 0, 0
+    in_array = eof = False
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in _SEPARATORS:
+            pos += 1
+        if pos < len(buffer):
+            if not in_array:
+                if buffer[pos] != '[':
+                    raise ValueError("Expected a JSON array of companies")
+                in_array = True
+                pos += 1
+                continue
+            if buffer[pos] == ']':
+                return
+            try:
+                record, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The record continues in the next chunk
+                if eof:
+                    raise
+            else:
+                yield record
+                continue
+        elif eof:
+            raise ValueError("Unexpected end of JSON array")
+
+        chunk = file.read(chunk_bytes)
+        eof = not chunk
+        bytes_read += len(chunk)
+        if isinstance(chunk, bytes):
+            chunk = text.decode(chunk, final=eof)
+        buffer, pos = buffer[pos:] + chunk, 0
+        if on_progress is not None:
+            on_progress(bytes_read)
+
+
+def read_store(file, rates=None, batch_size=RECORDS_PER_BATCH, on_progress=None):
+    builder = StoreBuilder(rates)
+    records = iter_records(file, on_progress=on_progress)
+    while batch := list(islice(records, batch_size)):
+        builder.add(batch)
+    return builder.build()
+
+
+def _open_shard(source):
+    # A shard is a file path, the raw bytes of an upload or an open binary file
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    if hasattr(source, 'read'):
+        return nullcontext(source)
+    return open(source, 'rb')
+
+
+def _read_shard(source, rates, on_progress=None):
+    with _open_shard(source) as file:
+        if on_progress is None:
+            return read_store(file, rates)
+        total = max(file_size(file), 1)
+        return read_store(file, rates, on_progress=lambda done: on_progress(min(done / total, 1.0)))
+
+
+def read_shards(sources, rates=None, workers=None, on_progress=None):
+    # Parse the shards in separate processes and merge them in the given order,
+    # so later shards win when the same company appears more than once. Open
+    # files cannot be sent to the workers, so only a single shard may be one.
+    # on_progress receives the fraction parsed: of the bytes for a single shard,
+    # of the shards otherwise. Workers are spawned rather than forked, as the
+    # caller may be threaded (Streamlit) and a fork copies only the calling
+    # thread, possibly while another one holds a lock.
+    sources = list(sources)
+    if len(sources) == 1:
+        stores = [_read_shard(sources[0], rates, on_progress)]
+    else:
+        stores = [None] * len(sources)
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = {pool.submit(_read_shard, source, rates): i
+                       for i, source in enumerate(sources)}
+            for done, future in enumerate(as_completed(futures), start=1):
+                stores[futures[future]] = future.result()
+                if on_progress is not None:
+                    on_progress(done / len(sources))
+    return merge_stores(stores)
+
+
+def file_size(file):
+    position = file.tell()
+    size = file.seek(0, 2)
+    file.seek(position)
+    return size
+
+
+def shards_fingerprint(fingerprints):
+    # Order matters: it decides which copy of a repeated company is kept
+    return hashlib.sha256('\n'.join(fingerprints).encode('utf-8')).hexdigest()
+
+
+def file_fingerprint(file, chunk_bytes=CHUNK_BYTES):
+    # Content hash of the upload, read in chunks so large exports are never fully buffered
+    digest = hashlib.sha256()
+    file.seek(0)
+    while chunk := file.read(chunk_bytes):
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode('utf-8'))
+    file.seek(0)
+    return digest.hexdigest()
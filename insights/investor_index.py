@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+
+
+def split_investors(rounds):
+    # One investor name per entry, indexed by the round it comes from
+    names = rounds['investors'].dropna().str.split(',').explode().str.strip()
+    return names[names.notna() & (names != '')]
+
+
+def intern_investors(rounds):
+    # Split every round's comma-separated investors once and intern the names to
+    # integer ids: returns (round_id, investor_id) pairs and the id -> name table
+    names = split_investors(rounds)
+    investor_ids, investors = pd.factorize(names)
+    round_investors = pd.DataFrame({
+        'round_id': names.index.to_numpy(dtype='int64'),
+        'investor_id': investor_ids.astype('int64'),
+    }).drop_duplicates(ignore_index=True)
+    return round_investors, pd.DataFrame({'investor': investors}).rename_axis('investor_id')
+
+
+class InvestorIndex:
+    # Company x investor incidence in compressed-column form (companies of each
+    # investor are a contiguous slice), plus one entry per (round, investor) for
+    # deal counts and capital. Queries take the store they run against and only
+    # count companies it contains.
+    def __init__(self, rounds, round_investors, investors):
+        self.names = investors['investor'].to_numpy()
+        self.ids = pd.Series(np.arange(len(self.names)), index=self.names)
+
+        self.round_ids = round_investors['round_id'].to_numpy()
+        self.investor_ids = round_investors['investor_id'].to_numpy()
+        self.company_ids = rounds['company_id'].reindex(self.round_ids).to_numpy()
+        self.amounts = rounds['amount_usd'].reindex(self.round_ids).to_numpy(dtype='float64')
+
+        pairs = pd.DataFrame({'investor': self.investor_ids, 'company': self.company_ids})
+        pairs = pairs.drop_duplicates().sort_values(['investor', 'company'])
+        self.pair_investors = pairs['investor'].to_numpy()
+        self.pair_companies = pairs['company'].to_numpy()
+        self.indptr = np.searchsorted(self.pair_investors, np.arange(len(self.names) + 1))
+
+    def unique_investor_counts(self, store):
+        # Row sums of the incidence matrix
+        active = store.contains(self.pair_companies)
+        counts = pd.Series(self.pair_companies[active]).value_counts()
+        return counts.reindex(store.companies.index, fill_value=0)
+
+    def top_investors(self, store):
+        active = store.contains(self.company_ids)
+        investors = self.investor_ids[active]
+        n = len(self.names)
+        pair_active = store.contains(self.pair_companies)
+        table = pd.DataFrame({
+            'Investor': self.names,
+            'Deals': np.bincount(investors, minlength=n),
+            'Companies': np.bincount(self.pair_investors[pair_active], minlength=n),
+            # Investor shares of a round are unknown, so each participant is credited the full round
+            'Round Capital (USD)': np.bincount(
+                investors, weights=np.nan_to_num(self.amounts[active]), minlength=n),
+        })
+        table = table[table['Deals'] > 0]
+        return table.sort_values(['Deals', 'Round Capital (USD)'], ascending=False,
+                                 ignore_index=True)
+
+    def co_investor_pairs(self, store):
+        active = store.contains(self.company_ids)
+        entries = pd.DataFrame({'round': self.round_ids[active],
+                                'investor': self.investor_ids[active]})
+        pairs = entries.merge(entries, on='round')
+        pairs = pairs[pairs['investor_x'] < pairs['investor_y']]
+        shared = pairs.groupby(['investor_x', 'investor_y']).size().sort_values(ascending=False)
+        return pd.DataFrame({
+            'Investor A': self.names[shared.index.get_level_values(0)],
+            'Investor B': self.names[shared.index.get_level_values(1)],
+            'Shared Rounds': shared.to_numpy(),
+        })
+
+    def portfolio(self, store, investor):
+        # Company ids in one column of the incidence matrix
+        if investor not in self.ids:
+            return np.array([], dtype='int64')
+        investor_id = self.ids[investor]
+        companies = self.pair_companies[self.indptr[investor_id]:self.indptr[investor_id + 1]]
+        return companies[store.contains(companies)]
+
+    def portfolio_overlap(self, store, first, second):
+        return np.intersect1d(self.portfolio(store, first), self.portfolio(store, second))
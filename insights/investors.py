@@ -1,30 +1,20 @@
-import pandas as pd
-import matplotlib.pyplot as plt
 import streamlit as st
 
-def plot_total_investors(companies_data):
-    # Convert the list of company data into a DataFrame
-    df = pd.DataFrame(companies_data)
-
-    # Calculate total unique investors for each company
-    def count_unique_investors(fundraising_history):
-        unique_investors = set()
-        for round_info in fundraising_history.values():
-            if isinstance(round_info, dict) and 'by' in round_info:
-                investors = round_info['by'].split(',')
-                unique_investors.update(inv.strip() for inv in investors)
-        return len(unique_investors)
+from .aggregates import (
+    co_investor_pairs,
+    investor_counts,
+    portfolio_overlap,
+    top_investors,
+)
+from .render import download_table, render_figure, rotate_xticks
+from .store import as_store
 
-    total_investors = df['Fundraising History'].apply(count_unique_investors)
 
-    # Create a new DataFrame with company names and investor counts
-    investor_df = pd.DataFrame({
-        'Company': df['Company'],
-        'Total Unique Investors': total_investors
-    })
+def plot_total_investors(companies_data):
+    store = as_store(companies_data)
 
-    # Sort by number of investors in descending order
-    investor_df = investor_df.sort_values('Total Unique Investors', ascending=False)
+    # Companies sorted by number of unique investors in descending order
+    investor_df = investor_counts(store)
 
     # Allow user to select the number of top companies to display
     num_companies = st.slider("Select number of top companies to display", 
@@ -34,44 +24,82 @@ def plot_total_investors(companies_data):
     top_companies = investor_df.head(num_companies)
 
     # Plotting
-    fig, ax = plt.subplots(figsize=(14, 8))
-    bars = ax.bar(top_companies['Company'], top_companies['Total Unique Investors'])
-    plt.title(f"Top {num_companies} Companies by Number of Unique Investors")
-    plt.xlabel("Company")
-    plt.ylabel("Total Unique Investors")
-    plt.xticks(rotation=90)
-
-    # Add value labels on top of each bar
-    for bar in bars:
-        height = bar.get_height()
-        ax.text(bar.get_x() + bar.get_width()/2., height,
-                f'{height}',
-                ha='center', va='bottom')
-
-    plt.tight_layout()
+    def draw(fig):
+        ax = fig.subplots()
+        bars = ax.bar(top_companies['Company'], top_companies['Total Unique Investors'])
+        ax.set_title(f"Top {num_companies} Companies by Number of Unique Investors")
+        ax.set_xlabel("Company")
+        ax.set_ylabel("Total Unique Investors")
+        rotate_xticks(ax, 90)
+
+        # Add value labels on top of each bar
+        for bar in bars:
+            height = bar.get_height()
+            ax.text(bar.get_x() + bar.get_width()/2., height,
+                    f'{height}',
+                    ha='center', va='bottom')
+
+        fig.tight_layout()
 
     # Display the plot in Streamlit
-    st.pyplot(fig)
+    render_figure('total_investors', store.key, (num_companies,), draw, figsize=(14, 8))
 
     # Display the data as a table
     st.write("Investor Count Data:")
     st.dataframe(investor_df)
 
     # Add a download button for the data
-    csv = investor_df.to_csv(index=False).encode('utf-8')
-    st.download_button(
-        label="Download investor count data as CSV",
-        data=csv,
-        file_name="investor_count_data.csv",
-        mime="text/csv",
-    )
+    download_table("investor count data", "investor_count_data", store.key, investor_df)
 
     # Display additional statistics
     st.write("Investor Statistics:")
     st.write(f"Total number of companies: {len(investor_df)}")
-    st.write(f"Company with most investors: {investor_df.iloc[0]['Company']} ({investor_df.iloc[0]['Total Unique Investors']} investors)")
-    st.write(f"Company with least investors: {investor_df.iloc[-1]['Company']} ({investor_df.iloc[-1]['Total Unique Investors']} investors)")
-    st.write(f"Average number of investors per company: {investor_df['Total Unique Investors'].mean():.2f}")
+    most, least = investor_df.iloc[0], investor_df.iloc[-1]
+    st.write(f"Company with most investors: {most['Company']} "
+             f"({most['Total Unique Investors']} investors)")
+    st.write(f"Company with least investors: {least['Company']} "
+             f"({least['Total Unique Investors']} investors)")
+    st.write(f"Average number of investors per company: "
+             f"{investor_df['Total Unique Investors'].mean():.2f}")
+
+def plot_investor_analytics(companies_data):
+    store = as_store(companies_data)
+    investors = top_investors(store)
+    if investors.empty:
+        st.info("No investor data available")
+        return
+
+    # Allow user to select the number of top investors to display
+    num_investors = st.slider("Select number of top investors to display",
+                              min_value=1, max_value=len(investors), value=min(15, len(investors)))
+    top = investors.head(num_investors)
+
+    def draw(fig):
+        ax = fig.subplots()
+        ax.barh(top['Investor'][::-1], top['Deals'][::-1])
+        ax.set_title(f"Top {num_investors} Investors by Number of Deals")
+        ax.set_xlabel("Deals")
+        fig.tight_layout()
+
+    render_figure('top_investors', store.key, (num_investors,), draw,
+                  figsize=(12, max(4, num_investors * 0.4)))
+    st.dataframe(investors, hide_index=True)
+
+    st.write("Most Frequent Co-Investors:")
+    st.dataframe(co_investor_pairs(store).head(50), hide_index=True)
+
+    # Portfolio overlap between two investors
+    col1, col2 = st.columns(2)
+    with col1:
+        first = st.selectbox("First investor", investors['Investor'], index=0)
+    with col2:
+        second = st.selectbox("Second investor", investors['Investor'],
+                              index=min(1, len(investors) - 1))
+    overlap = portfolio_overlap(store, first, second)
+    st.write(f"Companies backed by both {first} and {second}: {len(overlap)}")
+    if not overlap.empty:
+        st.dataframe(overlap, hide_index=True)
 
 # Example usage:
 # plot_total_investors(companies_data)
+# plot_investor_analytics(companies_data)
@@ -0,0 +1,74 @@
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+from .perf import stage
+
+MEMO_SIZE = 64
+
+
+class LRUCache:
+    # Thread-safe bounded mapping shared by every Streamlit session in the
+    # process. With max_bytes the len() of the values is bounded too, and a
+    # value larger than that on its own is not kept at all.
+    def __init__(self, maxsize, max_bytes=None):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _size(self, value):
+        return len(value) if self.max_bytes is not None else 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            if key in self._items:
+                self.nbytes -= self._size(self._items.pop(key))
+            max_bytes = self.max_bytes if self.max_bytes is not None else float('inf')
+            if self._size(value) > max_bytes:
+                return
+            self._items[key] = value
+            self.nbytes += self._size(value)
+            while len(self._items) > self.maxsize or self.nbytes > max_bytes:
+                self.nbytes -= self._size(self._items.popitem(last=False)[1])
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.nbytes = 0
+
+    def __len__(self):
+        return len(self._items)
+
+
+_MISSING = object()
+
+
+def memoize(maxsize=MEMO_SIZE):
+    # Cache a compute function of (store, *params) by the store's dataset
+    # fingerprint and filters plus the params. Results are shared between
+    # callers and must be treated as read-only.
+    def decorator(func):
+        cache = LRUCache(maxsize)
+
+        @wraps(func)
+        def wrapper(store, *params):
+            key = (store.key, params)
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                with stage(f'compute {func.__name__}'):
+                    result = func(store, *params)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
@@ -0,0 +1,242 @@
+from collections.abc import MutableMapping
+
+import pandas as pd
+
+from .investor_index import split_investors
+
+# Aggregates kept as state that can be updated in place and merged: row counts,
+# non-null value counts and sums per group (means are sum / count), plus
+# per-investor deal counts, capital and distinct companies. Updates take the
+# companies and rounds being added (sign=1) or withdrawn (sign=-1), so applying
+# a delta costs time proportional to the delta rather than to the dataset.
+
+# dimension -> company column; the 'round' dimension groups rounds instead
+COMPANY_DIMENSIONS = {'country': 'Country HQ', 'industry': 'Industry', 'founded': 'Founded'}
+
+
+_REMOVED = object()
+
+
+class LayeredDict(MutableMapping):
+    # Copy-on-write dict for state a store shares with the stores derived from
+    # it. child() returns a copy whose writes go to a layer of its own over the
+    # frozen layers below, so it costs time proportional to the writes rather
+    # than to the size. A layer is merged into the one below once it is at least
+    # half as large, which keeps lookups to O(log n) layers and the merging
+    # amortized per write.
+    def __init__(self, data=(), layers=()):
+        self._layers = list(layers)
+        self._top = dict(data)
+
+    def __getitem__(self, key):
+        for layer in (self._top, *reversed(self._layers)):
+            if key in layer:
+                value = layer[key]
+                if value is _REMOVED:
+                    break
+                return value
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        self._top[key] = value
+
+    def __delitem__(self, key):
+        self[key]
+        if self._layers:
+            self._top[key] = _REMOVED
+        else:
+            del self._top[key]
+
+    def __iter__(self):
+        seen = set()
+        for layer in (self._top, *reversed(self._layers)):
+            for key, value in layer.items():
+                if key not in seen:
+                    seen.add(key)
+                    if value is not _REMOVED:
+                        yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def child(self):
+        layers = [*self._layers, self._top] if self._top else list(self._layers)
+        while len(layers) > 1 and 2 * len(layers[-1]) >= len(layers[-2]):
+            top = layers.pop()
+            merged = {**layers.pop(), **top}
+            if not layers:
+                merged = {key: value for key, value in merged.items() if value is not _REMOVED}
+            layers.append(merged)
+        # Both copies read the same frozen layers and write to their own top
+        self._layers, self._top = layers, {}
+        return LayeredDict(layers=layers)
+
+
+def _add(totals, key, values):
+    current = totals.get(key)
+    totals[key] = values if current is None else tuple(a + b for a, b in zip(current, values))
+
+
+def _layered(data):
+    return data if isinstance(data, LayeredDict) else LayeredDict(data or ())
+
+
+class GroupTotals:
+    # key -> (rows, non-null values, sum), matching FundingIndex.group_totals
+    def __init__(self, name, totals=None):
+        self.name = name
+        self.totals = totals or {}
+
+    def update(self, keys, values, sign=1):
+        frame = pd.DataFrame({'key': keys.reset_index(drop=True),
+                              'value': pd.Series(values, dtype='float64').reset_index(drop=True)})
+        grouped = frame.groupby('key', sort=False, observed=True)['value']
+        grouped = grouped.agg(['size', 'count', 'sum'])
+        for key, rows, count, total in grouped.itertuples():
+            _add(self.totals, key, (sign * int(rows), sign * int(count), sign * float(total)))
+            self._settle(key)
+
+    def _settle(self, key):
+        rows, count, total = self.totals[key]
+        if rows <= 0:
+            del self.totals[key]
+        elif count <= 0:
+            # Withdrawn sums cancel up to rounding; keep empty groups exact
+            self.totals[key] = (rows, count, 0.0)
+
+    def merge(self, other):
+        for key, values in other.totals.items():
+            _add(self.totals, key, values)
+            self._settle(key)
+
+    def copy(self):
+        return GroupTotals(self.name, dict(self.totals))
+
+    def frame(self):
+        totals = pd.DataFrame.from_dict(self.totals, orient='index',
+                                        columns=['rows', 'count', 'sum'])
+        return totals.sort_index().rename_axis(self.name)
+
+
+class DimensionTotals:
+    # GroupTotals for the country, industry and founded-year dimensions of
+    # companies and the round dimension of rounds
+    def __init__(self, groups=None):
+        self.groups = groups or {
+            **{dimension: GroupTotals(column) for dimension, column in COMPANY_DIMENSIONS.items()},
+            'round': GroupTotals('round'),
+        }
+
+    @classmethod
+    def from_store(cls, store):
+        totals = cls()
+        totals.update(store.companies, store.rounds)
+        return totals
+
+    def update(self, companies, rounds, sign=1):
+        # Founded years sum the company's round amounts, so a company must be
+        # withdrawn and re-added together with all of its rounds
+        round_totals = rounds.groupby('company_id')['amount_usd'].sum()
+        round_totals = round_totals.reindex(companies.index, fill_value=0)
+        values = {'country': companies['Total Funding'], 'industry': companies['Total Funding'],
+                  'founded': round_totals}
+        for dimension, column in COMPANY_DIMENSIONS.items():
+            self.groups[dimension].update(companies[column], values[dimension], sign)
+        self.groups['round'].update(rounds['round'], rounds['amount_usd'], sign)
+
+    def merge(self, other):
+        for dimension, group in other.groups.items():
+            self.groups[dimension].merge(group)
+
+    def copy(self):
+        return DimensionTotals(
+            {dimension: group.copy() for dimension, group in self.groups.items()})
+
+    def totals(self, dimension):
+        return self.groups[dimension].frame()
+
+
+class InvestorTotals:
+    # The pairs grow with the dataset, so copies share them copy-on-write;
+    # the GroupTotals above hold one entry per group and are copied outright
+    def __init__(self, deals=None, pairs=None, companies=None):
+        self.deals = _layered(deals)          # investor -> (rounds, capital)
+        self.pairs = _layered(pairs)          # (investor, company id) -> rounds
+        self.companies = _layered(companies)  # investor -> distinct companies
+
+    @staticmethod
+    def _entries(rounds, round_investors=None, investors=None):
+        # One entry per (round, investor) with the round's company and amount,
+        # reusing the interned investors when the store has them
+        if round_investors is None:
+            names = split_investors(rounds)
+            entries = pd.DataFrame({'round': names.index, 'investor': names.to_numpy()})
+            entries = entries.drop_duplicates()
+        else:
+            investor_ids = round_investors['investor_id'].to_numpy()
+            entries = pd.DataFrame({
+                'round': round_investors['round_id'].to_numpy(),
+                'investor': investors['investor'].to_numpy()[investor_ids],
+            })
+        entries['company'] = rounds['company_id'].reindex(entries['round']).to_numpy()
+        entries['amount'] = rounds['amount_usd'].reindex(entries['round']).fillna(0).to_numpy()
+        deals = entries.groupby('investor', sort=False).agg(
+            rounds=('round', 'size'), capital=('amount', 'sum'))
+        return deals, entries.groupby(['investor', 'company'], sort=False).size()
+
+    @classmethod
+    def from_store(cls, store):
+        # Built in bulk rather than through update() one pair at a time
+        deals, pairs = cls._entries(store.rounds, store.round_investors, store.investors)
+        companies = pairs.groupby(level='investor', sort=False).size()
+        pair_keys = zip(pairs.index.get_level_values(0).tolist(),
+                        pairs.index.get_level_values(1).tolist())
+        return cls(
+            dict(zip(deals.index, zip(deals['rounds'].tolist(), deals['capital'].tolist()))),
+            dict(zip(pair_keys, pairs.tolist())),
+            dict(zip(companies.index, companies.tolist())),
+        )
+
+    def update(self, rounds, sign=1):
+        deals, pairs = self._entries(rounds)
+        for investor, count, capital in deals.itertuples():
+            _add(self.deals, investor, (sign * int(count), sign * float(capital)))
+            if self.deals[investor][0] <= 0:
+                del self.deals[investor]
+
+        for (investor, company), count in pairs.items():
+            self._add_pair(investor, company, sign * int(count))
+
+    def _add_pair(self, investor, company, count):
+        before = self.pairs.get((investor, company), 0)
+        after = before + count
+        if after > 0:
+            self.pairs[(investor, company)] = after
+        else:
+            self.pairs.pop((investor, company), None)
+        change = (after > 0) - (before > 0)
+        if change:
+            self.companies[investor] = self.companies.get(investor, 0) + change
+            if self.companies[investor] <= 0:
+                del self.companies[investor]
+
+    def merge(self, other):
+        for investor, values in other.deals.items():
+            _add(self.deals, investor, values)
+        for (investor, company), count in other.pairs.items():
+            self._add_pair(investor, company, count)
+
+    def copy(self):
+        return InvestorTotals(self.deals.child(), self.pairs.child(), self.companies.child())
+
+    def frame(self):
+        # Same table as InvestorIndex.top_investors
+        deals, companies = dict(self.deals.items()), dict(self.companies.items())
+        table = pd.DataFrame({
+            'Investor': list(deals),
+            'Deals': [count for count, _ in deals.values()],
+            'Companies': [companies.get(investor, 0) for investor in deals],
+            'Round Capital (USD)': [capital for _, capital in deals.values()],
+        })
+        return table.sort_values(['Deals', 'Round Capital (USD)'], ascending=False,
+                                 ignore_index=True)
@@ -0,0 +1,55 @@
+import hashlib
+import json
+
+import pandas as pd
+
+# Example conversion rates to USD; pass a live table as `rates` for real reporting.
+# Currencies missing from the table convert to null rather than being summed as USD.
+DEFAULT_RATES = {
+    'USD': 1.0,
+    'EUR': 1.1,
+    'GBP': 1.27,
+    'CHF': 1.13,
+    'CAD': 0.73,
+    'AUD': 0.66,
+    'SGD': 0.75,
+    'JPY': 0.0067,
+}
+
+DEFAULT_CURRENCY = 'USD'
+
+_SYMBOLS = {'$': 'USD', '€': 'EUR', '£': 'GBP'}
+_MONEY_PATTERN = (
+    r'^\s*(?P<symbol>[$€£])?\s*(?P<amount>\d[\d,]*(?:\.\d+)?)\s*(?P<currency>[A-Za-z]{3})?\s*$'
+)
+
+
+def parse_money(values, default_currency=DEFAULT_CURRENCY):
+    # Split a whole column of "7000000 USD" style strings into amount and currency
+    # in one pass. Plain numbers take the default currency; "N/A", blanks and
+    # anything unparseable become nulls.
+    values = pd.Series(values, dtype=object)
+    is_string = values.map(type) == str
+
+    # Numbers are taken as they are; only the string cells go through the pattern,
+    # as a column of numbers has no .str accessor
+    amount = pd.to_numeric(values.mask(is_string), errors='coerce').astype('float64')
+    currency = pd.Series(None, index=values.index, dtype=object)
+    parts = values[is_string].str.extract(_MONEY_PATTERN)
+    amount[is_string] = pd.to_numeric(parts['amount'].str.replace(',', '', regex=False),
+                                      errors='coerce')
+    named = parts['currency'].str.upper()
+    currency[is_string] = named.where(named.notna(), parts['symbol'].map(_SYMBOLS))
+
+    currency = currency.where(amount.isna() | currency.notna(), default_currency)
+    return amount, currency.where(amount.notna())
+
+
+def to_usd(amount, currency, rates=None):
+    rates = DEFAULT_RATES if rates is None else rates
+    return amount * currency.map(rates).astype('float64')
+
+
+def rates_fingerprint(rates=None):
+    rates = DEFAULT_RATES if rates is None else rates
+    return hashlib.sha256(json.dumps(rates, sort_keys=True).encode('utf-8')).hexdigest()[:12]
@@ -0,0 +1,113 @@
+import contextvars
+import logging
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Opt-in timing of the dashboard's hot paths. A rerun opens a trace with
+# `tracing()`, and code on the hot path marks stages with `stage(name)`, which
+# costs nothing while no trace is active. Each stage records its wall time and,
+# through tracemalloc, the change in allocated memory and its allocation peak.
+
+ENABLED = os.environ.get('MARKET_COVERAGE_PERF', '').lower() in ('1', 'true', 'yes')
+SLOW_STAGE_SECONDS = float(os.environ.get('MARKET_COVERAGE_SLOW_SECONDS', 2.0))
+
+_MB = 1024 * 1024
+
+_active = contextvars.ContextVar('perf_trace', default=None)
+
+# tracemalloc is process wide and its peak can only be reset for every thread
+# at once, so one trace at a time measures memory: a trace opened while another
+# holds this lock records timings only, instead of waiting or resetting the
+# other's peaks. Allocations of sessions that are not tracing still count
+# towards the measuring trace, so its figures are exact only while it runs alone.
+_memory_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self, label='', memory=True, slow_seconds=SLOW_STAGE_SECONDS):
+        self.label = label
+        self.memory = memory
+        self.slow_seconds = slow_seconds
+        self.started = time.time()
+        self.seconds = None
+        self.stages = []
+        # Allocation peaks of the open stages, so a nested stage resetting the
+        # tracemalloc peak does not hide it from the stages around it
+        self._peaks = []
+
+    def _memory(self):
+        if not self.memory:
+            return 0, 0
+        return tracemalloc.get_traced_memory()
+
+    @contextmanager
+    def stage(self, name):
+        record = {'name': name, 'depth': len(self._peaks), 'start': time.time() - self.started}
+        self.stages.append(record)
+        current, peak = self._memory()
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        if self.memory:
+            tracemalloc.reset_peak()
+        self._peaks.append(current)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - started
+            after, peak = self._memory()
+            peak = max(self._peaks.pop(), peak)
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], peak)
+            if self.memory:
+                record['memory_delta_mb'] = (after - current) / _MB
+                record['peak_mb'] = (peak - current) / _MB
+            else:
+                record['memory_delta_mb'] = record['peak_mb'] = None
+            if record['seconds'] > self.slow_seconds:
+                logger.warning("Slow stage %s: %.2fs (threshold %.2fs)", name, record['seconds'],
+                               self.slow_seconds)
+
+    def to_dict(self):
+        return {'label': self.label, 'started': self.started, 'seconds': self.seconds,
+                'stages': self.stages}
+
+
+@contextmanager
+def tracing(label='', memory=True, slow_seconds=SLOW_STAGE_SECONDS):
+    memory = memory and _memory_lock.acquire(blocking=False)
+    trace = Trace(label, memory, slow_seconds)
+    token = _active.set(trace)
+    # Left running if something else, such as python -X tracemalloc, started it
+    owned = memory and not tracemalloc.is_tracing()
+    if owned:
+        tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.seconds = time.perf_counter() - started
+        if owned:
+            tracemalloc.stop()
+        if memory:
+            _memory_lock.release()
+        _active.reset(token)
+
+
+@contextmanager
+def stage(name):
+    trace = _active.get()
+    if trace is None:
+        yield None
+        return
+    with trace.stage(name) as record:
+        yield record
+
+
+def active_trace():
+    return _active.get()
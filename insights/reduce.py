@@ -0,0 +1,45 @@
+import pandas as pd
+
+# Chart data reduction, applied after the aggregates and before anything is
+# drawn or sent to the browser: long category tails collapse into one "Other"
+# bar and dense scatters are sampled, so chart payloads stay bounded however
+# large the dataset grows. The tables next to the charts keep every row.
+
+MAX_CATEGORIES = 30
+# Lines drawn on one time-series chart
+MAX_SERIES = 10
+MAX_POINTS = 5000
+# Interactive scatters switch from SVG to WebGL traces above this many points
+WEBGL_POINTS = 1000
+# Static scatters are drawn as a density grid above this many points
+DENSITY_POINTS = 20000
+
+
+def top_k(frame, label, value, k=MAX_CATEGORIES, other='Other'):
+    # The k rows with the largest value plus one row summing the rest
+    if len(frame) <= k + 1:
+        return frame[[label, value]]
+    head = frame.nlargest(k, value)
+    tail = frame[value].sum() - head[value].sum()
+    rest = pd.DataFrame({label: [f'{other} ({len(frame) - k})'], value: [tail]})
+    return pd.concat([head[[label, value]], rest], ignore_index=True)
+
+
+def top_columns(frame, k=MAX_SERIES, other='Other'):
+    # The k columns with the largest totals plus one column summing the rest
+    if len(frame.columns) <= k + 1:
+        return frame
+    head = frame.sum().nlargest(k).index
+    rest = frame.drop(columns=head).sum(axis=1).rename(f'{other} ({len(frame.columns) - k})')
+    return pd.concat([frame[head], rest], axis=1)
+
+
+def sample_points(frame, max_points=MAX_POINTS, seed=0):
+    # A fixed-seed sample, so reruns draw the same points
+    if len(frame) <= max_points:
+        return frame
+    return frame.sample(max_points, random_state=seed).sort_index()
+
+
+def render_mode(points):
+    return 'webgl' if points > WEBGL_POINTS else 'svg'
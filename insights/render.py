@@ -0,0 +1,68 @@
+import io
+
+import streamlit as st
+
+from .export import FORMATS, cached_export, prepare_export
+from .memo import LRUCache
+from .perf import stage
+
+FIGURE_CACHE_SIZE = 128
+FIGURE_DPI = 200
+
+# Finished PNGs keyed by (chart id, data key, parameters), shared across sessions
+_images = LRUCache(FIGURE_CACHE_SIZE)
+
+
+def rasterize(draw, figsize):
+    # Figures are created without pyplot, so they never enter its global registry,
+    # are safe to draw from concurrent sessions and are released as soon as the
+    # PNG has been written. Matplotlib is imported on the first chart drawn.
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=figsize)
+    try:
+        draw(fig)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format='png', dpi=FIGURE_DPI, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        fig.clear()
+
+
+def render_figure(chart_id, data_key, params, draw, figsize):
+    key = (chart_id, data_key, params)
+    image = _images.get(key)
+    if image is None:
+        with stage(f'rasterize {chart_id}'):
+            image = rasterize(draw, figsize)
+        _images.put(key, image)
+    with stage(f'serialize {chart_id}'):
+        st.image(image, use_column_width=True)
+
+
+def rotate_xticks(ax, rotation, ha='center'):
+    for label in ax.get_xticklabels():
+        label.set_rotation(rotation)
+        label.set_horizontalalignment(ha)
+
+
+def download_table(label, name, data_key, frame, index=False):
+    # Nothing is serialized until "Prepare" is clicked; the prepared bytes are
+    # cached for the dataset, so the download button stays on later reruns.
+    # `frame` may be a function, so tables that are costly to assemble are too
+    fmt = st.radio(f"Export format for {label}", list(FORMATS), horizontal=True,
+                   key=f'{name}_format', label_visibility='collapsed')
+    data = cached_export(name, data_key, fmt)
+    if data is None:
+        if not st.button(f"Prepare {label} for download", key=f'{name}_prepare'):
+            return
+        with st.spinner(f"Preparing {label}..."):
+            data = prepare_export(name, data_key, frame() if callable(frame) else frame, fmt, index)
+    extension, mime = FORMATS[fmt]
+    st.download_button(
+        label=f"Download {label} as {fmt}",
+        data=data,
+        file_name=f"{name}.{extension}",
+        mime=mime,
+        key=f'{name}_download',
+    )
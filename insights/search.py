@@ -0,0 +1,74 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+# Inverted index over the searchable text of every company, built once per
+# dataset. Each word of each field becomes a posting (word, company, weight);
+# postings are sorted by word, and words alphabetically, so all the words that
+# start with a query term are one contiguous slice. A query is then a few
+# slices and a bincount per term, never a scan of the text columns.
+
+TOKEN = re.compile(r'\w+')
+
+# field -> weight of one occurrence; name and classification matches rank above mentions
+FIELDS = {'Company': 3.0, 'Industry': 2.0, 'Attributes': 2.0, 'Overview': 1.0, 'Founder Bio': 1.0}
+# Term frequency saturation, as in BM25 without length normalization
+K1 = 1.2
+
+
+def tokenize(text):
+    return TOKEN.findall(str(text).casefold()) if isinstance(text, str) else []
+
+
+class SearchIndex:
+    def __init__(self, store):
+        self.company_ids = store.companies.index
+        n = len(self.company_ids)
+        positions, words, weights = [], [], []
+        for field, weight in FIELDS.items():
+            if field in store.companies:
+                values = store.companies[field]
+            else:
+                values = store.text(field).set_axis(store.companies.index)
+            values = values.dropna().astype(str).str.casefold().str.findall(TOKEN)
+            values = values.explode().dropna()
+            positions.append(self.company_ids.get_indexer(values.index))
+            words.append(values.to_numpy(dtype=object))
+            weights.append(np.full(len(values), weight))
+        positions, words = np.concatenate(positions), np.concatenate(words)
+        weights = np.concatenate(weights)
+
+        # Weighted occurrences per (word, company), ordered by word then company
+        word_ids, vocabulary = pd.factorize(words, sort=True)
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        pairs, inverse = np.unique(word_ids.astype('int64') * max(n, 1) + positions,
+                                   return_inverse=True)
+        frequency = np.bincount(inverse, weights=weights)
+        word_ids = pairs // max(n, 1)
+
+        documents = np.bincount(word_ids, minlength=len(self.vocabulary))
+        idf = np.log1p(n / np.maximum(documents, 1))
+        self.companies = (pairs % max(n, 1)).astype('int32')
+        self.weights = (idf[word_ids] * frequency * (K1 + 1) / (frequency + K1)).astype('float32')
+        self.indptr = np.searchsorted(word_ids, np.arange(len(self.vocabulary) + 1))
+
+    def _postings(self, term):
+        # Postings of every word starting with `term`
+        upper = term[:-1] + chr(ord(term[-1]) + 1)
+        first, last = np.searchsorted(self.vocabulary, [term, upper])
+        start, end = self.indptr[first], self.indptr[last]
+        return self.companies[start:end], self.weights[start:end]
+
+    def scores(self, terms):
+        # Relevance of every company, NaN where some term does not match
+        n = len(self.company_ids)
+        total = np.zeros(n)
+        matched = np.ones(n, dtype=bool)
+        for term in terms:
+            companies, weights = self._postings(term)
+            term_scores = np.bincount(companies, weights=weights, minlength=n)
+            matched &= np.bincount(companies, minlength=n) > 0
+            total += term_scores
+        total[~matched] = np.nan
+        return pd.Series(total, index=self.company_ids, name='Score')
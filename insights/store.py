@@ -0,0 +1,634 @@
+import json
+import uuid
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+
+from .cube import CoverageCube
+from .founder_index import FOUNDER_COLUMNS, FounderIndex, normalize_names
+from .funding_index import FundingIndex
+from .investor_index import InvestorIndex, intern_investors
+from .mergeable import DimensionTotals, InvestorTotals, LayeredDict
+from .money import parse_money, to_usd
+from .search import SearchIndex, tokenize
+from .texts import TEXT_COLUMNS, TextStore
+from .timeseries import RoundTimeSeries
+from .tracxn import is_tracxn, tracxn_companies, tracxn_rounds
+from .validate import (
+    Issues,
+    coerce_text,
+    flag_uncoerced,
+    merge_issues,
+    parse_dates,
+    present,
+    quarantine_frame,
+    screen,
+)
+
+# Bump whenever the table layout changes so on-disk caches are rebuilt
+STORE_VERSION = 6
+
+# Company money columns hold USD values; the source currency is kept alongside
+MONEY_COLUMNS = ['Last Round Size', 'Last Valuation', 'Total Funding']
+ROUND_COLUMNS = ['company_id', 'round', 'year', 'date', 'amount', 'currency', 'amount_usd',
+                 'investors']
+
+# Low-cardinality text columns are dictionary-encoded
+CATEGORY_COLUMNS = [
+    'Country HQ', 'Industry', 'Stage', 'Attributes', 'Website Cleaned Up',
+    'Seen / Not Seen (Master List)', 'Relevant', 'Founder Designation',
+    *(f'{column} Currency' for column in MONEY_COLUMNS),
+]
+ROUND_CATEGORY_COLUMNS = ['round', 'currency']
+# Fields of a curated (app.json) company; records may leave any of them out
+CURATED_COLUMNS = [
+    'Company', 'Founded', 'Country HQ', 'Overview', 'Industry', 'Last Round Date',
+    'Last Round Size', 'Last Valuation', 'Total Funding', 'Investors', 'Website',
+    'Website Cleaned Up', 'Seen / Not Seen (Master List)', 'Relevant', 'Attributes', 'Founder',
+]
+# Columns that must hold a single piece of text
+TEXT_FIELDS = ['Company', 'Website', 'Investors', *TEXT_COLUMNS, *CATEGORY_COLUMNS]
+
+
+def _fundraising_history(company):
+    # The round history as a dict, or None when it is present but unreadable
+    history = company.get('Fundraising History')
+    if history is None:
+        return {}
+    if isinstance(history, str):
+        try:
+            history = json.loads(history)
+        except json.JSONDecodeError:
+            return None
+    return history if isinstance(history, dict) else None
+
+
+def _curated_companies(records, offset):
+    # from_records cannot build an empty frame on a given index
+    index = pd.RangeIndex(offset, offset + len(records))
+    if not records:
+        companies = pd.DataFrame(index=index)
+    else:
+        companies = pd.DataFrame.from_records(records, index=index)
+    companies = companies.drop(columns=['Fundraising History'], errors='ignore')
+    missing = [column for column in CURATED_COLUMNS if column not in companies]
+    return companies.assign(**dict.fromkeys(missing)) if missing else companies
+
+
+def _curated_rounds(records, offset, issues, labels):
+    # Explode every company's nested 'Fundraising History' into one row per round.
+    # Rounds only carry a year; the company's 'Last Round Date' dates its last
+    # round when the years agree.
+    rows, unreadable, malformed = [], [], []
+    for company_id, company in enumerate(records, start=offset):
+        history = _fundraising_history(company)
+        if history is None:
+            unreadable.append(company_id)
+            continue
+        entries = len(history) - ('founded' in history)
+        history = [(name, info) for name, info in history.items()
+                   if name != 'founded' and isinstance(info, dict)]
+        if len(history) < entries:
+            malformed.append(company_id)
+        last_date = company.get('Last Round Date')
+        for i, (round_name, round_info) in enumerate(history):
+            year = round_info.get('year')
+            dated = (i == len(history) - 1 and isinstance(last_date, str)
+                     and last_date[:4] == str(year))
+            rows.append((company_id, round_name, year, last_date if dated else None,
+                         round_info.get('amount'), round_info.get('by')))
+
+    histories = pd.Series([company.get('Fundraising History') for company in records],
+                          index=labels.index, dtype=object)
+    issues.add('Fundraising History', 'unreadable, no rounds kept', labels.index.isin(unreadable),
+               labels, histories)
+    issues.add('Fundraising History', 'round is not a record, skipped',
+               labels.index.isin(malformed), labels, histories)
+    return pd.DataFrame(rows,
+                        columns=['company_id', 'round', 'year', 'date', 'amount', 'investors'])
+
+
+def _flatten_founders(companies, issues, labels):
+    if 'Founder' in companies:
+        founders = companies.pop('Founder')
+    else:
+        founders = pd.Series(None, index=companies.index)
+    # A bare name stands for the whole record; anything else that is not a record is dropped
+    kinds = founders.map(type)
+    named = (kinds == str).to_numpy()
+    issues.add('Founder', 'text instead of a record, used as the name', named, labels, founders)
+    issues.add('Founder', 'not a founder record, ignored',
+               ~kinds.isin([dict, str, float, type(None)]), labels, founders)
+    if named.any():
+        founders = founders.copy()
+        founders[named] = [{'name': name} for name in founders[named]]
+    for key, column in FOUNDER_COLUMNS.items():
+        companies[column] = pd.Series(
+            [founder.get(key) if isinstance(founder, dict) else None for founder in founders],
+            index=companies.index, dtype=object)
+
+
+def _categorize(frame, columns):
+    # Column categories are sorted where the values allow it, so grouped
+    # results keep the order they had as plain strings
+    for column in columns:
+        if column in frame and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = pd.Categorical(frame[column].astype(object))
+    return frame
+
+
+def _concat(frames, columns, **kwargs):
+    # pd.concat only keeps a categorical column when every frame has the same
+    # categories, so they are aligned first
+    frames = [frame.copy(deep=False) for frame in frames]
+    for column in columns:
+        parts = [frame[column] for frame in frames if column in frame]
+        if parts and all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            categories = pd.Categorical(np.concatenate(
+                [part.cat.categories.to_numpy(dtype=object) for part in parts]))
+            for frame in frames:
+                if column in frame:
+                    frame[column] = frame[column].cat.set_categories(categories.categories)
+    return _categorize(pd.concat(frames, **kwargs), columns)
+
+
+def _money(frame, column, currency_column):
+    # Amounts arrive either as "7000000 USD" strings or, from adapters, already
+    # split into a numeric column and a currency column
+    if currency_column not in frame:
+        return parse_money(frame[column])
+    amount = pd.to_numeric(frame[column], errors='coerce').astype('float64')
+    return amount, frame[currency_column].where(amount.notna())
+
+
+def _labels(records, offset, numbers=None):
+    # "record 12 (Acme)" for each company, numbered by position in the export
+    numbers = range(offset, offset + len(records)) if numbers is None else numbers
+    return pd.Series([f"record {number} ({record.get('Company') or record.get('name')})"
+                      for number, record in zip(numbers, records)],
+                     index=pd.RangeIndex(offset, offset + len(records)), dtype=object)
+
+
+def _companies_frame(records, offset=0, rates=None, issues=None, labels=None):
+    # Typed company columns; values that do not coerce become null and are
+    # tallied in `issues`
+    issues = Issues() if issues is None else issues
+    labels = _labels(records, offset) if labels is None else labels
+    if records and is_tracxn(records[0]):
+        companies = tracxn_companies(records, offset, issues, labels)
+    else:
+        companies = _curated_companies(records, offset)
+    coerce_text(issues, companies, TEXT_FIELDS, labels)
+    if 'Company' in companies:
+        issues.add('Company', 'missing name', ~present(companies['Company']), labels,
+                   companies['Company'])
+
+    for column in MONEY_COLUMNS:
+        if column in companies:
+            raw = companies[column]
+            amount, currency = _money(companies, column, f'{column} Currency')
+            flag_uncoerced(issues, column, 'not an amount, set to null', raw, amount, labels)
+            companies[column] = to_usd(amount, currency, rates)
+            issues.add(column, 'no USD rate for the currency, left out',
+                       amount.notna() & companies[column].isna(), labels, raw)
+            companies[f'{column} Currency'] = currency
+    if 'Founded' in companies:
+        raw = companies['Founded']
+        companies['Founded'] = pd.to_numeric(raw, errors='coerce').astype('Int64')
+        flag_uncoerced(issues, 'Founded', 'not a year, set to null', raw, companies['Founded'],
+                       labels)
+    if 'Last Round Date' in companies:
+        raw = companies['Last Round Date']
+        companies['Last Round Date'] = parse_dates(raw)
+        flag_uncoerced(issues, 'Last Round Date', 'not a date, set to null', raw,
+                       companies['Last Round Date'], labels)
+    _flatten_founders(companies, issues, labels)
+
+    companies.index.name = 'company_id'
+    return _categorize(companies, CATEGORY_COLUMNS)
+
+
+def _split_texts(companies):
+    return companies.drop(columns=TEXT_COLUMNS, errors='ignore'), TextStore.from_frame(companies)
+
+
+def _rounds_frame(records, offset=0, rates=None, issues=None, labels=None):
+    issues = Issues() if issues is None else issues
+    labels = _labels(records, offset) if labels is None else labels
+    if records and is_tracxn(records[0]):
+        rounds = tracxn_rounds(records, offset, issues, labels)
+    else:
+        rounds = _curated_rounds(records, offset, issues, labels)
+    # A batch without rounds would otherwise turn the ids of every batch into objects
+    rounds['company_id'] = rounds['company_id'].astype('int64')
+    companies = labels.reindex(rounds['company_id']).to_numpy()
+    round_labels = pd.Series(companies + ' ' + rounds['round'].astype(str), index=rounds.index,
+                             dtype=object)
+    coerce_text(issues, rounds, ['round', 'investors', 'currency'], round_labels)
+
+    raw = rounds['amount']
+    rounds['amount'], rounds['currency'] = _money(rounds, 'amount', 'currency')
+    flag_uncoerced(issues, 'round amount', 'not an amount, set to null', raw, rounds['amount'],
+                   round_labels)
+    rounds['amount_usd'] = to_usd(rounds['amount'], rounds['currency'], rates)
+    raw = rounds['year']
+    rounds['year'] = pd.to_numeric(raw, errors='coerce').astype('Int64')
+    flag_uncoerced(issues, 'round year', 'not a year, set to null', raw, rounds['year'],
+                   round_labels)
+    rounds['date'] = parse_dates(rounds['date'])
+    return _categorize(rounds, ROUND_CATEGORY_COLUMNS)[ROUND_COLUMNS]
+
+
+@dataclass(eq=False)
+class CompanyStore:
+    companies: pd.DataFrame
+    rounds: pd.DataFrame
+    # Investors of each round interned to integer ids, and the id -> name table
+    round_investors: pd.DataFrame = None
+    investors: pd.DataFrame = None
+    # Long text by company id, shared by every view of the full store
+    texts: TextStore = None
+    # Per-field tally of the values set to null at ingest, and the records left out
+    issues: pd.DataFrame = None
+    quarantine: pd.DataFrame = None
+    # Set on minimum-funding views: the full store they were cut from and the threshold
+    source: 'CompanyStore' = None
+    min_funding: float = 0
+    # Set on views narrowed further by where(), whose rows no threshold describes
+    subset: bool = False
+    # Content hash of the loaded export (random for ad-hoc stores) and the filters
+    # applied to it; together they identify the rows for memoized computations
+    fingerprint: str = field(default_factory=lambda: uuid.uuid4().hex)
+    filters: tuple = ()
+
+    @property
+    def key(self):
+        return (self.fingerprint, self.filters)
+
+    @property
+    def root(self):
+        return self.source or self
+
+    @property
+    def complete(self):
+        # Whether this store holds every company of the full store
+        return not self.subset and self.min_funding <= 0
+
+    @cached_property
+    def funding_index(self):
+        return FundingIndex(self)
+
+    @cached_property
+    def founder_index(self):
+        return FounderIndex(self.companies)
+
+    @cached_property
+    def investor_index(self):
+        if self.round_investors is None:
+            self.round_investors, self.investors = intern_investors(self.rounds)
+        return InvestorIndex(self.rounds, self.round_investors, self.investors)
+
+    @cached_property
+    def coverage_cube(self):
+        return CoverageCube(self.companies, self.rounds)
+
+    @cached_property
+    def search_index(self):
+        return SearchIndex(self)
+
+    @cached_property
+    def round_time_series(self):
+        return RoundTimeSeries(self.companies, self.rounds)
+
+    @cached_property
+    def dimension_totals(self):
+        return DimensionTotals.from_store(self)
+
+    @cached_property
+    def investor_totals(self):
+        return InvestorTotals.from_store(self)
+
+    @cached_property
+    def company_lookup(self):
+        # Website domain -> company id and normalized name -> company id
+        return _lookup(_company_domains(self.companies)), _lookup(_company_names(self.companies))
+
+    def contains(self, company_ids):
+        # Membership test for ids of the full store; threshold views answer it
+        # without hashing their rows
+        if self.source is None or self.subset:
+            return self.companies.index.get_indexer(company_ids) >= 0
+        funding = self.source.companies['Total Funding'].reindex(company_ids).fillna(0)
+        return (funding >= self.min_funding).to_numpy()
+
+    def select(self, mask):
+        companies = self.companies[mask]
+        rounds = self.rounds[self.rounds['company_id'].isin(companies.index)]
+        return CompanyStore(companies, rounds, texts=self.root.texts)
+
+    def where(self, mask, **filters):
+        # View of the companies matching a boolean mask, identified for
+        # memoization by the keyword filters it was built from
+        companies = self.companies[mask]
+        return CompanyStore(
+            companies,
+            self.rounds[self.rounds['company_id'].isin(companies.index).to_numpy()],
+            source=self.root,
+            min_funding=self.min_funding,
+            subset=True,
+            fingerprint=self.root.fingerprint,
+            filters=self.filters + tuple(sorted(filters.items())),
+        )
+
+    def matching(self, countries=None, industries=None):
+        # Companies headquartered in any of `countries` and in any of `industries`
+        store = self
+        if countries:
+            countries = tuple(sorted(countries))
+            store = store.where(store.companies['Country HQ'].isin(countries).to_numpy(),
+                                countries=countries)
+        if industries:
+            industries = tuple(sorted(industries))
+            store = store.where(store.companies['Industry'].isin(industries).to_numpy(),
+                                industries=industries)
+        return store
+
+    def search(self, query):
+        # Companies matching every word of a full-text query, each word also
+        # matching longer words it starts; the normalized query joins the filters
+        terms = tokenize(query)
+        if not terms:
+            return self
+        matched = self.root.search_index.scores(terms).notna()
+        return self.where(matched.reindex(self.companies.index).to_numpy(), query=' '.join(terms))
+
+    def above(self, min_funding):
+        # Companies without a known total are treated as unfunded
+        if self.subset:
+            funding = self.companies['Total Funding'].fillna(0)
+            return self.where((funding >= min_funding).to_numpy(), min_funding=min_funding)
+        root = self.root
+        min_funding = max(min_funding, self.min_funding)
+        if min_funding <= 0:
+            companies, rounds = root.companies, root.rounds
+        else:
+            index = root.funding_index
+            companies = root.companies.iloc[index.companies_at_least(min_funding)]
+            rounds = root.rounds.iloc[index.rounds_at_least(min_funding)]
+        return CompanyStore(
+            companies,
+            rounds,
+            source=root,
+            min_funding=min_funding,
+            fingerprint=root.fingerprint,
+            filters=(('min_funding', min_funding),),
+        )
+
+    def group_totals(self, dimension):
+        # Row count, non-null value count and value sum per group of DIMENSIONS,
+        # answered without scanning rows: from the mergeable totals, which deltas
+        # keep current, or above a threshold from the full store's funding index.
+        # Subsets total their own rows once.
+        if self.subset:
+            return self.dimension_totals.totals(dimension)
+        if self.min_funding <= 0:
+            return self.root.dimension_totals.totals(dimension)
+        return self.root.funding_index.group_totals(dimension, self.min_funding)
+
+    def apply_delta(self, delta):
+        # Upsert the companies of a parsed delta export into the full store. A delta
+        # company matches a stored one by website domain, else by name; its non-empty
+        # fields replace the stored values and its rounds replace stored rounds of the
+        # same name. Unmatched companies are appended, and delta rows that resolve to
+        # the same company are collapsed, later fields winning. Total Funding is a
+        # source field: a delta that sends it sets it, otherwise it moves by the
+        # change in the company's round amounts. The lookups and mergeable totals
+        # are carried over copy-on-write, withdrawing and re-adding only the
+        # companies touched, so the Python work is proportional to the delta.
+        root = self.root
+        delta = merge_stores([delta])
+        domains, names = (lookup.child() for lookup in root.company_lookup)
+        totals, investor_totals = root.dimension_totals.copy(), root.investor_totals.copy()
+
+        ids = np.empty(len(delta.companies), dtype='int64')
+        next_id = len(root.companies)
+        delta_keys = zip(
+            _company_domains(delta.companies).astype(object).where(lambda k: k.notna(), None),
+            _company_names(delta.companies).astype(object).where(lambda k: k.notna(), None))
+        for i, (domain, name) in enumerate(delta_keys):
+            company_id = domains.get(domain) if domain is not None else None
+            if company_id is None and name is not None:
+                company_id = names.get(name)
+            if company_id is None:
+                company_id, next_id = next_id, next_id + 1
+            ids[i] = company_id
+            if domain is not None:
+                domains[domain] = company_id
+            if name is not None:
+                names[name] = company_id
+
+        incoming = delta.companies.set_axis(pd.Index(ids, name='company_id'))
+        if not incoming.index.is_unique:
+            incoming = _categorize(incoming.groupby(level=0, sort=False).last(), CATEGORY_COLUMNS)
+        existing = incoming.index[incoming.index < len(root.companies)].to_numpy()
+        previous = root.companies.loc[existing]
+        # combine_first drops categorical values when the other frame is empty
+        updated = incoming.combine_first(previous) if len(previous) else incoming
+        updated = _categorize(updated, CATEGORY_COLUMNS)[
+            root.companies.columns.union(incoming.columns, sort=False)]
+
+        touched = root.rounds['company_id'].isin(existing).to_numpy()
+        previous_rounds = root.rounds[touched]
+        incoming_rounds = delta.rounds.assign(company_id=ids[delta.rounds['company_id'].to_numpy()])
+        incoming_rounds = incoming_rounds.drop_duplicates(['company_id', 'round'], keep='last')
+        replaced = pd.MultiIndex.from_frame(previous_rounds[['company_id', 'round']]).isin(
+            pd.MultiIndex.from_frame(incoming_rounds[['company_id', 'round']]))
+        updated_rounds = _concat([previous_rounds[~replaced], incoming_rounds],
+                                 ROUND_CATEGORY_COLUMNS, ignore_index=True)
+        rounds = _concat([root.rounds[~touched], updated_rounds], ROUND_CATEGORY_COLUMNS,
+                         ignore_index=True)
+
+        change = (updated_rounds.groupby('company_id')['amount_usd'].sum()
+                  .sub(previous_rounds.groupby('company_id')['amount_usd'].sum(), fill_value=0)
+                  .reindex(updated.index, fill_value=0))
+        adjusted = (incoming['Total Funding'].isna() & (change != 0)).to_numpy()
+        updated.loc[adjusted, 'Total Funding'] = (
+            updated['Total Funding'].fillna(0)[adjusted] + change[adjusted])
+        companies = _concat([root.companies.drop(index=existing), updated], CATEGORY_COLUMNS)
+        companies = companies.sort_index()
+
+        totals.update(previous, previous_rounds, sign=-1)
+        totals.update(updated, updated_rounds)
+        investor_totals.update(previous_rounds, sign=-1)
+        investor_totals.update(updated_rounds)
+
+        texts = root.texts if root.texts is not None else TextStore.from_frame(root.companies)
+        texts = texts.upsert(ids, delta.texts)
+        store = CompanyStore(
+            companies, rounds, texts=texts, issues=merge_issues([root.issues, delta.issues]),
+            quarantine=pd.concat([quarantine_frame(), root.quarantine, delta.quarantine],
+                                 ignore_index=True))
+        store.__dict__.update(
+            dimension_totals=totals, investor_totals=investor_totals,
+            company_lookup=(domains, names))
+        return store
+
+    def text(self, column, company_ids=None):
+        # Long text of the given companies, by default of every company in the store
+        if company_ids is None:
+            company_ids = self.companies.index
+        texts = self.root.texts
+        if texts is None:
+            return pd.Series(None, index=pd.Index(company_ids, name='company_id'), name=column,
+                             dtype=object)
+        return texts.get(column, company_ids)
+
+    def with_texts(self):
+        # The companies with their long text columns, for exports and detail views
+        return self.companies.join(pd.concat([self.text(column) for column in TEXT_COLUMNS],
+                                             axis=1))
+
+    def memory_report(self):
+        # Bytes held per column of every table, with strings and categories counted in full
+        rows = []
+        for name in ('companies', 'rounds', 'round_investors', 'investors'):
+            table = getattr(self, name)
+            if table is not None:
+                usage = table.memory_usage(deep=True)
+                rows += [(name, column, str(table[column].dtype) if column in table else 'index',
+                          int(size))
+                         for column, size in usage.items()]
+        if self.texts is not None:
+            rows += [('texts', column, 'arrow ' + str(self.texts.table.schema.field(column).type),
+                      self.texts.table.column(column).nbytes) for column in TEXT_COLUMNS]
+        report = pd.DataFrame(rows, columns=['table', 'column', 'dtype', 'bytes'])
+        report['MB'] = report['bytes'] / (1024 * 1024)
+        return report
+
+    def rounds_with(self, *columns):
+        return self.rounds.join(self.companies[list(columns)], on='company_id')
+
+    def round_totals(self):
+        totals = self.rounds.groupby('company_id')['amount_usd'].sum()
+        return totals.reindex(self.companies.index, fill_value=0)
+
+
+class StoreBuilder:
+    # Fills the store one batch of records at a time so the raw records never
+    # have to be held in memory all at once; only the typed chunks are kept
+    def __init__(self, rates=None):
+        self.rates = rates
+        # Companies kept so far, and records read so far including quarantined ones
+        self.count = 0
+        self.seen = 0
+        # Schema of the first company, which every later record must share
+        self.tracxn = None
+        self.issues = Issues()
+        self._companies = []
+        self._rounds = []
+        self._texts = []
+        self._quarantine = []
+
+    def add(self, records):
+        records = list(records)
+        if records:
+            records, numbers, quarantined = screen(records, self.seen, self.issues, self.tracxn)
+            self.seen += len(numbers) + len(quarantined)
+            if len(quarantined):
+                self._quarantine.append(quarantined)
+        if records:
+            self.tracxn = is_tracxn(records[0])
+            labels = _labels(records, self.count, numbers)
+            companies, texts = _split_texts(
+                _companies_frame(records, self.count, self.rates, self.issues, labels))
+            self._companies.append(companies)
+            self._texts.append(texts)
+            self._rounds.append(_rounds_frame(records, self.count, self.rates, self.issues, labels))
+            self.count += len(records)
+
+    def build(self):
+        issues = self.issues.frame()
+        quarantine = pd.concat([quarantine_frame(), *self._quarantine], ignore_index=True)
+        if not self._companies:
+            rounds = _rounds_frame([])
+            companies, texts = _split_texts(_companies_frame([]))
+            return CompanyStore(companies, rounds, *intern_investors(rounds), texts, issues,
+                                quarantine)
+        companies = _concat(self._companies, CATEGORY_COLUMNS)
+        rounds = _concat(self._rounds, ROUND_CATEGORY_COLUMNS, ignore_index=True)
+        texts = TextStore.concat(self._texts)
+        self._companies, self._rounds, self._texts, self._quarantine = [], [], [], []
+        return CompanyStore(companies, rounds, *intern_investors(rounds), texts, issues, quarantine)
+
+
+def _company_domains(companies):
+    websites = companies.get('Website', pd.Series(None, index=companies.index))
+    domains = (websites.astype('string').str.strip().str.lower()
+               .str.replace(r'^[a-z][a-z0-9+.-]*://', '', regex=True)
+               .str.replace(r'^www\.', '', regex=True)
+               .str.split('/').str[0])
+    return domains.mask(domains == '')
+
+
+def _company_names(companies):
+    names = companies.get('Company', pd.Series(None, index=companies.index))
+    return normalize_names(names.astype('string'))
+
+
+def _lookup(keys):
+    # Layered, so each delta extends a copy without rehashing every company
+    keys = keys.dropna()
+    return LayeredDict(zip(keys.astype(object), keys.index))
+
+
+def company_keys(companies):
+    # Stable identity of a company across exports: its website domain, or its
+    # normalized name when no website is known
+    return _company_domains(companies).fillna(_company_names(companies)).astype(object)
+
+
+def merge_stores(stores):
+    # Concatenate shards into one store and drop repeated companies with a single
+    # hash pass over their keys; the copy from the last shard wins, and the
+    # rounds of the dropped copies go with them so funding is counted once
+    companies, rounds, texts, offset = [], [], [], 0
+    for store in stores:
+        companies.append(store.companies.set_axis(store.companies.index + offset))
+        rounds.append(store.rounds.assign(company_id=store.rounds['company_id'] + offset))
+        texts.append(
+            store.texts if store.texts is not None else TextStore.from_frame(store.companies))
+        offset += len(store.companies)
+    companies = _concat(companies, CATEGORY_COLUMNS)
+    rounds = _concat(rounds, ROUND_CATEGORY_COLUMNS, ignore_index=True)
+    texts = TextStore.concat(texts)
+
+    keys = company_keys(companies)
+    keep = keys.isna() | ~keys.duplicated(keep='last')
+    companies = companies[keep.to_numpy()]
+    ids = pd.Series(np.arange(len(companies)), index=companies.index)
+    rounds = rounds[rounds['company_id'].isin(ids.index)]
+    rounds = rounds.assign(company_id=ids.reindex(rounds['company_id']).to_numpy())
+    rounds = rounds.reset_index(drop=True)
+    texts = texts.take(np.flatnonzero(keep.to_numpy()))
+    companies = companies.set_axis(pd.RangeIndex(len(companies), name='company_id'))
+    issues = merge_issues([store.issues for store in stores])
+    quarantined = [store.quarantine for store in stores if store.quarantine is not None]
+    quarantine = pd.concat([quarantine_frame(), *quarantined], ignore_index=True)
+    return CompanyStore(companies, rounds, *intern_investors(rounds), texts, issues, quarantine)
+
+
+def build_store(companies_data, rates=None):
+    if isinstance(companies_data, pd.DataFrame):
+        companies_data = companies_data.to_dict('records')
+    builder = StoreBuilder(rates)
+    builder.add(companies_data)
+    return builder.build()
+
+
+def as_store(companies_data):
+    # Panels accept either a prepared store or raw company records
+    if isinstance(companies_data, CompanyStore):
+        return companies_data
+    return build_store(companies_data)
@@ -0,0 +1,149 @@
+import json
+
+import numpy as np
+
+# Synthetic exports in the curated (app.json) and raw Tracxn (test.json) shapes,
+# for benchmarking and sizing. Countries, industries, investors and round counts
+# follow Zipf-like distributions; a larger skew concentrates more companies on
+# the most popular values.
+
+COUNTRIES = [
+    'United States', 'United Kingdom', 'Germany', 'France', 'Singapore', 'Israel', 'Canada',
+    'Japan', 'Australia', 'Estonia', 'Netherlands', 'Switzerland', 'Sweden', 'India',
+    'South Korea', 'Spain',
+]
+INDUSTRIES = [
+    'Cybersecurity', 'Enterprise Infrastructure', 'HealthTech', 'CleanTech', 'AgriTech', 'MedTech',
+    'BioTech', 'Blockchain', 'Space Tech', 'Aerospace', 'Quantum Computing', 'FinTech', 'EdTech',
+]
+ROUND_NAMES = ['Seed', 'Series A', 'Series B', 'Series C', 'Series D', 'Series E']
+CURRENCIES = ['USD', 'EUR', 'GBP', 'SGD', 'JPY']
+CURRENCY_WEIGHTS = [0.7, 0.15, 0.08, 0.05, 0.02]
+
+
+def _zipf(n, skew):
+    weights = 1.0 / np.arange(1, n + 1) ** skew
+    return weights / weights.sum()
+
+
+def _labels(base, n, prefix):
+    # The named values first, then generated ones for high-cardinality runs
+    return base[:n] + [f'{prefix} {i}' for i in range(len(base), n)]
+
+
+def generate_companies(n, schema='curated', seed=0, n_countries=40, n_industries=30,
+                       n_investors=5000, max_rounds=6, country_skew=1.2, industry_skew=1.0,
+                       investor_skew=1.1, round_skew=1.5):
+    if max_rounds < 1:
+        raise ValueError(f"max_rounds must be at least 1, got {max_rounds}")
+    rng = np.random.default_rng(seed)
+    countries = _labels(COUNTRIES, n_countries, 'Country')
+    industries = _labels(INDUSTRIES, n_industries, 'Industry')
+    round_names = _labels(ROUND_NAMES, max_rounds, 'Round')
+
+    country = rng.choice(n_countries, size=n, p=_zipf(n_countries, country_skew))
+    industry = rng.choice(n_industries, size=n, p=_zipf(n_industries, industry_skew))
+    rounds = rng.choice(np.arange(1, max_rounds + 1), size=n, p=_zipf(max_rounds, round_skew))
+    founded = rng.integers(1995, 2024, size=n)
+    currency = rng.choice(len(CURRENCIES), size=n, p=CURRENCY_WEIGHTS)
+    investor_p = _zipf(n_investors, investor_skew)
+    # About one company in twenty shares its founder with another company
+    founder = np.where(rng.random(n) < 0.05, rng.integers(0, n, size=n), np.arange(n))
+
+    # Per-round and per-investor draws are made up front in bulk; the loop only slices them
+    starts = np.concatenate([[0], np.cumsum(rounds)])
+    stage = np.arange(starts[-1]) - np.repeat(starts[:-1], rounds)
+    # Rounds past the named ones are sized like the last of them, which keeps
+    # the amounts well inside int64
+    sizes = 14 + np.minimum(stage, len(ROUND_NAMES) - 1)
+    amounts = (rng.lognormal(sizes, 1.0) // 1000 * 1000).astype(np.int64)
+    years = np.minimum(np.repeat(founded, rounds) + stage + rng.integers(0, 2, size=stage.size),
+                       2024)
+    backers = rng.integers(1, 5, size=stage.size)
+    backer_starts = np.concatenate([[0], np.cumsum(backers)])
+    picks = rng.choice(n_investors, size=backer_starts[-1], p=investor_p)
+
+    for i in range(n):
+        history = []
+        for r in range(starts[i], starts[i + 1]):
+            backed = np.unique(picks[backer_starts[r]:backer_starts[r + 1]])
+            investors = [f'Investor {j}' for j in backed]
+            history.append((round_names[stage[r]], int(years[r]), int(amounts[r]), investors))
+
+        record = _curated(i, history, countries[country[i]], industries[industry[i]],
+                          int(founded[i]), CURRENCIES[currency[i]], int(founder[i]), rng)
+        yield record if schema == 'curated' else _tracxn(record, history, CURRENCIES[currency[i]])
+
+
+def _curated(i, history, country, industry, founded, currency, founder, rng):
+    total = sum(amount for _, _, amount, _ in history)
+    _, last_year, last_amount, _ = history[-1]
+    valuation = f'{total * int(rng.integers(3, 12))} {currency}' if rng.random() < 0.6 else 'N/A'
+    last_date = f'{last_year}-{int(rng.integers(1, 13)):02d}-{int(rng.integers(1, 29)):02d}'
+    return {
+        'Company': f'Company {i}',
+        'Founded': founded,
+        'Country HQ': country,
+        'Overview': f'{industry} platform built by company {i} for customers in {country}.',
+        'Industry': industry,
+        'Last Round Date': last_date,
+        'Last Round Size': f'{last_amount} {currency}',
+        'Last Valuation': valuation,
+        'Total Funding': f'{total} {currency}',
+        'Investors': ', '.join(history[-1][3]),
+        'Website': f'https://www.company{i}.com/',
+        'Website Cleaned Up': 'Yes',
+        'Seen / Not Seen (Master List)': 'Seen' if rng.random() < 0.5 else 'Not Seen',
+        'Fundraising History': {
+            **{f'round{r + 1}': {'year': year, 'amount': f'{amount} {currency}',
+                                 'by': ', '.join(investors)}
+               for r, (_, year, amount, investors) in enumerate(history)},
+            'founded': founded,
+        },
+        'Relevant': 'Nil',
+        'Attributes': 'Trending Theme',
+        'Founder': {
+            'name': f'Founder {founder}',
+            'designation': 'CEO',
+            'email': f'founder@company{i}.com',
+            'shortBio': f'Founder of Company {i}.',
+            'linkedin': f'https://linkedin.com/in/founder-{i}/',
+        },
+    }
+
+
+def _tracxn(record, history, currency):
+    rounds = [
+        {
+            'name': name,
+            'date': {'year': year, 'month': 1, 'day': 1},
+            'amount': {'amount': amount, 'currency': currency},
+            'investorList': [{'name': investor} for investor in investors],
+        }
+        for name, year, amount, investors in history
+    ]
+    return {
+        'name': record['Company'],
+        'foundedYear': record['Founded'],
+        'domain': record['Website'].split('//')[-1].strip('/').removeprefix('www.'),
+        'location': {'country': record['Country HQ']},
+        'description': {'long': record['Overview']},
+        'sectorList': [[{'name': record['Industry'], 'type': 'PRACTICE AREA'}]],
+        'totalMoneyRaised': {'totalAmount': {'amount': sum(h[2] for h in history),
+                                             'currency': currency}},
+        'websiteInfo': {'url': record['Website']},
+        'stage': history[-1][0],
+        'investorList': rounds[-1]['investorList'],
+        'fundingInfo': {'fundingRoundList': rounds, 'latestRoundInfo': rounds[-1]},
+    }
+
+
+def write_export(path, records):
+    # Written one record at a time so million-company files never sit in memory
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write('[\n')
+        for i, record in enumerate(records):
+            if i:
+                file.write(',\n')
+            json.dump(record, file)
+        file.write('\n]\n')
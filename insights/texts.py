@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+# Long free text that no aggregate reads (company overviews, founder bios) is
+# kept out of the companies frame, as Arrow string columns outside the Python
+# heap: row i belongs to company id i of the full store. Stores read from the
+# disk cache memory-map these columns, so text is only paged in, and turned
+# into Python strings, for the rows a detail view or an export asks for.
+
+TEXT_COLUMNS = ['Overview', 'Founder Bio']
+
+
+def _text_array(values):
+    return pa.array(pd.Series(values, dtype=object).astype('string'), type=pa.large_string(),
+                    from_pandas=True)
+
+
+class TextStore:
+    def __init__(self, table=None):
+        if table is None:
+            table = pa.table(
+                {column: pa.array([], type=pa.large_string()) for column in TEXT_COLUMNS})
+        self.table = table
+
+    @classmethod
+    def from_frame(cls, frame):
+        # Takes the text columns of a companies frame, in company id order
+        return cls(pa.table({
+            column: _text_array(frame[column] if column in frame else [None] * len(frame))
+            for column in TEXT_COLUMNS
+        }))
+
+    @classmethod
+    def concat(cls, stores):
+        return cls(pa.concat_tables([store.table for store in stores]))
+
+    def __len__(self):
+        return self.table.num_rows
+
+    @property
+    def nbytes(self):
+        return self.table.nbytes
+
+    def take(self, positions):
+        return TextStore(self.table.take(pa.array(np.asarray(positions, dtype='int64'))))
+
+    def get(self, column, company_ids):
+        company_ids = np.asarray(company_ids, dtype='int64')
+        values = self.table.column(column).take(pa.array(company_ids)).to_pandas()
+        return pd.Series(values.to_numpy(dtype=object),
+                         index=pd.Index(company_ids, name='company_id'), name=column)
+
+    def frame(self, company_ids):
+        return pd.concat([self.get(column, company_ids) for column in TEXT_COLUMNS], axis=1)
+
+    def upsert(self, company_ids, other):
+        # Row j of `other` belongs to company_ids[j]: its non-missing text replaces
+        # the stored text, and ids past the end are appended in order. Where an id
+        # repeats, its last non-missing text wins.
+        company_ids = np.asarray(company_ids, dtype='int64')
+        size = max(len(self), int(company_ids.max()) + 1 if len(company_ids) else 0)
+        combined = pa.concat_tables([self.table, other.table])
+        new = company_ids >= len(self)
+        columns = {}
+        for column in TEXT_COLUMNS:
+            positions = np.arange(size)
+            positions[company_ids[new]] = len(self) + np.flatnonzero(new)
+            incoming = other.table.column(column).is_valid().to_numpy(zero_copy_only=False)
+            positions[company_ids[incoming]] = len(self) + np.flatnonzero(incoming)
+            columns[column] = combined.column(column).take(pa.array(positions))
+        return TextStore(pa.table(columns))
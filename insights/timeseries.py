@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+
+# Funding over round dates: deal counts and round amounts per calendar month,
+# kept as running sums from the first month, overall and per country and
+# industry. A month, quarter or year bucket, a date range or a trailing window
+# is the difference of two running sums, so every query costs a constant per
+# bucket and group however many rounds the dataset holds.
+#
+# Rounds dated only by a year (most curated rounds) are placed in its January.
+
+UNKNOWN = 'Unknown'
+FREQUENCIES = {'Month': 'M', 'Quarter': 'Q', 'Year': 'Y'}
+GROUPS = {'country': 'Country HQ', 'industry': 'Industry'}
+MEASURES = ['Deals', 'Funding (USD)']
+
+
+def round_dates(rounds):
+    # The round's own date where known, else the start of its year
+    years = pd.to_datetime(rounds['year'].astype('string') + '-01-01', errors='coerce')
+    return rounds['date'].fillna(years) if 'date' in rounds else years
+
+
+def _running(positions, codes, n_months, n_labels, weights=None):
+    # Per (month, group) totals, summed down the months with a leading zero row
+    cells = np.bincount(positions * n_labels + codes, weights=weights,
+                        minlength=n_months * n_labels)
+    running = np.zeros((n_months + 1, n_labels))
+    np.cumsum(cells.reshape(n_months, n_labels), axis=0, out=running[1:])
+    return running
+
+
+class RoundTimeSeries:
+    def __init__(self, companies, rounds):
+        months = round_dates(rounds).dt.to_period('M')
+        present = rounds['company_id'].isin(companies.index).to_numpy()
+        known = months.notna().to_numpy() & present
+        # Rounds of the companies without any date or year, left out of every bucket
+        self.undated = int(np.count_nonzero(present & ~known))
+        months = months[known]
+        if len(months):
+            self.months = pd.period_range(months.min(), months.max(), freq='M')
+        else:
+            self.months = pd.PeriodIndex([], freq='M')
+        first = self.months[0].ordinal if len(self.months) else 0
+        positions = (months.array.asi8 - first).astype('int64')
+        amounts = rounds['amount_usd'].to_numpy(dtype='float64', na_value=np.nan)[known]
+        amounts = np.nan_to_num(amounts)
+        company_ids = rounds['company_id'].to_numpy()[known]
+
+        self.labels = {None: pd.Index(['All'], dtype=object)}
+        codes = {None: np.zeros(len(positions), dtype='int64')}
+        for by, column in GROUPS.items():
+            keys = companies.get(column, pd.Series(None, index=companies.index))
+            codes[by], labels = pd.factorize(keys.reindex(company_ids).astype(object), sort=True)
+            self.labels[by] = pd.Index(list(labels) + [UNKNOWN], dtype=object)
+            codes[by] = np.where(codes[by] < 0, len(labels), codes[by])
+
+        self._running = {
+            by: {
+                'Deals': _running(positions, codes[by], len(self.months), len(self.labels[by])),
+                'Funding (USD)': _running(positions, codes[by], len(self.months),
+                                          len(self.labels[by]), amounts),
+            }
+            for by in self.labels
+        }
+
+    def _frame(self, values, by, index):
+        frame = pd.DataFrame(values, index=index, columns=self.labels[by].rename(GROUPS.get(by)))
+        # Groups without any round are dropped, including an empty 'Unknown'
+        return frame.loc[:, (self._running[by]['Deals'][-1] > 0)]
+
+    def _month(self, when, side):
+        # Position of the first month on or after `when` (side='left') or
+        # just past the month containing it (side='right')
+        if when is None:
+            return 0 if side == 'left' else len(self.months)
+        month = pd.Period(when, freq='M')
+        return int(np.searchsorted(self.months.asi8, month.ordinal, side=side))
+
+    def series(self, freq='Y', by=None, measure='Deals', start=None, end=None, window=1):
+        # One row per bucket overlapping [start, end]; with window > 1 each row
+        # sums the trailing `window` buckets, e.g. 12 months or 4 quarters
+        buckets = self.months.asfreq(freq)
+        starts = np.flatnonzero(np.diff(buckets.asi8, prepend=buckets.asi8[:1] - 1))
+        ends = np.append(starts[1:], len(self.months))
+        window_starts = starts[np.maximum(np.arange(len(starts)) - (window - 1), 0)]
+        running = self._running[by][measure]
+        values = running[ends] - running[window_starts]
+        if measure == 'Deals':
+            values = values.astype('int64')
+
+        labels = buckets[starts]
+        selected = np.ones(len(starts), dtype=bool)
+        if start is not None:
+            selected &= labels.asi8 >= pd.Period(start, freq=freq).ordinal
+        if end is not None:
+            selected &= labels.asi8 <= pd.Period(end, freq=freq).ordinal
+        index = pd.PeriodIndex(labels[selected],
+                               name=next(k for k, v in FREQUENCIES.items() if v == freq))
+        return self._frame(values[selected], by, index)
+
+    def totals(self, start=None, end=None, by=None):
+        # Deals and funding per group over the months from start to end
+        first, last = self._month(start, 'left'), self._month(end, 'right')
+        last = max(first, last)
+        totals = pd.DataFrame({
+            measure: running[last] - running[first]
+            for measure, running in self._running[by].items()
+        }, index=self.labels[by].rename(GROUPS.get(by)))
+        totals['Deals'] = totals['Deals'].astype('int64')
+        return totals[totals['Deals'] > 0].sort_values('Funding (USD)', ascending=False)
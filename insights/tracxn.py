@@ -0,0 +1,195 @@
+import pandas as pd
+
+# Adapter for raw Tracxn exports (the test.json shape): flattens each batch of
+# records into the same company and round columns the curated app.json schema
+# produces, so both sources share the store, indexes and aggregates.
+
+
+def is_tracxn(record):
+    return isinstance(record, dict) and ('fundingInfo' in record or 'sectorList' in record)
+
+
+def _get(record, *path):
+    for key in path:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+# Nested lists are read leniently: a value that is not a list, or an entry
+# that is not a named record, is left out and the issue returned with the value
+NOT_A_LIST = 'not a list, left out'
+MALFORMED_ENTRY = 'malformed entry, left out'
+
+
+def _first_sector(record):
+    # sectorList is a list of sector paths, each a list of nodes from the practice area down
+    sectors = record.get('sectorList')
+    if sectors is None:
+        return None, None
+    if not isinstance(sectors, list):
+        return None, NOT_A_LIST
+    path = sectors[0] if sectors and isinstance(sectors[0], list) else sectors
+    return (_get(path[0], 'name') if path else None), None
+
+
+def _named(items):
+    # The named records of a list, and the issue if any were left out
+    if items is None:
+        return [], None
+    if not isinstance(items, list):
+        return [], NOT_A_LIST
+    # Exact type checks: the entries come straight from json, and this runs for every list
+    named = [item for item in items if type(item) is dict and type(item.get('name')) is str]
+    return named, None if len(named) == len(items) else MALFORMED_ENTRY
+
+
+def _names(items):
+    named, issue = _named(items)
+    return ', '.join(item['name'] for item in named if item['name']), issue
+
+
+def _attributes(flags):
+    named, issue = _named(flags)
+    return ', '.join(flag['name'] for flag in named if flag.get('value') == 'YES'), issue
+
+
+def _date_parts(value):
+    if not isinstance(value, dict):
+        return None, None, None
+    return value.get('year'), value.get('month'), value.get('day')
+
+
+def _dates(years, months, days):
+    # Dates from year, month and day parts given as numbers or strings, a
+    # missing month or day being the first. Parts that make no date are kept
+    # as text, so the date check at ingest reports them.
+    parts = pd.DataFrame({'year': years, 'month': months, 'day': days})
+    parts = parts.apply(pd.to_numeric, errors='coerce')
+    parts[['month', 'day']] = parts[['month', 'day']].where(lambda p: p > 0, 1)
+    dates = pd.to_datetime(parts, errors='coerce')
+    invalid = (years.notna() & (years != 0) & (years != '') & dates.isna()).to_numpy()
+    if invalid.any():
+        text = years.astype(str) + '-' + months.astype(str) + '-' + days.astype(str)
+        dates = dates.astype(object)
+        dates[invalid] = text[invalid]
+    return dates
+
+
+COMPANY_FIELDS = [
+    'Company', 'Founded', 'Country HQ', 'Overview', 'Industry', 'Last Round Size',
+    'Last Round Size Currency', 'Total Funding', 'Total Funding Currency', 'Investors', 'Website',
+    'Stage', 'Attributes',
+]
+
+# Company columns read from a nested record or list of the export, whose
+# malformed values are tallied
+RECORD_FIELDS = {
+    'Country HQ': 'location', 'Overview': 'description', 'Total Funding': 'totalMoneyRaised',
+    'Website': 'websiteInfo', 'Fundraising History': 'fundingInfo',
+}
+RECORD_TYPES = {dict, type(None)}
+LIST_FIELDS = {'Industry': 'sectorList', 'Investors': 'investorList',
+               'Attributes': 'specialFlagList'}
+
+
+def _company_row(r):
+    latest = _get(r, 'fundingInfo', 'latestRoundInfo')
+    industry, industry_issue = _first_sector(r)
+    investors, investors_issue = _names(r.get('investorList'))
+    attributes, attributes_issue = _attributes(r.get('specialFlagList'))
+    return (
+        r.get('name'),
+        r.get('foundedYear'),
+        _get(r, 'location', 'country'),
+        _get(r, 'description', 'long') or _get(r, 'description', 'short'),
+        industry,
+        _get(latest, 'amount', 'amount'),
+        _get(latest, 'amount', 'currency'),
+        _get(r, 'totalMoneyRaised', 'totalAmount', 'amount'),
+        _get(r, 'totalMoneyRaised', 'totalAmount', 'currency'),
+        investors,
+        _get(r, 'websiteInfo', 'url') or r.get('domain'),
+        r.get('stage'),
+        attributes,
+        *_date_parts(_get(latest, 'date')),
+        industry_issue,
+        investors_issue,
+        attributes_issue,
+    )
+
+
+def _flag(issues, field, issue, mask, labels, records, key):
+    # The raw values are only gathered for the examples of a batch with issues
+    values = pd.Series([record.get(key) for record in records], index=labels.index, dtype=object)
+    issues.add(field, issue, mask, labels, values)
+
+
+def tracxn_companies(records, offset, issues, labels):
+    # One row per record from a single pass over the batch; the last round
+    # date is assembled from its parts for the whole batch at once
+    rows = pd.DataFrame([_company_row(r) for r in records],
+                        columns=[*COMPANY_FIELDS, 'year', 'month', 'day',
+                                 *(f'{field} issue' for field in LIST_FIELDS)],
+                        index=pd.RangeIndex(offset, offset + len(records)))
+    # A clean batch is confirmed in one pass; the fields are only checked one by one otherwise
+    found = {type(value) for r in records for value in map(r.get, RECORD_FIELDS.values())}
+    for field, key in RECORD_FIELDS.items() if found - RECORD_TYPES else ():
+        malformed = [type(r.get(key)) not in RECORD_TYPES for r in records]
+        if any(malformed):
+            _flag(issues, field, 'not a record, left out', malformed, labels, records, key)
+    for field, key in LIST_FIELDS.items():
+        flagged = rows.pop(f'{field} issue')
+        for issue in flagged.dropna().unique():
+            _flag(issues, field, issue, (flagged == issue).to_numpy(), labels, records, key)
+    companies = rows[COMPANY_FIELDS].assign(
+        **{'Last Round Date': _dates(rows['year'], rows['month'], rows['day']),
+           # Valuations are not part of the export
+           'Last Valuation': None, 'Last Valuation Currency': None, 'Founder': None})
+    return companies
+
+
+def tracxn_rounds(records, offset, issues, labels):
+    # One row per round; like the curated 'Fundraising History', a round list
+    # that is not a list keeps no rounds and entries that are not records are
+    # skipped, both tallied in `issues`
+    rows, unreadable, malformed, investors = [], [], [], {}
+    for company_id, record in enumerate(records, start=offset):
+        round_list = _get(record, 'fundingInfo', 'fundingRoundList')
+        if not round_list:
+            continue
+        if not isinstance(round_list, list):
+            unreadable.append(company_id)
+            continue
+        entries = [round_info for round_info in round_list if isinstance(round_info, dict)]
+        if len(entries) < len(round_list):
+            malformed.append(company_id)
+        for round_info in entries:
+            names, issue = _names(round_info.get('investorList'))
+            if issue:
+                # Tallied per company, with its first malformed list as the example
+                investors.setdefault(issue, {}).setdefault(company_id,
+                                                           round_info.get('investorList'))
+            rows.append((
+                company_id,
+                round_info.get('name'),
+                _get(round_info, 'amount', 'amount'),
+                _get(round_info, 'amount', 'currency'),
+                names,
+                *_date_parts(round_info.get('date')),
+            ))
+
+    round_lists = pd.Series([_get(record, 'fundingInfo', 'fundingRoundList') for record in records],
+                            index=labels.index, dtype=object)
+    issues.add('Fundraising History', 'unreadable, no rounds kept', labels.index.isin(unreadable),
+               labels, round_lists)
+    issues.add('Fundraising History', 'round is not a record, skipped',
+               labels.index.isin(malformed), labels, round_lists)
+    for issue, lists in investors.items():
+        issues.add('round investors', issue, labels.index.isin(list(lists)), labels,
+                   pd.Series(lists, dtype=object).reindex(labels.index))
+    rounds = pd.DataFrame(rows, columns=['company_id', 'round', 'amount', 'currency', 'investors',
+                                         'year', 'month', 'day'])
+    rounds['date'] = _dates(rounds['year'], rounds['month'], rounds['day'])
+    return rounds[['company_id', 'round', 'year', 'date', 'amount', 'currency', 'investors']]
@@ -0,0 +1,138 @@
+import json
+
+import pandas as pd
+
+from .tracxn import is_tracxn
+
+# Validation at ingest, in the same pass that types each batch of records.
+# Records that cannot be read as a company are quarantined; fields that do not
+# coerce to their column's type become null. Both are tallied per field and
+# issue with a few example records, so the dashboard shows one summary table
+# and the insights can trust the typed columns.
+
+# Placeholders that mean "no value" rather than a malformed one
+NULL_MARKERS = ['', 'n/a', 'na', 'nan', 'none', 'null', '-', 'unknown']
+# Their usual spellings, matched with one hash lookup per cell
+_NULL_SPELLINGS = sorted({spelling for marker in NULL_MARKERS
+                          for spelling in (marker, marker.upper(), marker.title())})
+MAX_EXAMPLES = 3
+MAX_RAW_CHARS = 2000
+
+ISSUE_COLUMNS = ['field', 'issue', 'count', 'examples']
+QUARANTINE_COLUMNS = ['record', 'reason', 'raw']
+
+
+class Issues:
+    def __init__(self):
+        self.counts = {}
+        self.examples = {}
+
+    def add(self, field, issue, mask, labels, values):
+        # Count the rows flagged by `mask` and keep the first few as examples
+        mask = pd.Series(mask, index=labels.index)
+        count = int(mask.sum())
+        if not count:
+            return
+        key = (field, issue)
+        self.counts[key] = self.counts.get(key, 0) + count
+        examples = self.examples.setdefault(key, [])
+        for row in mask.index[mask.to_numpy()][:MAX_EXAMPLES - len(examples)]:
+            examples.append(f'{labels[row]}: {values[row]!r}'[:120])
+
+    def frame(self):
+        return pd.DataFrame(
+            [(field, issue, count, '; '.join(self.examples[field, issue]))
+             for (field, issue), count in self.counts.items()],
+            columns=ISSUE_COLUMNS)
+
+
+def merge_issues(frames):
+    # Issue summaries of several stores as one, still with a few examples per issue
+    frames = [frame for frame in frames if frame is not None and len(frame)]
+    if not frames:
+        return pd.DataFrame(columns=ISSUE_COLUMNS)
+    issues = pd.concat(frames, ignore_index=True)
+    return issues.groupby(['field', 'issue'], sort=False).agg(
+        count=('count', 'sum'),
+        examples=('examples',
+                  lambda examples: '; '.join('; '.join(examples).split('; ')[:MAX_EXAMPLES])),
+    ).reset_index()
+
+
+def quarantine_frame(rows=()):
+    return pd.DataFrame(list(rows), columns=QUARANTINE_COLUMNS)
+
+
+def screen(records, first_record, issues, tracxn=None):
+    # Records the batch can type, plus their numbers in the export, and the
+    # quarantined rest. An export is typed with the schema of its first company
+    # (`tracxn`, None until one is seen), so records of the other schema are
+    # quarantined rather than misread.
+    if tracxn is None:
+        tracxn = is_tracxn(next((record for record in records if isinstance(record, dict)), {}))
+    readable = [is_tracxn(record) == tracxn and isinstance(record, dict) for record in records]
+    if all(readable):
+        return records, range(first_record, first_record + len(records)), quarantine_frame()
+
+    kept, numbers, quarantined = [], [], []
+    for number, record in enumerate(records, start=first_record):
+        if not isinstance(record, dict):
+            reason = f'not a company record ({type(record).__name__})'
+        elif is_tracxn(record) != tracxn:
+            if tracxn:
+                reason = 'curated record in a Tracxn export'
+            else:
+                reason = 'Tracxn record in a curated export'
+        else:
+            kept.append(record)
+            numbers.append(number)
+            continue
+        raw = json.dumps(record, default=str, ensure_ascii=False)
+        quarantined.append((number, reason, raw[:MAX_RAW_CHARS]))
+
+    quarantined = quarantine_frame(quarantined)
+    labels = 'record ' + quarantined['record'].astype(str)
+    for reason in quarantined['reason'].unique():
+        issues.add('record', f'quarantined: {reason}', quarantined['reason'] == reason, labels,
+                   quarantined['raw'].str[:80])
+    return kept, numbers, quarantined
+
+
+def present(values):
+    # Cells holding something other than a null or a null placeholder
+    values = pd.Series(values, dtype=object)
+    return values.notna().to_numpy() & ~values.isin(_NULL_SPELLINGS).to_numpy()
+
+
+def flag_uncoerced(issues, field, issue, raw, coerced, labels):
+    # Values that were present but did not survive coercion
+    raw = pd.Series(raw).set_axis(labels.index)
+    failed = pd.isna(coerced).to_numpy() & raw.notna().to_numpy()
+    failed[failed] = present(raw[failed])
+    issues.add(field, issue, failed, labels, raw)
+
+
+def coerce_text(issues, frame, columns, labels):
+    # Scalar text columns: numbers become text, lists and records become null
+    for column in columns:
+        if column not in frame:
+            continue
+        if pd.api.types.infer_dtype(frame[column], skipna=True) in ('string', 'empty'):
+            continue
+        values = frame[column].astype(object)
+        nested = values.map(lambda value: isinstance(value, (list, dict))).to_numpy(dtype=bool)
+        issues.add(column, 'not text, set to null', nested, labels, values)
+        if nested.any():
+            values = values.where(~nested, None)
+        other = values.map(
+            lambda value: value is not None and not isinstance(value, str) and pd.notna(value))
+        frame[column] = values.where(~other.to_numpy(dtype=bool), values.astype(str))
+
+
+def parse_dates(values):
+    # ISO dates in one vectorized pass; only the other spellings are parsed one by one
+    dates = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    rest = dates.isna().to_numpy() & pd.Series(values).notna().to_numpy()
+    if rest.any():
+        dates[rest] = pd.to_datetime(pd.Series(values)[rest], format='mixed', errors='coerce')
+    return dates
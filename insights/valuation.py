@@ -1,14 +1,40 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+import streamlit as st
+
+from .aggregates import valuation_points
+from .reduce import DENSITY_POINTS, render_mode, sample_points
+from .render import render_figure
+from .store import as_store
+
 
 def plot_valuation_insights(companies_data):
-    df = pd.DataFrame(companies_data)
-    df['Last Valuation'] = df['Last Valuation'].apply(lambda x: int(x.split()[0]) if x != "N/A" else None)
-    
-    plt.figure(figsize=(10, 6))
-    df.plot.scatter(x='Total Funding', y='Last Valuation')
-    plt.title("Funding vs Last Valuation")
-    plt.xlabel("Total Funding in USD")
-    plt.ylabel("Last Valuation in USD")
-    plt.tight_layout()
-    plt.show()
+    store = as_store(companies_data)
+    df = valuation_points(store)
+
+    if st.checkbox("Interactive chart", key="valuation_interactive"):
+        import plotly.express as px
+
+        points = sample_points(df)
+        if len(points) < len(df):
+            st.caption(f"Showing a sample of {len(points):,} of {len(df):,} companies")
+        fig = px.scatter(points, x='Total Funding', y='Last Valuation', hover_name='Company',
+                         title="Funding vs Last Valuation", render_mode=render_mode(len(points)),
+                         labels={'Total Funding': 'Total Funding in USD',
+                                 'Last Valuation': 'Last Valuation in USD'})
+        st.plotly_chart(fig, use_container_width=True)
+        return
+
+    def draw(fig):
+        ax = fig.subplots()
+        if len(df) > DENSITY_POINTS:
+            # Binned on the server rather than drawing every marker
+            cells = ax.hexbin(df['Total Funding'], df['Last Valuation'], gridsize=80, bins='log',
+                              mincnt=1)
+            fig.colorbar(cells, ax=ax, label="Companies")
+        else:
+            df.plot.scatter(x='Total Funding', y='Last Valuation', ax=ax)
+        ax.set_title("Funding vs Last Valuation")
+        ax.set_xlabel("Total Funding in USD")
+        ax.set_ylabel("Last Valuation in USD")
+        fig.tight_layout()
+
+    render_figure('valuation_insights', store.key, (), draw, figsize=(10, 6))
@@ -0,0 +1,93 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from insights.api import Datasets, make_server, parse_filters
+from insights.cache import DatasetCache
+
+RECORDS = [
+    {'Company': 'Acme', 'Country HQ': 'Germany', 'Industry': 'Security',
+     'Overview': 'Threat intelligence platform', 'Total Funding': '5000000 USD'},
+    {'Company': 'Beta', 'Country HQ': 'France', 'Industry': 'Security',
+     'Overview': 'Endpoint protection', 'Total Funding': '500000 USD'},
+    {'Company': 'Gamma', 'Country HQ': 'Germany', 'Industry': 'Fintech',
+     'Overview': 'Payments', 'Total Funding': '2000000 USD'},
+]
+
+
+@pytest.fixture
+def server(tmp_path):
+    path = tmp_path / 'app.json'
+    path.write_text(json.dumps(RECORDS))
+    server = make_server(Datasets({'app': str(path)}, DatasetCache(str(tmp_path / 'cache'))),
+                         port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def _get(url, **headers):
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, headers=headers)) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+def _insight(base, query):
+    status, _, body = _get(f'{base}/datasets/app/industry_distribution?{query}')
+    assert status == 200
+    return json.loads(body)
+
+
+def test_parse_filters_normalizes_the_query():
+    assert parse_filters('country=b&min_funding=5&country=a&country=b&q=Threat++Intel') == (
+        5.0, ('a', 'b'), (), 'threat intel')
+    assert parse_filters('') == (0.0, (), (), '')
+    with pytest.raises(ValueError):
+        parse_filters('min_funding=lots')
+
+
+def test_filters_narrow_the_insight(server):
+    everything = _insight(server, '')
+    assert everything['filters'] == {'min_funding': 0.0, 'countries': [], 'industries': [],
+                                     'q': ''}
+    assert sum(row['count'] for row in everything['rows']) == 3
+
+    filtered = _insight(server, 'min_funding=1000000&country=Germany')
+    assert filtered['filters']['countries'] == ['Germany']
+    assert {row['Industry']: row['count'] for row in filtered['rows']} == {
+        'Security': 1, 'Fintech': 1}
+    assert _insight(server, 'industry=Security&q=endpoint')['rows'] == [
+        {'Industry': 'Security', 'count': 1}]
+
+
+def test_invalid_min_funding_is_a_bad_request(server):
+    status, _, body = _get(f'{server}/datasets/app/industry_distribution?min_funding=lots')
+    assert status == 400
+    assert json.loads(body)['error'].startswith('Invalid min_funding')
+
+
+def test_unknown_paths_are_not_found(server):
+    for path in ('/datasets/other/industry_distribution', '/datasets/app/other', '/other'):
+        assert _get(server + path)[0] == 404
+
+
+def test_etag_revalidation(server):
+    url = f'{server}/datasets/app/industry_distribution?country=Germany'
+    status, headers, body = _get(url)
+    etag = headers['ETag']
+    assert status == 200 and etag and body
+
+    status, headers, body = _get(url, **{'If-None-Match': etag})
+    assert status == 304 and headers['ETag'] == etag and body == b''
+    # A repeated filter normalizes to the same response
+    assert _get(f'{url}&country=Germany', **{'If-None-Match': etag})[0] == 304
+
+    status, headers, _ = _get(f'{url}&min_funding=1', **{'If-None-Match': etag})
+    assert status == 200 and headers['ETag'] != etag
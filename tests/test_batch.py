@@ -0,0 +1,44 @@
+import json
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+import batch
+from insights.synthetic import generate_companies
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter: the test session itself may have loaded the UI libraries
+HEADLESS = """
+import sys
+import batch
+tables = batch.summarize_export(sys.argv[1])
+assert tables and all(len(table.columns) for table in tables.values())
+print(sorted({name.split('.')[0] for name in sys.modules} & {'streamlit', 'matplotlib', 'plotly'}))
+"""
+
+
+def _exports(tmp_path, sizes):
+    exports = tmp_path / 'exports'
+    exports.mkdir()
+    for i, n in enumerate(sizes):
+        (exports / f'export{i}.json').write_text(json.dumps(list(generate_companies(n, seed=i))))
+    return exports
+
+
+def test_batch_loads_no_ui_libraries(tmp_path):
+    exports = _exports(tmp_path, [50])
+    result = subprocess.run([sys.executable, '-c', HEADLESS, str(exports / 'export0.json')],
+                            cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_batch_writes_one_table_per_insight(tmp_path):
+    exports = _exports(tmp_path, [30, 20])
+    assert batch.run(str(exports), str(tmp_path / 'reports'), workers=1) == 0
+    for name, table in batch.summarize_export(str(exports / 'export1.json')).items():
+        written = pd.read_csv(tmp_path / 'reports' / f'{name}.csv')
+        assert written['export'].isin(['export0', 'export1']).all()
+        assert (written['export'] == 'export1').sum() == len(table)
@@ -0,0 +1,111 @@
+import json
+import os
+
+import pandas as pd
+
+from insights import api
+from insights.cache import TABLES, DatasetCache, _directory_size
+from insights.store import build_store
+
+RECORDS = [
+    {'Company': 'Acme', 'Country HQ': 'Germany', 'Overview': 'Threat intelligence',
+     'Total Funding': '5000000 USD', 'Investors': 'VC1, VC2',
+     'Fundraising History': {'Seed': {'year': 2020, 'month': 3, 'amount': '1000000',
+                                      'by': 'VC1, VC3'}}},
+    {'Company': 'Beta', 'Total Funding': 'lots', 'Founder': {'name': 'B', 'shortBio': 'Bio'}},
+]
+
+
+def _nulls_as_none(frame):
+    # Arrow reads every null of a text column back as None, where pandas may have NaN
+    return frame.where(frame.notna(), None)
+
+
+def _assert_same_store(loaded, store):
+    for name in TABLES:
+        pd.testing.assert_frame_equal(_nulls_as_none(getattr(loaded, name)),
+                                      _nulls_as_none(getattr(store, name)), obj=name)
+    ids = range(len(store.companies))
+    pd.testing.assert_frame_equal(loaded.texts.frame(ids), store.texts.frame(ids))
+
+
+def _parse_count(monkeypatch):
+    parsed = []
+    read_store = api.read_store
+
+    def counted(*args):
+        parsed.append(args)
+        return read_store(*args)
+
+    monkeypatch.setattr(api, 'read_store', counted)
+    return parsed
+
+
+def test_round_trip(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    store = build_store(RECORDS)
+    assert cache.get('key') is None
+    cache.put('key', store)
+    _assert_same_store(cache.get('key'), store)
+
+
+def test_second_load_is_a_hit(tmp_path, monkeypatch):
+    parsed = _parse_count(monkeypatch)
+    path = tmp_path / 'app.json'
+    path.write_text(json.dumps(RECORDS))
+    cache = DatasetCache(str(tmp_path / 'cache'))
+    first = api.Datasets({'app': str(path)}, cache).get('app')
+    second = api.Datasets({'app': str(path)}, cache).get('app')
+    assert len(parsed) == 1
+    assert second.fingerprint == first.fingerprint
+    _assert_same_store(second, first)
+
+
+def test_changed_source_is_a_miss(tmp_path, monkeypatch):
+    parsed = _parse_count(monkeypatch)
+    path = tmp_path / 'app.json'
+    path.write_text(json.dumps(RECORDS))
+    cache = DatasetCache(str(tmp_path / 'cache'))
+    first = api.Datasets({'app': str(path)}, cache).get('app')
+    path.write_text(json.dumps(RECORDS[:1]))
+    second = api.Datasets({'app': str(path)}, cache).get('app')
+    assert len(parsed) == 2
+    assert second.fingerprint != first.fingerprint
+    assert second.companies['Company'].tolist() == ['Acme']
+
+
+def test_least_recently_used_entries_are_evicted_by_size(tmp_path):
+    store = build_store(RECORDS)
+    cache = DatasetCache(str(tmp_path))
+    cache.put('a', store)
+    size = _directory_size(cache._path('a'))
+    cache.max_bytes = 2 * size
+    cache.put('b', store)
+    # Directory mtimes are the use times; set them apart rather than rely on the clock
+    os.utime(cache._path('a'), (1000, 1000))
+    os.utime(cache._path('b'), (2000, 2000))
+    assert cache.get('a') is not None
+    cache.put('c', store)
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(cache._path(key)) for key in 'ac']
+    cache.max_bytes = size - 1
+    cache.evict()
+    assert os.listdir(tmp_path) == []
+
+
+def test_corrupt_entries_are_discarded_and_rebuilt(tmp_path):
+    store = build_store(RECORDS)
+    cache = DatasetCache(str(tmp_path))
+    cache.put('truncated', store)
+    table = os.path.join(cache._path('truncated'), 'companies.arrow')
+    with open(table, 'r+b') as file:
+        file.truncate(os.path.getsize(table) // 2)
+    assert cache.get('truncated') is None
+    assert not os.path.exists(cache._path('truncated'))
+    cache.put('truncated', store)
+    _assert_same_store(cache.get('truncated'), store)
+
+    # An entry missing a table, as left by an interrupted copy
+    cache.put('partial', store)
+    os.remove(os.path.join(cache._path('partial'), 'texts.arrow'))
+    assert cache.get('partial') is None
+    assert not os.path.exists(cache._path('partial'))
@@ -0,0 +1,67 @@
+from itertools import combinations
+
+import pandas as pd
+import pytest
+
+from insights.cube import COMPANY_DIMENSIONS, DIMENSIONS, LABELS, UNKNOWN, CoverageCube
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+STORE = build_store(list(generate_companies(300, seed=7, n_countries=5, n_industries=4)) + [
+    {'Company': 'Bare', 'Fundraising History': {'Seed': {'year': 2020, 'amount': '5 USD'}}},
+])
+
+
+def _facts(store):
+    # One row per company, or per round joined to its company, keyed by the cube labels
+    companies = pd.DataFrame({LABELS[d]: read(store.companies).astype(object).fillna(UNKNOWN)
+                              for d, read in COMPANY_DIMENSIONS.items()})
+    companies['Total Funding'] = store.companies['Total Funding'].fillna(0)
+    rounds = companies.reindex(store.rounds['company_id']).reset_index()
+    rounds[LABELS['round']] = store.rounds['round'].astype(object).fillna(UNKNOWN).to_numpy()
+    rounds['Round Funding'] = store.rounds['amount_usd'].fillna(0).to_numpy()
+    return companies.reset_index(), rounds
+
+
+def _scan(store, by, filters):
+    companies, rounds = _facts(store)
+    use_rounds = 'round' in by or 'round' in filters
+    facts = rounds if use_rounds else companies
+    for dimension, values in filters.items():
+        facts = facts[facts[LABELS[dimension]].isin(values)]
+    keys = [LABELS[d] for d in by] or (lambda index: 0)
+    if use_rounds:
+        grouped = facts.groupby(keys).agg(
+            Rounds=('company_id', 'size'), **{'Round Funding': ('Round Funding', 'sum')},
+            Companies=('company_id', 'nunique'))
+    else:
+        grouped = facts.groupby(keys).agg(Companies=('company_id', 'size'),
+                                          **{'Total Funding': ('Total Funding', 'sum')})
+    return grouped if by else grouped.reset_index(drop=True)
+
+
+@pytest.mark.parametrize('by', [by for n in range(3) for by in combinations(DIMENSIONS, n)])
+def test_rollups_match_a_groupby(by):
+    result = CoverageCube(STORE.companies, STORE.rounds).query(list(by))
+    expected = _scan(STORE, by, {})
+    pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False,
+                                  check_index_type=False)
+
+
+@pytest.mark.parametrize('by, filters', [
+    (['industry'], {'country': ['United States', UNKNOWN]}),
+    (['round'], {'last_round_year': [2020, 2021]}),
+    (['country', 'founded'], {'round': ['Seed']}),
+    (['country'], {'industry': ['No such industry']}),
+])
+def test_drilldowns_match_a_groupby(by, filters):
+    result = CoverageCube(STORE.companies, STORE.rounds).query(by, filters)
+    expected = _scan(STORE, by, filters)
+    pd.testing.assert_frame_equal(result, expected[result.columns], check_dtype=False,
+                                  check_index_type=False)
+
+
+def test_year_labels_are_integers():
+    cube = CoverageCube(STORE.companies, STORE.rounds)
+    years = cube.query(['last_round_year']).index
+    assert UNKNOWN in years and all(isinstance(year, int) for year in years.drop(UNKNOWN))
@@ -0,0 +1,137 @@
+import copy
+import re
+
+import pandas as pd
+import pytest
+
+from insights.mergeable import DimensionTotals, InvestorTotals, LayeredDict
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+BASE = list(generate_companies(300, seed=5))
+
+
+def _domain(website):
+    if not website:
+        return None
+    host = re.sub(r'^[a-z][a-z0-9+.-]*://', '', website.strip().lower()).removeprefix('www.')
+    return host.split('/')[0]
+
+
+def _upsert(records, delta):
+    # Reference semantics of apply_delta on raw records: match by domain, else
+    # by name; non-empty fields replace, rounds replace rounds of the same name
+    records = copy.deepcopy(records)
+    for change in delta:
+        domain = _domain(change.get('Website'))
+        matches = [i for i, record in enumerate(records)
+                   if domain and _domain(record.get('Website')) == domain]
+        if not matches:
+            matches = [i for i, record in enumerate(records)
+                       if record.get('Company') == change.get('Company')]
+        if not matches:
+            records.append(copy.deepcopy(change))
+            continue
+        record = records[matches[-1]]
+        history = {**record.get('Fundraising History', {}), **change.get('Fundraising History', {})}
+        record.update({key: value for key, value in change.items() if value is not None})
+        record['Fundraising History'] = history
+    return records
+
+
+DELTA = [
+    # Field update matched by a differently spelled website
+    {'Company': 'Renamed 3', 'Website': 'http://company3.com', 'Industry': 'Quantum Computing'},
+    # New round and a replaced round, matched by name, with the new total
+    {'Company': 'Company 7', 'Total Funding': '99000000 USD', 'Fundraising History': {
+        'round1': {'year': 2024, 'amount': '9000000 USD', 'by': 'Investor 1, New Fund'},
+        'Series Z': {'year': 2025, 'amount': '80000000 USD', 'by': 'New Fund'}}},
+    # A new company, then a row with only its name that must join it
+    {'Company': 'Gamma', 'Website': 'gamma.com', 'Country HQ': 'India', 'Total Funding': '1000 USD',
+     'Overview': 'Gamma overview',
+     'Fundraising History': {'Seed': {'year': 2023, 'amount': '1000 USD'}}},
+    {'Company': 'Gamma', 'Industry': 'AI', 'Overview': None},
+]
+
+
+def _rows(frame):
+    frame = frame[sorted(frame.columns)].astype(object)
+    return frame.where(frame.notna(), None)
+
+
+def _rounds(store):
+    # A rebuild dates the latest round of a company by its Last Round Date, which
+    # the delta rounds of a company move, so round dates are not compared
+    rounds = store.rounds.drop(columns='date')
+    return _rows(rounds.sort_values(['company_id', 'round'], ignore_index=True))
+
+
+def _assert_same_store(updated, rebuilt):
+    pd.testing.assert_frame_equal(_rows(updated.companies), _rows(rebuilt.companies))
+    pd.testing.assert_frame_equal(_rounds(updated), _rounds(rebuilt))
+    pd.testing.assert_frame_equal(_rows(updated.with_texts()), _rows(rebuilt.with_texts()))
+    expected = DimensionTotals.from_store(rebuilt)
+    for dimension in expected.groups:
+        pd.testing.assert_frame_equal(updated.dimension_totals.totals(dimension),
+                                      expected.totals(dimension))
+    investors = [totals.frame().sort_values('Investor', ignore_index=True)
+                 for totals in (updated.investor_totals, InvestorTotals.from_store(rebuilt))]
+    pd.testing.assert_frame_equal(*investors)
+
+
+def test_apply_delta_matches_a_rebuild():
+    base = build_store(BASE)
+    base.dimension_totals, base.investor_totals, base.company_lookup
+    updated = base.apply_delta(build_store(DELTA))
+    assert updated.companies.index.is_unique
+    assert len(updated.companies) == len(BASE) + 1
+    _assert_same_store(updated, build_store(_upsert(BASE, DELTA)))
+
+
+def test_deltas_chain_and_leave_earlier_stores_intact():
+    base = build_store(BASE)
+    before = base.investor_totals.frame()
+    first = base.apply_delta(build_store(DELTA[:2]))
+    second = first.apply_delta(build_store(DELTA[2:]))
+    _assert_same_store(second, build_store(_upsert(_upsert(BASE, DELTA[:2]), DELTA[2:])))
+    _assert_same_store(first, build_store(_upsert(BASE, DELTA[:2])))
+    pd.testing.assert_frame_equal(base.investor_totals.frame(), before)
+    assert 'gamma.com' not in base.company_lookup[0] and 'gamma.com' in second.company_lookup[0]
+
+
+def test_rounds_without_a_total_move_total_funding():
+    base = build_store([{
+        'Company': 'Acme', 'Country HQ': 'India', 'Total Funding': '7000000 USD',
+        'Fundraising History': {'Seed': {'year': 2020, 'amount': '2000000 USD'},
+                                'Series A': {'year': 2022, 'amount': '5000000 USD'}}}])
+    updated = base.apply_delta(build_store([{'Company': 'Acme', 'Fundraising History': {
+        'Series A': {'year': 2022, 'amount': '6000000 USD'},
+        'Series Z': {'year': 2025, 'amount': '500000000 USD'}}}]))
+    assert updated.companies['Total Funding'].tolist() == [508000000.0]
+    assert updated.group_totals('country')['sum'].sum() == 508000000.0
+
+    resent = base.apply_delta(build_store([{
+        'Company': 'Acme', 'Total Funding': '1 USD',
+        'Fundraising History': {'Series Z': {'year': 2025, 'amount': '500000000 USD'}}}]))
+    assert resent.companies['Total Funding'].tolist() == [1.0]
+
+
+def test_layered_dict_copies_on_write():
+    parent = LayeredDict({i: i for i in range(100)})
+    children = []
+    for step in range(20):
+        child = (children[-1] if children else parent).child()
+        child[1000 + step] = step
+        del child[step]
+        child[50] = -step
+        children.append(child)
+
+    assert dict(parent) == {i: i for i in range(100)}
+    last = children[-1]
+    assert len(last) == 100
+    assert 0 not in last and 19 not in last and last[50] == -19 and last[1019] == 19
+    assert dict(children[4]) == {**{i: i for i in range(5, 100)}, 50: -4,
+                                 **{1000 + s: s for s in range(5)}}
+    with pytest.raises(KeyError):
+        del last[0]
+    assert len(last._layers) <= 8
@@ -0,0 +1,28 @@
+import io
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from insights import export
+from insights.memo import LRUCache
+
+
+def test_cache_is_bounded_by_bytes():
+    cache = LRUCache(10, max_bytes=10)
+    for key in 'abc':
+        cache.put(key, b'1234')
+    assert cache.get('a') is None and cache.get('c') == b'1234' and cache.nbytes == 8
+    cache.put('c', b'1')
+    assert cache.nbytes == 5
+    cache.put('big', b'x' * 11)
+    assert cache.get('big') is None and cache.nbytes == 5
+
+
+def test_large_exports_are_not_kept(monkeypatch):
+    monkeypatch.setattr(export, '_exports', LRUCache(16, max_bytes=1000))
+    frame = pd.DataFrame({'a': range(1000), 'b': ['x'] * 1000})
+    data = export.prepare_export('big', 'key', frame, 'Parquet')
+    assert pq.read_table(io.BytesIO(data)).to_pandas().equals(frame)
+    assert export.cached_export('big', 'key', 'Parquet') is None
+    small = export.prepare_export('small', 'key', frame.head(3), 'CSV')
+    assert export.cached_export('small', 'key', 'CSV') == small
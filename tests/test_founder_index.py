@@ -0,0 +1,83 @@
+import pytest
+
+from insights.aggregates import (
+    founder_companies,
+    founder_counts,
+    founder_names,
+    founder_records,
+)
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+STORE = build_store(list(generate_companies(300, seed=7)) + [
+    # Spellings of one founder that only differ in case and spacing, and missing names
+    {'Company': 'Spaced', 'Country HQ': 'Estonia', 'Total Funding': '2000000 USD',
+     'Founder': {'name': 'Louis  Hur', 'designation': 'CEO'}},
+    {'Company': 'Lower', 'Country HQ': 'Estonia', 'Founder': {'name': ' louis hur'}},
+    {'Company': 'Blank', 'Country HQ': 'Estonia', 'Founder': {'name': '  ', 'email': 'a@b.c'}},
+    {'Company': 'Nameless', 'Country HQ': 'Estonia'},
+])
+COUNTRY = STORE.companies['Country HQ'].value_counts().index[0]
+VIEWS = {
+    'full': lambda store: store,
+    'above': lambda store: store.above(5000000),
+    'above nothing': lambda store: store.above(1e15),
+    'country': lambda store: store.matching(countries=[COUNTRY, 'Estonia']),
+    'above and country': lambda store: store.above(1000000).matching(countries=['Estonia']),
+    'search': lambda store: store.search(COUNTRY),
+}
+
+
+def _key(name):
+    return (' '.join(name.casefold().split()) or None) if isinstance(name, str) else None
+
+
+def _spellings():
+    # Normalized name -> first spelling in the full store, from a scan in company order
+    spellings = {}
+    for name in STORE.companies['Founder']:
+        if _key(name):
+            spellings.setdefault(_key(name), name)
+    return spellings
+
+
+@pytest.fixture(params=list(VIEWS))
+def view(request):
+    return VIEWS[request.param](STORE)
+
+
+def test_founder_counts_match_a_scan(view):
+    spellings = _spellings()
+    expected = {}
+    for name in view.companies['Founder']:
+        display = spellings.get(_key(name), 'Unknown')
+        expected[display] = expected.get(display, 0) + 1
+    counts = founder_counts(view)
+    assert dict(zip(counts['Founder'], counts['Number of Companies'])) == expected
+
+
+def test_founder_names_match_a_scan(view):
+    spellings = _spellings()
+    present = {spellings[_key(name)] for name in view.companies['Founder'] if _key(name)}
+    assert founder_names(view) == sorted(present, key=str.casefold)
+
+
+@pytest.mark.parametrize('name', ['Louis Hur', 'LOUIS   HUR', 'Founder 3', '', '  ', None,
+                                  'Nobody'])
+def test_founder_companies_match_a_scan(view, name):
+    expected = [company_id for company_id, founder in view.companies['Founder'].items()
+                if _key(name) and _key(founder) == _key(name)]
+    assert sorted(founder_companies(view, name).index) == expected
+
+
+def test_founder_records_match_a_scan(view):
+    columns = ['Founder', 'Founder Designation', 'Founder Email', 'Founder LinkedIn']
+    expected = view.companies.index[view.companies[columns].notna().any(axis=1)]
+    assert founder_records(view).index.tolist() == expected.tolist()
+
+
+def test_spellings_resolve_together():
+    index = STORE.founder_index
+    assert index.names[_key('Louis Hur')] == 'Louis  Hur'
+    ids = STORE.companies.index[STORE.companies['Company'].isin(['Spaced', 'Lower'])]
+    assert index.lookup('louis HUR').tolist() == ids.tolist()
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from insights.funding_index import DIMENSIONS, FundingIndex
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+STORE = build_store(list(generate_companies(400, seed=11)) + [
+    {'Company': 'Unfunded'},
+    {'Company': 'Tied', 'Total Funding': '1000000 USD', 'Country HQ': 'Estonia'},
+    {'Company': 'Tied too', 'Total Funding': '1000000 USD', 'Country HQ': 'Estonia'},
+])
+THRESHOLDS = [-1, 0, 1, 999999, 1000000, 1000001, 5e7, 1e12]
+
+
+def _scan(store, dimension, min_funding):
+    # Totals of a dimension over a full scan of the companies at or above the threshold
+    funding = store.companies['Total Funding'].fillna(0)
+    subset = store.select((funding >= min_funding).to_numpy())
+    keys, values = DIMENSIONS[dimension](subset)
+    totals = pd.DataFrame({'key': keys.astype(object), 'value': values.astype('float64')})
+    totals = totals.dropna(subset=['key'])
+    totals = totals.groupby('key').agg(rows=('value', 'size'), count=('value', 'count'),
+                                       sum=('value', 'sum'))
+    return totals.rename_axis(keys.name)
+
+
+@pytest.mark.parametrize('min_funding', THRESHOLDS)
+def test_threshold_matches_a_scan(min_funding):
+    index = FundingIndex(STORE)
+    funding = STORE.companies['Total Funding'].fillna(0)
+    expected = np.flatnonzero((funding >= min_funding).to_numpy())
+    np.testing.assert_array_equal(index.companies_at_least(min_funding), expected)
+    rounds = STORE.rounds['company_id'].isin(STORE.companies.index[expected])
+    np.testing.assert_array_equal(index.rounds_at_least(min_funding),
+                                  np.flatnonzero(rounds.to_numpy()))
+
+
+@pytest.mark.parametrize('dimension', list(DIMENSIONS))
+@pytest.mark.parametrize('min_funding', THRESHOLDS)
+def test_group_totals_match_a_scan(dimension, min_funding):
+    totals = FundingIndex(STORE).group_totals(dimension, min_funding)
+    totals.index = totals.index.astype(object)
+    expected = _scan(STORE, dimension, min_funding)
+    pd.testing.assert_frame_equal(totals, expected, check_dtype=False, check_index_type=False)
+
+
+def test_above_uses_the_index():
+    above = STORE.above(1000000)
+    assert {'Tied', 'Tied too'} <= set(above.companies['Company'])
+    assert 'Unfunded' not in set(above.companies['Company'])
+    assert above.group_totals('country').loc['Estonia', 'rows'] >= 2
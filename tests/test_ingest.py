@@ -0,0 +1,57 @@
+import io
+import json
+
+import pytest
+
+from insights.aggregates import INSIGHTS, insight_table
+from insights.ingest import iter_records, read_store
+from insights.store import build_store
+
+RECORDS = [
+    {'Company': 'Acme', 'Overview': 'Brackets ] and [ in text, "quoted" and \\ escaped',
+     'Total Funding': '5 USD'},
+    {'Company': 'Ünïcode Ltd', 'Overview': '日本語 ' * 20,
+     'Fundraising History': {'Seed': {'year': 2020}}},
+    {'Company': 'Nested', 'Founder': {'name': 'A', 'shortBio': '{"not": "a record"}'}},
+]
+
+
+def _export(records, indent=None):
+    return json.dumps(records, ensure_ascii=False, indent=indent).encode('utf-8')
+
+
+@pytest.mark.parametrize('chunk_bytes', [1, 2, 3, 7, 64, 1 << 20])
+@pytest.mark.parametrize('indent', [None, 2])
+def test_iter_records_across_chunk_boundaries(chunk_bytes, indent):
+    # Records, multi-byte characters and separators split at every possible offset
+    data = _export(RECORDS, indent)
+    assert list(iter_records(io.BytesIO(data), chunk_bytes=chunk_bytes)) == RECORDS
+
+
+def test_iter_records_reads_text_and_bom():
+    assert list(iter_records(io.StringIO(json.dumps(RECORDS)), chunk_bytes=5)) == RECORDS
+    data = b'\xef\xbb\xbf' + _export(RECORDS)
+    assert list(iter_records(io.BytesIO(data), chunk_bytes=4)) == RECORDS
+
+
+@pytest.mark.parametrize('data', [b'{"Company": "Acme"}', b'[{"Company": "Acme"}',
+                                  b'[{"Company": '])
+def test_iter_records_rejects_malformed_exports(data):
+    with pytest.raises(ValueError):
+        list(iter_records(io.BytesIO(data), chunk_bytes=4))
+
+
+@pytest.mark.parametrize('data', [b'[]', b' [ ] ', b'\xef\xbb\xbf[]'])
+def test_empty_export_gives_empty_store(data):
+    store = read_store(io.BytesIO(data))
+    assert store.companies.empty and store.rounds.empty
+    for name, compute in INSIGHTS.items():
+        assert insight_table(compute(store)).empty, name
+
+
+def test_batches_match_a_single_pass():
+    records = RECORDS * 5
+    whole = build_store(records)
+    batched = read_store(io.BytesIO(_export(records)), batch_size=2)
+    assert batched.companies.equals(whole.companies)
+    assert batched.rounds.equals(whole.rounds)
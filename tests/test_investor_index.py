@@ -0,0 +1,98 @@
+from collections import Counter
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+STORE = build_store(list(generate_companies(300, seed=5, n_investors=40)) + [
+    # Repeated, padded and empty names, a round without investors and an unfunded company
+    {'Company': 'Repeats', 'Country HQ': 'Estonia', 'Total Funding': '2000000 USD',
+     'Fundraising History': {'Seed': {'year': 2020, 'amount': '1000000 USD',
+                                      'by': 'Investor 1,  Investor 1 , , Investor 2'},
+                             'A': {'year': 2021, 'amount': 'lots', 'by': 'Investor 1'},
+                             'B': {'year': 2022, 'amount': '1000000 USD'}}},
+    {'Company': 'Unfunded', 'Country HQ': 'Estonia',
+     'Fundraising History': {'Seed': {'year': 2020, 'by': 'Investor 2, Solo'}}},
+])
+COUNTRY = STORE.companies['Country HQ'].value_counts().index[0]
+INDUSTRY = STORE.companies['Industry'].value_counts().index[0]
+VIEWS = {
+    'full': lambda store: store,
+    'above': lambda store: store.above(5000000),
+    'above nothing': lambda store: store.above(1e15),
+    'country': lambda store: store.matching(countries=[COUNTRY, 'Estonia']),
+    'above and industry': lambda store: store.above(1000000).matching(industries=[INDUSTRY]),
+    'search': lambda store: store.search(COUNTRY),
+}
+
+
+def _entries(view):
+    # (round id, company id, amount, investor) once per investor of each round of the view
+    entries = []
+    for round_id, row in view.rounds.iterrows():
+        names = {name.strip() for name in str(row['investors'] or '').split(',')} - {''}
+        entries += [(round_id, row['company_id'], row['amount_usd'], name) for name in names]
+    return pd.DataFrame(entries, columns=['round', 'company', 'amount', 'investor'])
+
+
+@pytest.fixture(params=list(VIEWS))
+def view(request):
+    return VIEWS[request.param](STORE)
+
+
+def test_unique_investor_counts_match_a_scan(view):
+    counts = STORE.investor_index.unique_investor_counts(view)
+    entries = _entries(view)
+    expected = entries.groupby('company')['investor'].nunique()
+    expected = expected.reindex(view.companies.index, fill_value=0)
+    assert counts.to_dict() == expected.to_dict()
+
+
+def test_top_investors_match_a_scan(view):
+    table = STORE.investor_index.top_investors(view)
+    entries = _entries(view)
+    expected = {
+        investor: (len(group), group['company'].nunique(), group['amount'].fillna(0).sum())
+        for investor, group in entries.groupby('investor')
+    }
+    actual = {row['Investor']: (row['Deals'], row['Companies'], row['Round Capital (USD)'])
+              for _, row in table.iterrows()}
+    assert actual.keys() == expected.keys()
+    for investor, (deals, companies, capital) in expected.items():
+        assert actual[investor][:2] == (deals, companies)
+        assert actual[investor][2] == pytest.approx(capital)
+    order = list(zip(table['Deals'], table['Round Capital (USD)']))
+    assert order == sorted(order, reverse=True)
+
+
+def test_co_investor_pairs_match_a_scan(view):
+    table = STORE.investor_index.co_investor_pairs(view)
+    expected = Counter()
+    for _, group in _entries(view).groupby('round'):
+        expected.update(frozenset(pair) for pair in combinations(group['investor'], 2))
+    actual = {frozenset(pair): shared for *pair, shared in table.itertuples(index=False)}
+    assert actual == dict(expected)
+    assert table['Shared Rounds'].is_monotonic_decreasing
+
+
+def test_portfolios_match_a_scan(view):
+    index = STORE.investor_index
+    entries = _entries(view)
+    portfolios = entries.groupby('investor')['company'].agg(set)
+    for investor in ['Investor 1', 'Investor 2', 'Solo', 'Nobody']:
+        expected = portfolios.get(investor, set())
+        assert set(index.portfolio(view, investor)) == expected
+        overlap = index.portfolio_overlap(view, investor, 'Investor 1')
+        assert list(overlap) == sorted(expected & portfolios.get('Investor 1', set()))
+
+
+def test_interned_names_are_trimmed_and_unique():
+    names = STORE.investors['investor']
+    assert names.is_unique and (names == names.str.strip()).all() and (names != '').all()
+    rounds = STORE.rounds[STORE.rounds['company_id'] == STORE.companies.index[-2]]
+    deals = STORE.round_investors[STORE.round_investors['round_id'].isin(rounds.index)]
+    assert np.bincount(deals['round_id'] - rounds.index[0]).tolist() == [2, 1]
@@ -0,0 +1,70 @@
+import pytest
+
+from insights.aggregates import industry_count
+from insights.memo import memoize
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+RECORDS = list(generate_companies(200, seed=4))
+STORE = build_store(RECORDS)
+COUNTRIES = list(STORE.companies['Country HQ'].value_counts().index[:2])
+INDUSTRY = STORE.companies['Industry'].value_counts().index[0]
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def companies(calls):
+    @memoize()
+    def companies(store, *params):
+        calls.append((store.key, params))
+        return sorted(store.companies['Company'])
+    return companies
+
+
+def test_equal_views_hit(companies, calls):
+    views = [
+        lambda: STORE.above(1000000),
+        lambda: STORE.matching(countries=COUNTRIES),
+        lambda: STORE.above(1000000).matching(countries=COUNTRIES, industries=[INDUSTRY]),
+        lambda: STORE.search('platform'),
+    ]
+    for view in views:
+        assert companies(view()) is companies(view())
+    assert len(calls) == len(views)
+    # Filters are normalized, so the same selection in another order is the same view
+    assert companies(STORE.matching(countries=COUNTRIES[::-1])) is companies(
+        STORE.matching(countries=COUNTRIES))
+    assert companies(STORE.search('  PLATFORM ')) is companies(STORE.search('platform'))
+    assert len(calls) == len(views)
+
+
+def test_different_views_miss(companies, calls):
+    views = [STORE, STORE.above(0), STORE.above(1000000), STORE.above(2000000),
+             STORE.matching(countries=COUNTRIES[:1]), STORE.matching(countries=COUNTRIES),
+             STORE.above(1000000).matching(countries=COUNTRIES[:1])]
+    results = [companies(view) for view in views]
+    assert len({key for key, _ in calls}) == len(calls) == len(views)
+    for view, result in zip(views, results):
+        assert result == sorted(view.companies['Company'])
+    # A lower threshold on a threshold view is the same view
+    assert STORE.above(1000000).above(500000).key == STORE.above(1000000).key
+
+
+def test_params_and_datasets_are_part_of_the_key(companies, calls):
+    companies(STORE, 'a')
+    companies(STORE, 'b')
+    companies(STORE, 'a')
+    # The same records loaded again are a new dataset unless given its fingerprint
+    companies(build_store(RECORDS))
+    assert [params for _, params in calls] == [('a',), ('b',), ()]
+
+
+def test_memoized_aggregate_matches_the_view():
+    for view in (STORE, STORE.above(5000000), STORE.matching(countries=COUNTRIES)):
+        expected = view.companies['Industry'].astype(object).value_counts()
+        assert industry_count(view).to_dict() == expected.to_dict()
+        assert industry_count(view) is industry_count(view)
@@ -0,0 +1,48 @@
+import json
+
+from insights.ingest import read_shards
+from insights.store import build_store, merge_stores
+
+FIRST = [
+    {'Company': 'Acme', 'Website': 'acme.com', 'Overview': 'old', 'Fundraising History': {
+        'Seed': {'year': 2020, 'amount': '1 USD'}}},
+    {'Company': 'Nameless site'},
+    {'Company': 'Beta', 'Fundraising History': {'Seed': {'year': 2021, 'amount': '2 USD'}}},
+]
+SECOND = [
+    {'Company': 'Acme Inc', 'Website': 'https://www.ACME.com/about', 'Overview': 'new',
+     'Fundraising History': {'Series A': {'year': 2022, 'amount': '3 USD'}}},
+    {'Company': ' beta '},
+    {'Company': 'Gamma'},
+]
+
+
+def _summary(store):
+    rounds = store.rounds.groupby('company_id')['round'].agg(list)
+    return [(row['Company'], store.text('Overview', [company_id]).iloc[0],
+             rounds.get(company_id, []))
+            for company_id, row in store.companies.iterrows()]
+
+
+def test_merge_keeps_the_last_copy_and_its_rounds():
+    merged = merge_stores([build_store(FIRST), build_store(SECOND)])
+    assert _summary(merged) == [
+        ('Nameless site', None, []),
+        ('Acme Inc', 'new', ['Series A']),
+        (' beta ', None, []),
+        ('Gamma', None, []),
+    ]
+    assert list(merged.companies.index) == list(range(4))
+    assert merged.rounds['company_id'].dtype == 'int64'
+
+
+def test_merge_drops_repeats_within_a_shard():
+    merged = merge_stores([build_store(FIRST + FIRST)])
+    assert _summary(merged) == _summary(build_store(FIRST))
+
+
+def test_read_shards_merges_in_order():
+    shards = [json.dumps(records).encode('utf-8') for records in (FIRST, SECOND)]
+    parsed = read_shards(shards, workers=2)
+    merged = merge_stores([build_store(FIRST), build_store(SECOND)])
+    assert parsed.companies.equals(merged.companies) and parsed.rounds.equals(merged.rounds)
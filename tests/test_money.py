@@ -0,0 +1,49 @@
+import warnings
+
+import numpy as np
+
+from insights.money import parse_money
+from insights.store import build_store
+
+
+def _parsed(values):
+    amount, currency = parse_money(values)
+    return amount.tolist(), currency.where(currency.notna(), None).tolist()
+
+
+def test_numbers_only():
+    assert _parsed([1000000, 2.5]) == ([1000000.0, 2.5], ['USD', 'USD'])
+
+
+def test_strings_only():
+    assert _parsed(['7000000 USD', '1,500.5 eur', '42']) == ([7000000.0, 1500.5, 42.0],
+                                                            ['USD', 'EUR', 'USD'])
+
+
+def test_mixed_numbers_and_strings():
+    amount, currency = _parsed([5, '6 GBP', None, 7.5])
+    assert amount[:2] == [5.0, 6.0] and np.isnan(amount[2]) and amount[3] == 7.5
+    assert currency == ['USD', 'GBP', None, 'USD']
+
+
+def test_currency_symbols():
+    assert _parsed(['$5', '€3.5', '£ 1,000']) == ([5.0, 3.5, 1000.0], ['USD', 'EUR', 'GBP'])
+
+
+def test_junk_becomes_null():
+    amount, currency = _parsed(['N/A', '', 'lots', '5 USD extra', None, {'amount': 5}])
+    assert all(np.isnan(amount)) and currency == [None] * 6
+
+
+def test_numeric_totals_load():
+    store = build_store([{'Company': 'Acme', 'Total Funding': 1000000},
+                         {'Company': 'Beta', 'Total Funding': 2000000,
+                          'Fundraising History': {'Seed': {'year': 2020, 'amount': 500000}}}])
+    assert store.companies['Total Funding'].tolist() == [1000000.0, 2000000.0]
+    assert store.rounds['amount_usd'].tolist() == [500000.0]
+
+
+def test_no_downcasting_warning():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', FutureWarning)
+        assert _parsed(['5', '6 usd', '$7']) == ([5.0, 6.0, 7.0], ['USD', 'USD', 'USD'])
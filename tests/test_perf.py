@@ -0,0 +1,43 @@
+import threading
+import tracemalloc
+
+from insights.perf import stage, tracing
+
+MB = 1024 * 1024
+
+
+def test_nested_stage_peaks_reach_the_outer_stage():
+    with tracing('nested') as trace:
+        with stage('outer'):
+            with stage('inner'):
+                block = bytearray(8 * MB)
+                del block
+    outer, inner = trace.stages
+    assert inner['peak_mb'] >= 8 and outer['peak_mb'] >= inner['peak_mb']
+    assert not tracemalloc.is_tracing()
+
+
+def test_overlapping_traces_measure_memory_one_at_a_time():
+    opened, release = threading.Event(), threading.Event()
+    traces = []
+
+    def hold():
+        with tracing('first') as trace:
+            traces.append(trace)
+            opened.set()
+            release.wait(10)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    opened.wait(10)
+    with tracing('second') as second:
+        with stage('work'):
+            pass
+    release.set()
+    thread.join()
+
+    assert traces[0].memory and not second.memory
+    assert second.stages[0]['seconds'] >= 0 and second.stages[0]['peak_mb'] is None
+    with tracing('third') as third:
+        pass
+    assert third.memory and not tracemalloc.is_tracing()
@@ -0,0 +1,55 @@
+import pandas as pd
+import pytest
+
+from insights.aggregates import (
+    founder_counts,
+    funding_timeline,
+    market_coverage,
+    valuation_points,
+)
+from insights.reduce import render_mode, sample_points, top_columns, top_k
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+STORE = build_store(list(generate_companies(600, seed=9)))
+FOUNDERS = len(founder_counts(STORE))
+COUNTRIES = len(funding_timeline(STORE, 'Y', 'country').columns)
+
+
+@pytest.mark.parametrize('k', [1, 5, 30, FOUNDERS - 2, FOUNDERS - 1, FOUNDERS, 1000])
+def test_top_k_keeps_the_total_of_the_aggregation(k):
+    counts = founder_counts(STORE)
+    chart = top_k(counts, 'Founder', 'Number of Companies', k=k)
+    assert chart['Number of Companies'].sum() == counts['Number of Companies'].sum()
+    assert len(chart) == min(len(counts), k + 1)
+    if len(counts) > k + 1:
+        head = counts.nlargest(k, 'Number of Companies')
+        assert chart['Number of Companies'].head(k).tolist() == head['Number of Companies'].tolist()
+        assert chart['Founder'].iloc[-1] == f'Other ({len(counts) - k})'
+    else:
+        assert chart.equals(counts[['Founder', 'Number of Companies']])
+
+
+def test_top_k_of_market_coverage():
+    countries = tuple(STORE.companies['Country HQ'].dropna().unique())
+    coverage = market_coverage(STORE, countries)
+    chart = top_k(coverage, 'Country', 'Number of Companies', k=5)
+    assert chart['Number of Companies'].sum() == len(STORE.companies.dropna(subset=['Country HQ']))
+
+
+@pytest.mark.parametrize('k', [1, 3, 10, COUNTRIES - 2, COUNTRIES - 1, 100])
+def test_top_columns_keep_every_bucket_total(k):
+    timeline = funding_timeline(STORE, 'Y', 'country')
+    chart = top_columns(timeline, k=k)
+    pd.testing.assert_series_equal(chart.sum(axis=1), timeline.sum(axis=1), check_dtype=False)
+    assert len(chart.columns) == min(len(timeline.columns), k + 1)
+
+
+def test_sampled_points_are_stable_rows_of_the_aggregation():
+    points = valuation_points(STORE)
+    sample = sample_points(points, max_points=100)
+    assert len(sample) == 100 and sample.index.is_monotonic_increasing
+    assert sample.equals(points.loc[sample.index])
+    assert sample.equals(sample_points(points, max_points=100))
+    assert sample_points(points, max_points=len(points)) is points
+    assert (render_mode(1000), render_mode(1001)) == ('svg', 'webgl')
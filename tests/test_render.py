@@ -0,0 +1,45 @@
+import matplotlib.pyplot as plt
+import pytest
+
+from insights import render
+from insights.memo import LRUCache
+
+
+@pytest.fixture
+def shown(monkeypatch):
+    # The PNG bytes handed to Streamlit, with a fresh image cache
+    images = []
+    monkeypatch.setattr(render, '_images', LRUCache(render.FIGURE_CACHE_SIZE))
+    monkeypatch.setattr(render.st, 'image', lambda image, **kwargs: images.append(image))
+    return images
+
+
+def _counting_draw(draws):
+    def draw(fig):
+        draws.append(fig)
+        fig.subplots().bar(['a', 'b'], [1, 2])
+    return draw
+
+
+def test_cache_hit_returns_the_same_bytes(shown):
+    draws = []
+    for _ in range(3):
+        render.render_figure('bars', 'data', (), _counting_draw(draws), (4, 3))
+    assert len(draws) == 1
+    assert shown[0].startswith(b'\x89PNG') and shown[0] is shown[1] is shown[2]
+
+
+def test_new_data_or_params_redraw(shown):
+    draws = []
+    for data_key, params in [('data', ()), ('other', ()), ('data', (5,)), ('data', ())]:
+        render.render_figure('bars', data_key, params, _counting_draw(draws), (4, 3))
+    assert len(draws) == 3
+    assert shown[3] is shown[0]
+
+
+def test_figures_are_released():
+    draws = []
+    image = render.rasterize(_counting_draw(draws), (4, 3))
+    assert image.startswith(b'\x89PNG')
+    assert draws[0].axes == []
+    assert plt.get_fignums() == []
@@ -0,0 +1,46 @@
+import numpy as np
+
+from insights.search import FIELDS, SearchIndex, tokenize
+from insights.store import build_store
+
+STORE = build_store([
+    {'Company': 'Acme Robotics', 'Industry': 'Robotics', 'Overview': 'Warehouse robots'},
+    {'Company': 'Robo Bank', 'Industry': 'FinTech', 'Overview': 'Banking for robotics startups'},
+    {'Company': 'Ünïcode Labs', 'Industry': 'AI',
+     'Founder': {'name': 'A', 'shortBio': 'Former ROBOTICS lead'}},
+    {'Company': 'Plain', 'Industry': None},
+])
+
+
+def _matches(store, terms):
+    # Companies where every term starts some word of a searchable field
+    words = {}
+    for field in FIELDS:
+        values = store.companies[field] if field in store.companies else store.text(field)
+        words[field] = values.astype(object).map(tokenize)
+    return [company_id for company_id in store.companies.index
+            if all(any(word.startswith(term) for field in words
+                       for word in words[field][company_id])
+                   for term in terms)]
+
+
+def test_matches_every_term_by_prefix():
+    index = SearchIndex(STORE)
+    for query in ['robot', 'robotics', 'ROBO bank', 'ünï', 'warehouse robots', 'labs lead', 'x',
+                  'plain']:
+        terms = tokenize(query)
+        scores = index.scores(terms)
+        assert list(scores.index[scores.notna()]) == _matches(STORE, terms), query
+
+
+def test_names_rank_above_mentions():
+    scores = SearchIndex(STORE).scores(['robotics'])
+    assert scores[0] > scores[1] > 0 and scores[0] > scores[2]
+    assert np.isnan(scores[3])
+
+
+def test_search_view_and_empty_store():
+    assert list(STORE.search('robo').companies['Company']) == [
+        'Acme Robotics', 'Robo Bank', 'Ünïcode Labs']
+    assert STORE.search('  ') is STORE
+    assert SearchIndex(build_store([])).scores(['a']).empty
@@ -0,0 +1,23 @@
+import pytest
+
+from insights.store import build_store
+from insights.synthetic import ROUND_NAMES, generate_companies
+
+
+@pytest.mark.parametrize('schema', ['curated', 'tracxn'])
+def test_more_rounds_than_named_ones(schema):
+    records = generate_companies(200, schema, seed=4, max_rounds=30, round_skew=0.2)
+    store = build_store(list(records))
+    assert store.rounds.groupby('company_id').size().max() == 30
+    assert store.rounds['amount_usd'].gt(0).all()
+
+
+def test_rounds_past_the_named_ones_are_numbered():
+    records = generate_companies(200, 'tracxn', seed=4, max_rounds=8, round_skew=0)
+    stages = {record['stage'] for record in records}
+    assert stages == {*ROUND_NAMES, 'Round 6', 'Round 7'}
+
+
+def test_max_rounds_must_be_positive():
+    with pytest.raises(ValueError):
+        list(generate_companies(1, max_rounds=0))
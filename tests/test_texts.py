@@ -0,0 +1,32 @@
+import pandas as pd
+
+from insights.texts import TEXT_COLUMNS, TextStore
+
+
+def _texts(rows):
+    return TextStore.from_frame(pd.DataFrame(rows, columns=TEXT_COLUMNS))
+
+
+def _rows(store):
+    frame = store.frame(range(len(store))).astype(object)
+    return frame.where(frame.notna(), None).values.tolist()
+
+
+def test_upsert_replaces_appends_and_keeps_missing():
+    stored = _texts([['a', 'bio a'], ['b', None], ['c', 'bio c']])
+    updated = stored.upsert([1, 3, 2], _texts([['b2', 'bio b'], ['d', None], [None, None]]))
+    assert _rows(updated) == [['a', 'bio a'], ['b2', 'bio b'], ['c', 'bio c'], ['d', None]]
+    assert _rows(stored) == [['a', 'bio a'], ['b', None], ['c', 'bio c']]
+
+
+def test_upsert_repeated_ids_keep_the_last_text():
+    stored = _texts([['a', 'bio a']])
+    updated = stored.upsert([0, 0, 1, 1],
+                            _texts([['x', 'bio x'], [None, 'bio y'], ['n', None], [None, 'bio n']]))
+    assert _rows(updated) == [['x', 'bio y'], ['n', 'bio n']]
+
+
+def test_upsert_into_an_empty_store():
+    updated = TextStore().upsert([0, 1], _texts([['a', None], ['b', 'bio b']]))
+    assert _rows(updated) == [['a', None], ['b', 'bio b']]
+    assert len(TextStore().upsert([], TextStore())) == 0
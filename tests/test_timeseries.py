@@ -0,0 +1,61 @@
+import pandas as pd
+import pytest
+
+from insights.store import build_store
+from insights.synthetic import generate_companies
+from insights.timeseries import GROUPS, UNKNOWN, RoundTimeSeries, round_dates
+
+STORE = build_store(list(generate_companies(300, seed=3)) + [
+    {'Company': 'No country', 'Fundraising History': {'Seed': {'year': 2031, 'amount': '5 USD'}}},
+    {'Company': 'Undated', 'Country HQ': 'Japan',
+     'Fundraising History': {'Seed': {'amount': '7 USD'}}},
+])
+
+
+def _scan(store, freq, by, measure):
+    # Bucket totals of every dated round from a groupby over the rounds
+    buckets = round_dates(store.rounds).dt.to_period(freq)
+    rounds = store.rounds.assign(bucket=buckets).dropna(subset=['bucket'])
+    if by is None:
+        groups = pd.Series('All', index=rounds.index)
+    else:
+        groups = store.companies[GROUPS[by]].astype(object)
+        groups = groups.reindex(rounds['company_id']).fillna(UNKNOWN)
+    rounds = rounds.assign(group=groups.to_numpy())
+    if measure == 'Funding (USD)':
+        values = rounds['amount_usd'].fillna(0)
+    else:
+        values = pd.Series(1, index=rounds.index)
+    table = values.groupby([rounds['bucket'], rounds['group']]).sum().unstack(fill_value=0)
+    buckets = pd.period_range(rounds['bucket'].min(), rounds['bucket'].max(), freq=freq)
+    return table.reindex(buckets, fill_value=0).sort_index(axis=1)
+
+
+@pytest.mark.parametrize('freq', ['M', 'Q', 'Y'])
+@pytest.mark.parametrize('by', [None, 'country', 'industry'])
+@pytest.mark.parametrize('measure', ['Deals', 'Funding (USD)'])
+@pytest.mark.parametrize('window', [1, 4])
+def test_series_matches_a_groupby(freq, by, measure, window):
+    index = RoundTimeSeries(STORE.companies, STORE.rounds)
+    series = index.series(freq, by=by, measure=measure, window=window)
+    expected = _scan(STORE, freq, by, measure).rolling(window, min_periods=1).sum()
+    pd.testing.assert_frame_equal(series.sort_index(axis=1), expected, check_dtype=False,
+                                  check_names=False)
+
+
+def test_series_range_and_totals():
+    index = RoundTimeSeries(STORE.companies, STORE.rounds)
+    full = index.series('Y', measure='Funding (USD)', window=3)
+    assert index.undated == 1
+    window = index.series('Y', measure='Funding (USD)', start='2010', end='2015', window=3)
+    pd.testing.assert_frame_equal(window, full.loc['2010':'2015'])
+
+    totals = index.totals('2010-01-01', '2015-12-31', by='country')
+    rounds = STORE.rounds[round_dates(STORE.rounds).dt.year.between(2010, 2015)]
+    countries = STORE.companies['Country HQ'].astype(object)
+    countries = countries.reindex(rounds['company_id']).fillna(UNKNOWN)
+    expected = rounds['amount_usd'].fillna(0).groupby(countries.to_numpy()).sum()
+    pd.testing.assert_series_equal(totals['Funding (USD)'].sort_index(), expected.sort_index(),
+                                   check_names=False, check_index_type=False)
+    assert totals['Deals'].sum() == len(rounds)
+    assert index.totals('2040', '2050').empty
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from insights.store import build_store
+from insights.synthetic import generate_companies
+
+
+def test_matches_the_curated_export():
+    curated = build_store(list(generate_companies(200, seed=2)))
+    tracxn = build_store(list(generate_companies(200, schema='tracxn', seed=2)))
+    columns = ['Company', 'Founded', 'Country HQ', 'Industry', 'Total Funding']
+    pd.testing.assert_frame_equal(tracxn.companies[columns], curated.companies[columns],
+                                  check_categorical=False)
+    rounds = ['company_id', 'year', 'amount_usd']
+    pd.testing.assert_frame_equal(tracxn.rounds[rounds], curated.rounds[rounds])
+
+
+def test_date_parts_as_strings():
+    store = build_store([
+        {'name': 'Acme', 'fundingInfo': {
+            'latestRoundInfo': {'date': {'year': '2021', 'month': '3', 'day': None}},
+            'fundingRoundList': [{'name': 'Seed', 'date': {'year': '2019'}},
+                                 {'name': 'A', 'date': None}]}},
+        {'name': 'Odd', 'fundingInfo': {'latestRoundInfo': {'date': {'year': 2020, 'month': 13}}}},
+        {'name': 'Bad', 'fundingInfo': {'latestRoundInfo': {'date': {'year': 'soon'}}}},
+    ])
+    assert store.companies['Last Round Date'].tolist()[0] == pd.Timestamp('2021-03-01')
+    assert store.companies['Last Round Date'].iloc[1:].isna().all()
+    assert store.rounds['date'].tolist()[0] == pd.Timestamp('2019-01-01')
+    assert store.rounds['year'].tolist()[0] == 2019
+    issue = store.issues.set_index('field').loc['Last Round Date']
+    assert issue['count'] == 2
+
+
+def test_malformed_round_lists():
+    store = build_store([
+        {'name': 'Acme', 'fundingInfo': {'fundingRoundList': [
+            {'name': 'Seed', 'amount': {'amount': 5, 'currency': 'USD'}}, None, 7, ['A']]}},
+        {'name': 'Beta', 'fundingInfo': {'fundingRoundList': {'name': 'Seed'}}},
+        {'name': 'Gamma', 'fundingInfo': {'fundingRoundList': 'Series A'}},
+        {'name': 'Delta', 'fundingInfo': {'fundingRoundList': [{'name': 'A'}]}},
+    ])
+    assert store.rounds['company_id'].tolist() == [0, 3]
+    assert store.rounds['amount_usd'].tolist()[0] == 5.0
+    issues = store.issues.set_index(['field', 'issue'])['count']
+    assert issues['Fundraising History', 'round is not a record, skipped'] == 1
+    assert issues['Fundraising History', 'unreadable, no rounds kept'] == 2
@@ -0,0 +1,117 @@
+import pandas as pd
+
+from insights.aggregates import INSIGHTS, insight_table
+from insights.store import StoreBuilder, build_store
+
+COMPANY = {
+    'Company': 'Acme', 'Website': 'acme.com', 'Country HQ': 'India', 'Industry': 'SaaS',
+    'Total Funding': '5000000 USD', 'Founded': 2015, 'Last Round Date': '2021-03-04',
+    'Founder': {'name': 'A', 'shortBio': 'Engineer'},
+    'Fundraising History': {'Seed': {'year': 2021, 'amount': '5000000 USD', 'by': 'VC1, VC2'}},
+}
+TRACXN = {'name': 'Tracxn Co', 'fundingInfo': {}}
+
+
+def _issues(store):
+    return {(row.field, row.issue): row.count for row in store.issues.itertuples()}
+
+
+def test_all_quarantined_file_gives_empty_store():
+    store = build_store([5, 'junk', None])
+    assert store.companies.empty and store.rounds.empty
+    assert store.quarantine['record'].tolist() == [0, 1, 2]
+    assert store.quarantine['reason'].tolist() == [
+        'not a company record (int)', 'not a company record (str)',
+        'not a company record (NoneType)']
+    assert sum(_issues(store).values()) == 3
+    for name, compute in INSIGHTS.items():
+        assert insight_table(compute(store)).empty, name
+
+
+def test_mixed_schema_keeps_the_first_companys_schema():
+    store = build_store([COMPANY, TRACXN, 7, {**COMPANY, 'Company': 'Beta', 'Website': 'beta.com'}])
+    assert store.companies['Company'].tolist() == ['Acme', 'Beta']
+    assert store.quarantine['record'].tolist() == [1, 2]
+    assert store.quarantine['reason'].tolist() == [
+        'Tracxn record in a curated export', 'not a company record (int)']
+
+    store = build_store([TRACXN, COMPANY])
+    assert store.companies['Company'].tolist() == ['Tracxn Co']
+    assert store.quarantine['reason'].tolist() == ['curated record in a Tracxn export']
+
+
+def test_schema_is_fixed_across_batches():
+    builder = StoreBuilder()
+    builder.add([COMPANY])
+    builder.add([TRACXN])
+    builder.add([])
+    store = builder.build()
+    assert len(store.companies) == 1
+    assert store.quarantine['record'].tolist() == [1]
+
+
+def test_values_that_do_not_coerce_become_null_and_are_counted():
+    dirty = [
+        {**COMPANY, 'Country HQ': ['India', 'US'], 'Total Funding': 'lots'},
+        {**COMPANY, 'Founded': 'long ago', 'Last Round Date': 'yesterday', 'Founder': 'Jane'},
+        {**COMPANY, 'Total Funding': 'N/A', 'Fundraising History': '{not json'},
+    ]
+    store = build_store([COMPANY, *dirty])
+    assert _issues(store) == {
+        ('Country HQ', 'not text, set to null'): 1,
+        ('Total Funding', 'not an amount, set to null'): 1,
+        ('Founded', 'not a year, set to null'): 1,
+        ('Last Round Date', 'not a date, set to null'): 1,
+        ('Founder', 'text instead of a record, used as the name'): 1,
+        ('Fundraising History', 'unreadable, no rounds kept'): 1,
+    }
+    companies = store.companies
+    assert pd.isna(companies['Country HQ'].iloc[1]) and pd.isna(companies['Total Funding'].iloc[1])
+    assert pd.isna(companies['Founded'].iloc[2]) and pd.isna(companies['Last Round Date'].iloc[2])
+    assert companies['Founder'].iloc[2] == 'Jane'
+    assert store.rounds['company_id'].tolist() == [0, 1, 2]
+    examples = store.issues.set_index('field').loc['Total Funding', 'examples']
+    assert "record 1 (Acme): 'lots'" in examples
+
+
+def test_nested_tracxn_values_that_do_not_coerce_are_left_out_and_counted():
+    clean = {'name': 'Acme', 'sectorList': [[{'name': 'AI'}]], 'investorList': [{'name': 'VC1'}],
+             'totalMoneyRaised': {'totalAmount': {'amount': 5, 'currency': 'USD'}},
+             'fundingInfo': {'fundingRoundList': [
+                 {'name': 'Seed', 'amount': {'amount': 5, 'currency': 'USD'},
+                  'investorList': [{'name': 'VC1'}]}]}}
+    dirty = {
+        'name': 'Dirty', 'sectorList': 5, 'investorList': [{'name': 7}, {'name': 'VC2'}],
+        'specialFlagList': 'YES', 'location': 'India',
+        'totalMoneyRaised': {'totalAmount': {'amount': 'lots', 'currency': ['USD']}},
+        'fundingInfo': {'fundingRoundList': [
+            {'name': 'Seed', 'amount': {'amount': 5, 'currency': {'code': 'USD'}},
+             'investorList': 'VC1'},
+            None,
+        ]},
+    }
+    store = build_store([clean, dirty])
+    assert _issues(store) == {
+        ('Country HQ', 'not a record, left out'): 1,
+        ('Industry', 'not a list, left out'): 1,
+        ('Investors', 'malformed entry, left out'): 1,
+        ('Attributes', 'not a list, left out'): 1,
+        ('Total Funding Currency', 'not text, set to null'): 1,
+        ('Total Funding', 'not an amount, set to null'): 1,
+        ('Fundraising History', 'round is not a record, skipped'): 1,
+        ('round investors', 'not a list, left out'): 1,
+        ('currency', 'not text, set to null'): 1,
+    }
+    companies = store.companies
+    assert companies['Industry'].iloc[0] == 'AI' and pd.isna(companies['Industry'].iloc[1])
+    assert companies['Investors'].tolist() == ['VC1', 'VC2']
+    assert pd.isna(companies['Total Funding'].iloc[1])
+    assert store.rounds['company_id'].tolist() == [0, 1]
+    assert store.rounds['investors'].tolist() == ['VC1', '']
+
+
+def test_clean_records_have_no_issues():
+    store = build_store([COMPANY,
+                         {**COMPANY, 'Last Round Date': '03/04/2021', 'Total Funding': 'N/A'}])
+    assert store.issues.empty and store.quarantine.empty
+    assert store.companies['Last Round Date'].iloc[1] == pd.Timestamp('2021-03-04')